@@ -0,0 +1,149 @@
+// Lazy loaders for data written by `python -m value_forecasting.export`.
+// Chunks for a variable are only fetched when that variable is requested,
+// and per-model metrics come precomputed in aggregates.json.
+
+const DATA_URL = `${import.meta.env.BASE_URL}data/`;
+
+export interface Forecast {
+  variable: string;
+  cutoff_year: number;
+  target_year: number;
+  predicted: number;
+  actual: number;
+  lower: number;
+  upper: number;
+  model: string;
+}
+
+export interface Metrics {
+  n_forecasts: number;
+  mae: number;
+  rmse: number;
+  bias: number;
+  coverage_90: number;
+  calibration_error: number;
+}
+
+export interface Manifest {
+  version: number;
+  format: "json";
+  columns: string[];
+  variables: Record<string, { rows: number; models: string[]; chunks: string[] }>;
+}
+
+export interface Aggregates {
+  models: Record<string, Metrics>;
+  by_variable: Record<string, Record<string, Metrics>>;
+}
+
+export interface HistoricalSeries {
+  question: string;
+  description: string;
+  data: { year: number; value: number }[];
+}
+
+type Columns = Record<string, (number | string)[]>;
+
+const cache = new Map<string, Promise<unknown>>();
+
+function fetchJson<T>(path: string): Promise<T> {
+  let request = cache.get(path);
+  if (!request) {
+    request = fetch(DATA_URL + path).then((response) => {
+      if (!response.ok) throw new Error(`${path}: ${response.status}`);
+      return response.json();
+    });
+    cache.set(path, request);
+  }
+  return request as Promise<T>;
+}
+
+export const loadManifest = () => fetchJson<Manifest>("manifest.json");
+export const loadAggregates = () => fetchJson<Aggregates>("aggregates.json");
+export const loadHistorical = () =>
+  fetchJson<Record<string, HistoricalSeries>>("historical.json");
+
+function rowsFromColumns(variable: string, columns: Columns): Forecast[] {
+  const n = columns.model.length;
+  const rows: Forecast[] = new Array(n);
+  for (let i = 0; i < n; i++) {
+    rows[i] = {
+      variable,
+      cutoff_year: columns.cutoff_year[i] as number,
+      target_year: columns.target_year[i] as number,
+      predicted: columns.predicted[i] as number,
+      actual: columns.actual[i] as number,
+      lower: columns.lower[i] as number,
+      upper: columns.upper[i] as number,
+      model: columns.model[i] as string,
+    };
+  }
+  return rows;
+}
+
+// All forecasts for one variable.
+export async function loadVariable(variable: string): Promise<Forecast[]> {
+  const manifest = await loadManifest();
+  const entry = manifest.variables[variable];
+  if (!entry) return [];
+  if (manifest.format !== "json") {
+    throw new Error(`Unsupported export format: ${manifest.format}`);
+  }
+  const chunks = await Promise.all(entry.chunks.map((c) => fetchJson<Columns>(c)));
+  return chunks.flatMap((columns) => rowsFromColumns(variable, columns));
+}
+
+// Sufficient statistics from cube.json (sparse: one entry per non-empty cell).
+export interface MetricCube {
+  dimensions: string[];
+  statistics: string[];
+  labels: Record<string, (string | number)[]>;
+  coords: number[][]; // per dimension, the label index of each cell
+  stats: number[][]; // per statistic, the value of each cell
+}
+
+export const loadCube = () => fetchJson<MetricCube>("cube.json");
+
+export type Selection = Record<string, (string | number)[]>;
+
+// Metrics for the cells matching `selection`, grouped by the `by` dimensions.
+// Cost is proportional to the number of cells, not the number of forecasts.
+export function rollup(
+  cube: MetricCube,
+  by: string[],
+  selection: Selection = {},
+): Map<string, Metrics> {
+  const filters = cube.dimensions.map((dim) =>
+    selection[dim] ? new Set(selection[dim]) : null,
+  );
+  const groupDims = by.map((dim) => cube.dimensions.indexOf(dim));
+  const sums = new Map<string, number[]>();
+  const nCells = cube.stats[0]?.length ?? 0;
+  cells: for (let c = 0; c < nCells; c++) {
+    for (let d = 0; d < filters.length; d++) {
+      const filter = filters[d];
+      if (filter && !filter.has(cube.labels[cube.dimensions[d]][cube.coords[d][c]])) {
+        continue cells;
+      }
+    }
+    const key = groupDims
+      .map((d) => cube.labels[cube.dimensions[d]][cube.coords[d][c]])
+      .join("|");
+    const sum = sums.get(key) ?? new Array(cube.statistics.length).fill(0);
+    cube.stats.forEach((values, k) => (sum[k] += values[c]));
+    sums.set(key, sum);
+  }
+  const result = new Map<string, Metrics>();
+  for (const [key, [count, sumError, sumAbs, sumSq, covered]] of sums) {
+    const coverage = covered / count;
+    result.set(key, {
+      n_forecasts: count,
+      mae: sumAbs / count,
+      rmse: Math.sqrt(sumSq / count),
+      bias: sumError / count,
+      coverage_90: coverage,
+      calibration_error: Math.abs(0.9 - coverage),
+    });
+  }
+  return result;
+}
@@ -0,0 +1,42 @@
+"""Shared fixtures for performance benchmarks."""
+
+import pytest
+
+from benchmarks.synthetic import START_YEAR, make_series
+from value_forecasting import gss_variables, heterogeneity
+
+
+@pytest.fixture
+def synthetic_variables(monkeypatch, request):
+    """
+    Register ``count`` synthetic variables of ``length`` waves each.
+
+    Parametrize indirectly with a ``(length, count)`` tuple. Returns the
+    variable names and the last observed year (a natural cutoff).
+    """
+    length, count = request.param
+    names = []
+    for i in range(count):
+        name = f"SYN{length}_{i}"
+        monkeypatch.setitem(
+            gss_variables.HISTORICAL_TRAJECTORIES, name, make_series(length, i)
+        )
+        monkeypatch.setitem(
+            gss_variables.GSS_VARIABLES,
+            name,
+            {
+                "question": f"Synthetic question {i}?",
+                "responses": {1: "Yes", 2: "No"},
+                "liberal_response": 1,
+                "first_year": START_YEAR,
+                "description": "Synthetic benchmark series",
+            },
+        )
+        yes = make_series(length, i)
+        monkeypatch.setitem(
+            heterogeneity.HISTORICAL_DISTRIBUTIONS,
+            name,
+            {y: {"Yes": v, "No": 100 - v} for y, v in yes.items()},
+        )
+        names.append(name)
+    return names, START_YEAR + length - 1
@@ -0,0 +1,24 @@
+"""Synthetic trajectories and parameter grids for benchmarks."""
+
+import numpy as np
+
+SERIES_LENGTHS = [8, 32, 128]
+SERIES_COUNTS = [1, 16, 64]
+START_YEAR = 1900
+
+GRID = [(length, count) for length in SERIES_LENGTHS for count in SERIES_COUNTS]
+
+
+def make_series(length: int, seed: int) -> dict[int, float]:
+    """Synthetic annual trajectory: noisy logistic rise in percent."""
+    rng = np.random.default_rng(seed)
+    t = np.linspace(-3, 3, length)
+    values = 100 / (1 + np.exp(-t)) + rng.normal(0, 2, length)
+    return {
+        START_YEAR + i: float(np.clip(v, 0, 100)) for i, v in enumerate(values)
+    }
+
+
+def grid_ids(params):
+    """Readable ids for (length, count) parametrization."""
+    return [f"len{length}-n{count}" for length, count in params]
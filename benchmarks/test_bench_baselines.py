@@ -0,0 +1,164 @@
+"""Benchmarks for baseline forecasters on synthetic series."""
+
+import pytest
+
+from benchmarks.synthetic import GRID, START_YEAR, grid_ids
+from value_forecasting.baselines import (
+    run_arima_forecast,
+    run_arima_forecasts,
+    run_ets_forecast,
+    run_ets_forecasts,
+    run_logistic_forecasts,
+)
+from value_forecasting.cohort import run_cohort_forecasts
+from value_forecasting.compositional import forecast_distributions_compositional
+from value_forecasting.forecaster import run_baseline_forecast
+from value_forecasting.heterogeneity import forecast_distribution
+from value_forecasting.pooled import _fit, run_pooled_forecasts
+from value_forecasting.simulation import simulate_paths
+from value_forecasting.timeseries import clear_cache
+
+HORIZONS = [1, 5, 10]
+
+
+
+def _run_all(func, names, cutoff):
+    return [func(name, cutoff, [cutoff + h for h in HORIZONS]) for name in names]
+
+
+def _uncached(func, *args):
+    clear_cache()  # time the state-space fits, not cache hits
+    return func(*args)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_linear_baseline(benchmark, synthetic_variables):
+    """run_baseline_forecast over every synthetic series."""
+    names, cutoff = synthetic_variables
+    result = benchmark(_run_all, run_baseline_forecast, names, cutoff)
+    assert len(result) == len(names)
+
+
+def _pooled_uncached(jobs):
+    _fit.cache_clear()  # time the joint fit, not a cache hit
+    return run_pooled_forecasts(jobs)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_pooled_baseline(benchmark, synthetic_variables):
+    """One joint pooled fit plus forecasts for every synthetic series."""
+    names, cutoff = synthetic_variables
+    jobs = [(name, cutoff, [cutoff + h for h in HORIZONS]) for name in names]
+    result = benchmark(_pooled_uncached, jobs)
+    assert len(result) == len(names) * len(HORIZONS)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_logistic_baseline(benchmark, synthetic_variables):
+    """Batched logistic fits, with bootstrap intervals, on rolling origins."""
+    names, cutoff = synthetic_variables
+    # Every wave in the second half of each series is a forecast origin.
+    origins = range((START_YEAR + cutoff) // 2 + 1, cutoff + 1)
+    jobs = [
+        (name, origin, [origin + h for h in HORIZONS])
+        for name in names
+        for origin in origins
+    ]
+    result = benchmark(run_logistic_forecasts, jobs)
+    assert len(result) == len(jobs) * len(HORIZONS)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_cohort_baseline(benchmark, synthetic_variables):
+    """Cohort-replacement projections at several cutoffs for every series."""
+    names, cutoff = synthetic_variables
+    cutoffs = range((START_YEAR + cutoff) // 2 + 1, cutoff + 1)
+    jobs = [
+        (name, origin, [origin + h for h in HORIZONS])
+        for name in names
+        for origin in cutoffs
+    ]
+    result = benchmark(run_cohort_forecasts, jobs)
+    assert len(result) == len(jobs) * len(HORIZONS)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_forecast_distribution(benchmark, synthetic_variables):
+    """forecast_distribution over every synthetic series."""
+    names, cutoff = synthetic_variables
+
+    def run():
+        return [forecast_distribution(name, cutoff, cutoff + 10) for name in names]
+
+    result = benchmark(run)
+    assert len(result) == len(names)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_forecast_distributions_compositional(benchmark, synthetic_variables):
+    """Batched compositional engine over every synthetic series."""
+    names, cutoff = synthetic_variables
+    jobs = [(name, cutoff, cutoff + 10) for name in names]
+    result = benchmark(forecast_distributions_compositional, jobs)
+    assert len(result) == len(jobs)
+
+
+@pytest.mark.parametrize("model", ["linear", "naive", "arima", "ets"])
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_simulate_paths(benchmark, synthetic_variables, model):
+    """Vectorized Monte Carlo paths for every synthetic series at once."""
+    names, cutoff = synthetic_variables
+    series = [(name, cutoff) for name in names]
+    targets = [cutoff + h for h in HORIZONS]
+    result = benchmark(_uncached, simulate_paths, model, series, targets)
+    assert result.draws.shape[1:] == (len(HORIZONS), len(names))
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_arima(benchmark, synthetic_variables):
+    """run_arima_forecast called once per synthetic series."""
+    names, cutoff = synthetic_variables
+    benchmark(_uncached, _run_all, run_arima_forecast, names, cutoff)
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_ets(benchmark, synthetic_variables):
+    """run_ets_forecast called once per synthetic series."""
+    names, cutoff = synthetic_variables
+    benchmark(_uncached, _run_all, run_ets_forecast, names, cutoff)
+
+
+@pytest.mark.parametrize("model", ["arima", "ets"])
+@pytest.mark.parametrize(
+    "synthetic_variables", GRID, ids=grid_ids(GRID), indirect=True
+)
+def test_state_space_rolling_origins(benchmark, synthetic_variables, model):
+    """One batched state-space fit for every series and rolling origin."""
+    names, cutoff = synthetic_variables
+    origins = range((START_YEAR + cutoff) // 2 + 1, cutoff + 1)
+    jobs = [
+        (name, origin, [origin + h for h in HORIZONS])
+        for name in names
+        for origin in origins
+    ]
+    run = run_arima_forecasts if model == "arima" else run_ets_forecasts
+    result = benchmark(_uncached, run, jobs)
+    assert len(result) == len(jobs) * len(HORIZONS)
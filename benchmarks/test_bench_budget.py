@@ -0,0 +1,28 @@
+"""Dry-run budget estimates for large sweep grids."""
+
+import pytest
+
+from value_forecasting.budget import estimate_budget
+
+N_CUTOFFS = 100
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", [(128, 1000)], indirect=True, ids=["100k-jobs"]
+)
+def test_estimate_budget(benchmark, synthetic_variables):
+    """Tokens, cost and wall time for 1000 variables x 100 cutoffs."""
+    names, last_year = synthetic_variables
+    jobs = [
+        (name, cutoff, [last_year])
+        for name in names
+        for cutoff in range(last_year - N_CUTOFFS, last_year)
+    ]
+    budget = benchmark.pedantic(
+        estimate_budget,
+        args=(jobs, "gpt-3.5-turbo"),
+        kwargs={"concurrency": 16},
+        rounds=3,
+        iterations=1,
+    )
+    assert budget.calls == 100_000
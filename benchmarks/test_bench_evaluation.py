@@ -0,0 +1,42 @@
+"""Benchmarks for evaluation metrics."""
+
+import numpy as np
+import pytest
+
+from value_forecasting.evaluation import ForecastResult, evaluate_model
+from value_forecasting.metric_cube import build_metric_cube
+
+
+def make_results(n: int) -> list[ForecastResult]:
+    """Synthetic forecast/actual pairs."""
+    rng = np.random.default_rng(0)
+    predicted = rng.uniform(0, 100, n)
+    actual = predicted + rng.normal(0, 5, n)
+    return [
+        ForecastResult("SYN", 2000, 2010, p, a, p - 8, p + 8, "bench")
+        for p, a in zip(predicted.tolist(), actual.tolist())
+    ]
+
+
+@pytest.mark.parametrize("n", [100, 10_000, 100_000])
+def test_evaluate_model(benchmark, n):
+    """evaluate_model over n results."""
+    results = make_results(n)
+    metrics = benchmark(evaluate_model, results)
+    assert metrics["n_forecasts"] == n
+
+
+@pytest.mark.parametrize("n", [100, 10_000, 100_000])
+def test_build_metric_cube(benchmark, n):
+    """Reducing n results to a metric cube (one-off build step)."""
+    results = make_results(n)
+    cube = benchmark(build_metric_cube, results)
+    assert cube.metrics()["n_forecasts"] == n
+
+
+@pytest.mark.parametrize("n", [100, 10_000, 100_000])
+def test_metric_cube_slice(benchmark, n):
+    """A dashboard slice from a prebuilt cube (compare test_evaluate_model)."""
+    cube = build_metric_cube(make_results(n))
+    metrics = benchmark(cube.metrics, model="bench", cutoff_year=[2000])
+    assert metrics["n_forecasts"] == n
@@ -0,0 +1,55 @@
+"""End-to-end benchmark of run_experiment with a stubbed LLM client."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from value_forecasting import forecaster
+from value_forecasting.run_experiment import run_experiment
+
+
+class StubMessages:
+    """Answers every request with a canned, well-formed forecast."""
+
+    def create(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        years_text = prompt.split("Target years to predict: ")[1].split("\n")[0]
+        predictions = [
+            {"year": year, "estimate": 50, "lower": 40, "upper": 60}
+            for year in json.loads(years_text)
+        ]
+        text = json.dumps({"predictions": predictions, "reasoning": "stub"})
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=text)],
+            usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=50),
+        )
+
+
+class StubAnthropic:
+    """Drop-in for anthropic.Anthropic that never touches the network."""
+
+    def __init__(self, *args, **kwargs):
+        self.messages = StubMessages()
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """Route forecaster's Anthropic client to the stub."""
+    monkeypatch.setattr(forecaster, "Anthropic", StubAnthropic)
+
+
+@pytest.mark.parametrize("use_llm", [False, True], ids=["baseline", "with-llm"])
+def test_run_experiment(benchmark, stub_llm, capsys, use_llm):
+    """Full default sweep: baselines, stubbed LLM calls, evaluation."""
+    variables = ["HOMOSEX", "GRASS", "FEPOL", "PREMARSX", "CAPPUN"]
+    cutoffs = [1980, 1990, 2000, 2010]
+    results = benchmark(
+        run_experiment,
+        variables=variables,
+        cutoff_years=cutoffs,
+        use_llm=use_llm,
+        contamination="flag",  # measure every call, not just post-2024 years
+    )
+    capsys.readouterr()
+    assert results["baseline"]
@@ -0,0 +1,46 @@
+"""Throughput of the LLM forecast path against the offline mock server."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from value_forecasting.forecaster import run_forecast
+from value_forecasting.mock_llm import MockConfig, MockLLMServer
+
+N_REQUESTS = 64
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    """Mock API with ~20 ms lognormal latency and 5% injected 429s."""
+    config = MockConfig(
+        latency="lognormal",
+        latency_median=0.02,
+        latency_spread=0.3,
+        rate_limit_rate=0.05,
+        seed=0,
+    )
+    with MockLLMServer(config) as srv:
+        yield srv
+
+
+@pytest.mark.parametrize("concurrency", [1, 8, 32])
+def test_forecast_throughput(benchmark, mock_server, concurrency):
+    """N_REQUESTS run_forecast calls at a given thread concurrency."""
+
+    def sweep():
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(
+                pool.map(
+                    lambda _: run_forecast(
+                        "HOMOSEX",
+                        2000,
+                        [2010, 2018],
+                        base_url=mock_server.anthropic_base_url,
+                    ),
+                    range(N_REQUESTS),
+                )
+            )
+
+    results = benchmark.pedantic(sweep, rounds=2, iterations=1)
+    assert len(results) == N_REQUESTS
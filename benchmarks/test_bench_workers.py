@@ -0,0 +1,53 @@
+"""Benchmarks for per-task overhead in process pools."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from benchmarks.synthetic import grid_ids
+from value_forecasting.baselines import run_naive_forecast
+from value_forecasting.incremental import data_fingerprint
+from value_forecasting.shared_results import run_sweep
+from value_forecasting.workers import WorkerPool
+
+N_TASKS = 2000
+
+
+@pytest.mark.parametrize("pool_class", [ProcessPoolExecutor, WorkerPool])
+def test_small_task_throughput(benchmark, pool_class):
+    """N_TASKS tiny (variable, cutoff) tasks on a warm 4-worker pool."""
+    cutoffs = [1990] * N_TASKS
+    with pool_class(4) as pool:
+        list(pool.map(data_fingerprint, ["HOMOSEX"] * 8, [1990] * 8))  # warm up
+        results = benchmark(
+            lambda: list(pool.map(data_fingerprint, ["HOMOSEX"] * N_TASKS, cutoffs))
+        )
+    assert len(results) == N_TASKS
+
+
+def _sweep_pickled(pool, forecaster, jobs):
+    return [f for forecasts in pool.map(forecaster, *zip(*jobs)) for f in forecasts]
+
+
+def _sweep_shared(pool, forecaster, jobs):
+    with run_sweep({"naive": forecaster}, jobs, executor=pool) as table:
+        return table.metrics()
+
+
+@pytest.mark.parametrize(
+    "synthetic_variables", [(128, 64)], ids=grid_ids([(128, 64)]), indirect=True
+)
+@pytest.mark.parametrize("channel", ["pickle", "shared"])
+def test_sweep_results_channel(benchmark, synthetic_variables, channel):
+    """Returning forecast lists vs writing into a shared ResultsTable."""
+    names, last_year = synthetic_variables
+    years = range(last_year - 100, last_year + 1)
+    jobs = [
+        (name, cutoff, [y for y in years if y > cutoff])
+        for name in names
+        for cutoff in (last_year - 100, last_year - 50)
+    ]
+    sweep = _sweep_shared if channel == "shared" else _sweep_pickled
+    with WorkerPool(4) as pool:
+        list(pool.map(len, ["warm"] * 8))
+        benchmark(sweep, pool, run_naive_forecast, jobs)
@@ -1,35 +1,39 @@
-"""Value Forecasting - Testing LLM ability to predict moral change."""
-
-from value_forecasting.baselines import (
-    run_arima_forecast,
-    run_ets_forecast,
-    run_naive_forecast,
-)
-from value_forecasting.evaluation import (
-    ForecastResult,
-    calculate_calibration,
-    calculate_coverage,
-    calculate_mae,
-    evaluate_model,
-)
-from value_forecasting.forecaster import (
-    Forecast,
-    create_forecast_prompt,
-    run_baseline_forecast,
-    run_forecast,
-)
-from value_forecasting.gss_variables import (
-    GSS_VARIABLES,
-    HISTORICAL_TRAJECTORIES,
-    get_historical_context,
-)
-from value_forecasting.heterogeneity import (
-    DistributionForecast,
-    forecast_distribution,
-    forecast_distribution_llm,
-)
+"""Value Forecasting - Testing LLM ability to predict moral change.
+
+Public names are loaded on first access (PEP 562), so ``import
+value_forecasting`` or ``import value_forecasting.gss_variables`` does not pull
+in the API clients, numpy or statsmodels until something needs them.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "run_arima_forecast": "baselines",
+    "run_ets_forecast": "baselines",
+    "run_naive_forecast": "baselines",
+    "ForecastResult": "evaluation",
+    "calculate_calibration": "evaluation",
+    "calculate_coverage": "evaluation",
+    "calculate_mae": "evaluation",
+    "evaluate_model": "evaluation",
+    "Forecast": "forecaster",
+    "create_forecast_prompt": "forecaster",
+    "run_baseline_forecast": "forecaster",
+    "run_forecast": "forecaster",
+    "run_forecast_packed": "forecaster",
+    "GSS_VARIABLES": "gss_variables",
+    "HISTORICAL_TRAJECTORIES": "gss_variables",
+    "get_historical_context": "gss_variables",
+    "DistributionForecast": "heterogeneity",
+    "forecast_distribution": "heterogeneity",
+    "forecast_distribution_llm": "heterogeneity",
+    "forecast_distributions_llm": "heterogeneity",
+}
+
 __all__ = [
     "DistributionForecast",
     "Forecast",
@@ -43,10 +47,58 @@ __all__ = [
     "evaluate_model",
     "forecast_distribution",
     "forecast_distribution_llm",
+    "forecast_distributions_llm",
     "get_historical_context",
     "run_arima_forecast",
     "run_baseline_forecast",
     "run_ets_forecast",
     "run_forecast",
+    "run_forecast_packed",
     "run_naive_forecast",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from value_forecasting.baselines import (
+        run_arima_forecast,
+        run_ets_forecast,
+        run_naive_forecast,
+    )
+    from value_forecasting.evaluation import (
+        ForecastResult,
+        calculate_calibration,
+        calculate_coverage,
+        calculate_mae,
+        evaluate_model,
+    )
+    from value_forecasting.forecaster import (
+        Forecast,
+        create_forecast_prompt,
+        run_baseline_forecast,
+        run_forecast,
+        run_forecast_packed,
+    )
+    from value_forecasting.gss_variables import (
+        GSS_VARIABLES,
+        HISTORICAL_TRAJECTORIES,
+        get_historical_context,
+    )
+    from value_forecasting.heterogeneity import (
+        DistributionForecast,
+        forecast_distribution,
+        forecast_distribution_llm,
+        forecast_distributions_llm,
+    )
@@ -1,11 +1,84 @@
 """Time series baseline forecasters."""
 
 import warnings
+from functools import lru_cache
 
 import numpy as np
 
+from value_forecasting import instrumentation, response_store
 from value_forecasting.forecaster import Forecast
 from value_forecasting.gss_variables import HISTORICAL_TRAJECTORIES
+from value_forecasting.timeseries import (
+    fit_state_space,
+    pre_cutoff_series,
+    precision_weights,
+)
+
+ForecastJob = tuple[str, int, list[int]]
+
+
+def _state_space_forecasts(
+    model: str,
+    jobs: list[ForecastJob],
+    min_waves: int,
+    label: str,
+    describe,
+    sampling_error: bool = True,
+) -> list[Forecast]:
+    """
+    Forecasts from a :mod:`timeseries` model fitted to every job at once.
+
+    Targets at or before a series' last wave are skipped; steps count
+    calendar years since that wave. ``describe(fit, j)`` gives the
+    description shared by the forecasts of job ``j``. With
+    ``sampling_error``, waves carry their standard errors.
+    """
+    series = [pre_cutoff_series(variable, cutoff) for variable, cutoff, _ in jobs]
+    if not sampling_error:
+        series = [s[:2] for s in series]
+    usable = [j for j, (years, *_) in enumerate(series) if len(years) >= min_waves]
+    if not usable:
+        return []
+    jobs = [jobs[j] for j in usable]
+    fit = fit_state_space(model, [series[j] for j in usable])
+    targets = sorted({year for _, _, years in jobs for year in years})
+    column = {year: h for h, year in enumerate(targets)}
+    mean, sd = fit.forecast(targets)
+
+    forecasts = []
+    for j, (variable, cutoff_year, target_years) in enumerate(jobs):
+        description = describe(fit, j)
+        for target_year in target_years:
+            if target_year <= fit.last_year[j]:
+                continue
+            point = float(mean[j, column[target_year]])
+            uncertainty = 1.645 * float(sd[j, column[target_year]])  # 90% CI
+            forecasts.append(
+                Forecast(
+                    variable=variable,
+                    cutoff_year=cutoff_year,
+                    target_year=target_year,
+                    point_estimate=max(0, min(100, point)),
+                    lower_bound=max(0, point - uncertainty),
+                    upper_bound=min(100, point + uncertainty),
+                    model=label,
+                    raw_response=description,
+                )
+            )
+    return forecasts
+
+
+@instrumentation.timed("baselines.naive")
+def run_naive_forecasts(jobs: list[ForecastJob]) -> list[Forecast]:
+    """Naive forecasts for many ``(variable, cutoff, targets)`` jobs at once."""
+    # The last value itself, not a level filtered through sampling error.
+    return _state_space_forecasts(
+        "random_walk", jobs, 1, "naive", _describe_naive, sampling_error=False
+    )
+
+
+def _describe_naive(fit, j) -> str:
+    return f"Last value: {fit.state[j, 0]:g}"
 
 
 def run_naive_forecast(
@@ -16,47 +89,39 @@ def run_naive_forecast(
     """
     Naive baseline: predict the last observed value.
 
-    Uncertainty: historical standard deviation of changes.
+    Uncertainty: a random walk whose variance per year is estimated from the
+    changes between waves, scaled by the years between them.
     """
-    trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
-    pre_cutoff = {y: v for y, v in trajectory.items() if y <= cutoff_year}
+    return run_naive_forecasts([(variable, cutoff_year, target_years)])
 
-    if not pre_cutoff:
-        return []
 
-    years = sorted(pre_cutoff.keys())
-    last_value = pre_cutoff[years[-1]]
+def _describe_arima(fit, j) -> str:
+    phi, noise = fit.params[j]
+    return (
+        f"ARIMA(1,1,0) on the annual grid: phi={phi:.2f}, "
+        f"innovation sd={np.sqrt(fit.scale[j]):.2f}, survey noise ratio={noise:g}"
+    )
 
-    # Estimate uncertainty from historical volatility
-    if len(years) >= 2:
-        changes = [
-            pre_cutoff[years[i]] - pre_cutoff[years[i - 1]]
-            for i in range(1, len(years))
-        ]
-        std = np.std(changes) if changes else 5.0
-    else:
-        std = 5.0
 
-    forecasts = []
-    for target_year in target_years:
-        years_out = target_year - cutoff_year
-        # Uncertainty grows with time
-        uncertainty = std * np.sqrt(years_out / 10) * 1.645  # 90% CI
-
-        forecasts.append(
-            Forecast(
-                variable=variable,
-                cutoff_year=cutoff_year,
-                target_year=target_year,
-                point_estimate=last_value,
-                lower_bound=max(0, last_value - uncertainty),
-                upper_bound=min(100, last_value + uncertainty),
-                model="naive",
-                raw_response=f"Last value: {last_value}",
-            )
-        )
+@instrumentation.timed("baselines.arima")
+def run_arima_forecasts(jobs: list[ForecastJob]) -> list[Forecast]:
+    """ARIMA(1,1,0) forecasts for many ``(variable, cutoff, targets)`` jobs at once."""
+    return _state_space_forecasts(
+        "arima110", jobs, 4, f"arima{(1, 1, 0)}", _describe_arima
+    )
 
-    return forecasts
+
+@lru_cache(maxsize=256)
+def _fit_annual_arima(order, years, values):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    # Years without a wave are missing observations of the annual series.
+    annual = np.full(years[-1] - years[0] + 1, np.nan)
+    annual[np.asarray(years) - years[0]] = values
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with instrumentation.stage("baselines.arima.fit"):
+            return ARIMA(annual, order=order).fit()
 
 
 def run_arima_forecast(
@@ -66,60 +131,55 @@ def run_arima_forecast(
     order: tuple[int, int, int] = (1, 1, 0),
 ) -> list[Forecast]:
     """
-    ARIMA baseline forecast.
+    ARIMA baseline forecast on the annual grid (one step = one year).
 
-    Uses statsmodels ARIMA with specified order.
-    Default order (1,1,0) = AR(1) with differencing.
+    The default order (1,1,0), AR(1) with differencing, uses the batched
+    state-space fit from :mod:`value_forecasting.timeseries`. Other orders
+    fit statsmodels ARIMA to the annual series, with the years between
+    waves missing.
     """
+    if tuple(order) == (1, 1, 0):
+        return run_arima_forecasts([(variable, cutoff_year, target_years)])
     try:
-        from statsmodels.tsa.arima.model import ARIMA
+        import statsmodels  # noqa: F401
     except ImportError:
         warnings.warn("statsmodels not installed, skipping ARIMA")
         return []
 
-    trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
-    pre_cutoff = {y: v for y, v in trajectory.items() if y <= cutoff_year}
-
-    if len(pre_cutoff) < 4:
+    years, values, _ = pre_cutoff_series(variable, cutoff_year)
+    if len(years) < 4:
         # Not enough data for ARIMA
         return []
 
-    years = sorted(pre_cutoff.keys())
-    values = [pre_cutoff[y] for y in years]
-
     try:
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            model = ARIMA(values, order=order)
-            fit = model.fit()
+        fit = _fit_annual_arima(
+            tuple(order), tuple(years), tuple(float(v) for v in values)
+        )
+
+        # Get forecast with confidence interval; render the summary once and
+        # share it across this fit's forecasts.
+        forecast_result = fit.get_forecast(steps=max(target_years) - years[-1])
+        pred = np.asarray(forecast_result.predicted_mean)
+        conf_int = np.asarray(forecast_result.conf_int(alpha=0.10))  # 90% CI
+        response_id = response_store.put(str(fit.summary()))
 
         forecasts = []
         for target_year in target_years:
-            steps_ahead = len([y for y in target_years if y <= target_year])
-
-            # Get forecast with confidence interval
-            forecast_result = fit.get_forecast(steps=max(target_years) - years[-1])
-            pred = forecast_result.predicted_mean
-            conf_int = forecast_result.conf_int(alpha=0.10)  # 90% CI
-
-            idx = target_year - years[-1] - 1
+            idx = target_year - years[-1] - 1  # steps are years
             if idx < 0 or idx >= len(pred):
                 continue
 
-            point = float(pred.iloc[idx]) if hasattr(pred, 'iloc') else float(pred[idx])
-            lower = float(conf_int.iloc[idx, 0]) if hasattr(conf_int, 'iloc') else float(conf_int[idx, 0])
-            upper = float(conf_int.iloc[idx, 1]) if hasattr(conf_int, 'iloc') else float(conf_int[idx, 1])
-
+            point = float(pred[idx])
             forecasts.append(
                 Forecast(
                     variable=variable,
                     cutoff_year=cutoff_year,
                     target_year=target_year,
                     point_estimate=max(0, min(100, point)),
-                    lower_bound=max(0, lower),
-                    upper_bound=min(100, upper),
+                    lower_bound=max(0, float(conf_int[idx, 0])),
+                    upper_bound=min(100, float(conf_int[idx, 1])),
                     model=f"arima{order}",
-                    raw_response=str(fit.summary()),
+                    response_id=response_id,
                 )
             )
 
@@ -130,6 +190,23 @@ def run_arima_forecast(
         return []
 
 
+def _describe_ets(fit, j) -> str:
+    level, slope = fit.params[j]
+    return (
+        "Local linear trend (Holt) on the annual grid: "
+        f"level/slope noise ratios {level:.3g}/{slope:.3g}, "
+        f"survey noise sd={np.sqrt(fit.scale[j]):.2f}"
+    )
+
+
+@instrumentation.timed("baselines.ets")
+def run_ets_forecasts(jobs: list[ForecastJob]) -> list[Forecast]:
+    """Holt/ETS forecasts for many ``(variable, cutoff, targets)`` jobs at once."""
+    return _state_space_forecasts(
+        "local_linear_trend", jobs, 3, "ets_holt", _describe_ets
+    )
+
+
 def run_ets_forecast(
     variable: str,
     cutoff_year: int,
@@ -138,68 +215,312 @@ def run_ets_forecast(
     """
     Exponential Smoothing (ETS) baseline forecast.
 
-    Uses Holt's linear trend method.
+    Uses Holt's linear trend method in its state-space form (a local linear
+    trend) on the annual grid, so gaps between waves count as years.
     """
-    try:
-        from statsmodels.tsa.holtwinters import ExponentialSmoothing
-    except ImportError:
-        warnings.warn("statsmodels not installed, skipping ETS")
-        return []
-
-    trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
-    pre_cutoff = {y: v for y, v in trajectory.items() if y <= cutoff_year}
-
-    if len(pre_cutoff) < 3:
-        return []
-
-    years = sorted(pre_cutoff.keys())
-    values = [pre_cutoff[y] for y in years]
-
-    try:
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            # Holt's linear trend
-            model = ExponentialSmoothing(
-                values,
-                trend="add",
-                seasonal=None,
+    return run_ets_forecasts([(variable, cutoff_year, target_years)])
+
+
+# --- Logistic diffusion baseline -------------------------------------------
+#
+# y(t) = L * sigmoid(a + b * (t - cutoff) / 10), with saturation level
+# L = 100 * sigmoid(theta_L) in (0, 100), so curves never leave [0, 100].
+# All series are fit at once by a batched Levenberg-Marquardt solver on
+# padded (series, waves) arrays. Weak Gaussian priors keep short series
+# identifiable: saturation near 95%, trends of about +/-1 logit per decade.
+# Waves are weighted by their precision (feasible WLS; see
+# timeseries.precision_weights), so small samples count for less.
+
+LOGISTIC_PRIOR_MEAN = np.array([3.0, 0.0, 0.0])  # theta_L, a, b
+LOGISTIC_PRIOR_SD = np.array([2.0, 10.0, 1.0])
+# Nominal noise (percentage points) weighing the data against the prior, and
+# the residual sd used for bootstrap draws when a series has no residual df.
+LOGISTIC_NOISE_SD = 5.0
+N_LOGISTIC_PARAMS = 3
+# Bootstrap replicates drawn per batch, bounding memory to a few of
+# (series, waves) arrays at a time.
+BOOTSTRAP_CHUNK = 25
+
+
+def _sigmoid(z):
+    return 0.5 * (1 + np.tanh(0.5 * z))
+
+
+def _logistic_curve(theta, x):
+    """Curve values and Jacobian for params (..., 3) at decades x (..., T)."""
+    s_level = _sigmoid(theta[..., :1])
+    level = 100 * s_level
+    s = _sigmoid(theta[..., 1:2] + theta[..., 2:3] * x)
+    f = level * s
+    slope = level * s * (1 - s)
+    jac = np.stack([f * (1 - s_level), slope, slope * x], axis=-1)
+    return f, jac
+
+
+def _lm_terms(theta, x, y, mask):
+    """Cost, scaled residuals (N, T) and scaled Jacobian (3, N, T) of the MAP fit."""
+    weight = np.sqrt(mask) / LOGISTIC_NOISE_SD
+    s_level = _sigmoid(theta[:, :1])
+    s = _sigmoid(theta[:, 1:2] + theta[:, 2:3] * x)
+    f = 100 * s_level * s
+    slope = f * (1 - s) * weight
+    jac = np.stack([f * (1 - s_level) * weight, slope, slope * x])
+    resid = (y - f) * weight
+    prior = (theta - LOGISTIC_PRIOR_MEAN) / LOGISTIC_PRIOR_SD
+    cost = np.einsum("nt,nt->n", resid, resid) + (prior * prior).sum(-1)
+    return cost, resid, jac
+
+
+def _solve3(a, b):
+    """Solve symmetric 3x3 systems ``a @ s = b`` for stacks (N, 3, 3), (N, 3)."""
+    # Cofactors of a symmetric matrix; cheaper than np.linalg.solve on many
+    # tiny systems.
+    a00, a01, a02 = a[:, 0, 0], a[:, 0, 1], a[:, 0, 2]
+    a11, a12, a22 = a[:, 1, 1], a[:, 1, 2], a[:, 2, 2]
+    c00 = a11 * a22 - a12 * a12
+    c01 = a02 * a12 - a01 * a22
+    c02 = a01 * a12 - a02 * a11
+    c11 = a00 * a22 - a02 * a02
+    c12 = a01 * a02 - a00 * a12
+    c22 = a00 * a11 - a01 * a01
+    det = a00 * c00 + a01 * c01 + a02 * c02
+    b0, b1, b2 = b[:, 0], b[:, 1], b[:, 2]
+    step = np.stack(
+        [
+            c00 * b0 + c01 * b1 + c02 * b2,
+            c01 * b0 + c11 * b1 + c12 * b2,
+            c02 * b0 + c12 * b1 + c22 * b2,
+        ],
+        axis=-1,
+    )
+    return step / det[:, None]
+
+
+def fit_logistic_curves(
+    x: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+    theta0: np.ndarray | None = None,
+    max_iter: int = 100,
+    tol: float = 1e-9,
+) -> np.ndarray:
+    """
+    MAP fit of logistic curves to many series at once (Levenberg-Marquardt).
+
+    Every series has its own damping and stops on its own; each iteration
+    only touches the series still moving.
+
+    Args:
+        x: Decades since each series' cutoff, shape (..., T).
+        y: Values in percent, shape (..., T); padded entries are ignored.
+        mask: Weight of each entry, shape (..., T): 1 for an observed wave
+            (or its relative precision), 0 for padding.
+        theta0: Starting parameters (..., 3) (default: logit-linear fit).
+        max_iter: Maximum LM iterations.
+        tol: A series stops once an accepted step improves its cost by less
+            than this (relative).
+
+    Returns:
+        Parameters ``(theta_L, a, b)`` per series, shape (..., 3).
+    """
+    shape = np.broadcast_shapes(x.shape, y.shape, mask.shape)
+    x, y, mask = (
+        np.broadcast_to(a, shape).reshape(-1, shape[-1]) for a in (x, y, mask)
+    )
+    if theta0 is None:
+        # Start from a straight line through logit(y / 95).
+        p = np.clip(y / 95, 0.01, 0.99)
+        z = np.log(p / (1 - p))
+        n = mask.sum(-1)
+        sx, sz = (x * mask).sum(-1), (z * mask).sum(-1)
+        sxx, sxz = (x * x * mask).sum(-1), (x * z * mask).sum(-1)
+        denom = n * sxx - sx**2
+        b = np.where(denom > 1e-12, (n * sxz - sx * sz) / np.where(denom, denom, 1), 0)
+        a = (sz - b * sx) / np.maximum(n, 1)
+        theta0 = np.stack([np.full_like(a, LOGISTIC_PRIOR_MEAN[0]), a, b], axis=-1)
+    theta = np.broadcast_to(theta0, (*shape[:-1], 3)).reshape(-1, 3).astype(float)
+
+    # State of the series still being fit; rows leave once converged.
+    rows = np.arange(len(theta))
+    cost, resid, jac = _lm_terms(theta, x, y, mask)
+    damping = np.full(len(theta), 1e-2)
+    growth = np.full(len(theta), 2.0)
+    prior_precision = 1 / LOGISTIC_PRIOR_SD**2
+    diagonal = np.arange(3)
+    for _ in range(max_iter):
+        current = theta[rows]
+        system = np.empty((len(rows), 3, 3))
+        for i, k in ((0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2)):
+            system[:, i, k] = system[:, k, i] = np.einsum("nt,nt->n", jac[i], jac[k])
+        diag = system[:, diagonal, diagonal] + prior_precision
+        grad = np.einsum("int,nt->ni", jac, resid) - (
+            (current - LOGISTIC_PRIOR_MEAN) * prior_precision
+        )
+        system[:, diagonal, diagonal] = diag * (1 + damping[:, None])
+        step = _solve3(system, grad)
+        candidate = current + step
+        # Decrease predicted by the local quadratic model.
+        predicted = (step * (grad + damping[:, None] * diag * step)).sum(-1)
+
+        new_cost, new_resid, new_jac = _lm_terms(candidate, x, y, mask)
+        better = new_cost < cost
+        ratio = (cost - new_cost) / np.maximum(predicted, 1e-300)
+        improvement = (cost - new_cost) / np.maximum(cost, 1e-12)
+        theta[rows[better]] = candidate[better]
+        cost = np.where(better, new_cost, cost)
+        resid[better] = new_resid[better]
+        jac[:, better] = new_jac[:, better]
+        # Nielsen's update: shrink the damping by how well the quadratic
+        # model predicted the decrease; grow it faster after repeated failures.
+        shrink = np.maximum(1 / 3, 1 - (2 * ratio - 1) ** 3)
+        damping = np.where(better, damping * shrink, damping * growth)
+        growth = np.where(better, 2.0, growth * 2)
+
+        # Converged: an accepted step barely helped, or no step helps at all.
+        moving = ~((better & (improvement < tol)) | (damping > 1e10))
+        if not moving.all():
+            rows, cost, damping, growth = (
+                a[moving] for a in (rows, cost, damping, growth)
             )
-            fit = model.fit()
-
-        forecasts = []
-        max_steps = max(target_years) - years[-1]
-        predictions = fit.forecast(max_steps)
+            resid, jac = resid[moving], jac[:, moving]
+            x, y, mask = x[moving], y[moving], mask[moving]
+        if not len(rows):
+            break
+    return theta.reshape(*shape[:-1], 3)
+
+
+def _pad_series(jobs):
+    """Left-aligned (x, y, sampling variance, mask) arrays for each job's waves."""
+    series = [pre_cutoff_series(variable, cutoff) for variable, cutoff, _ in jobs]
+    width = max((len(years) for years, *_ in series), default=0) or 1
+    x = np.zeros((len(jobs), width))
+    y = np.zeros((len(jobs), width))
+    sampling_var = np.zeros((len(jobs), width))
+    mask = np.zeros((len(jobs), width))
+    for j, ((_, cutoff, _), (years, values, errors)) in enumerate(zip(jobs, series)):
+        k = len(years)
+        x[j, :k] = (np.asarray(years, dtype=float) - cutoff) / 10
+        y[j, :k] = values
+        sampling_var[j, :k] = np.square(errors)
+        mask[j, :k] = 1
+    return x, y, sampling_var, mask
+
+
+def _draw_residuals(resid, n, shape, rng):
+    """Residual-bootstrap noise of ``shape`` (..., S, W) from each series' residuals."""
+    # Rescale for the fitted parameters' degrees of freedom; series with no
+    # residual df fall back to Gaussian noise.
+    df = n - N_LOGISTIC_PARAMS
+    scale = np.sqrt(n / np.maximum(df, 1))
+    uniform = rng.random(shape, dtype=np.float32)
+    idx = (uniform * np.maximum(n, 1)[:, None]).astype(np.intp)
+    idx += (np.arange(len(n)) * resid.shape[-1])[:, None]
+    draws = (resid * scale[:, None]).ravel()[idx]
+    short = df <= 0
+    if short.any():
+        draws[..., short, :] = rng.normal(
+            0, LOGISTIC_NOISE_SD, draws[..., short, :].shape
+        )
+    return draws
 
-        # Estimate prediction intervals using residual variance
-        residuals = fit.resid
-        sigma = np.std(residuals) if len(residuals) > 1 else 5.0
 
-        for target_year in target_years:
-            idx = target_year - years[-1] - 1
-            if idx < 0 or idx >= len(predictions):
-                continue
+@instrumentation.timed("baselines.logistic")
+def run_logistic_forecasts(
+    jobs: list[tuple[str, int, list[int]]],
+    n_bootstrap: int = 200,
+    level: float = 0.9,
+    seed: int | np.random.Generator = 0,
+) -> list[Forecast]:
+    """
+    Logistic diffusion forecasts for many ``(variable, cutoff, targets)`` jobs.
 
-            point = float(predictions.iloc[idx]) if hasattr(predictions, 'iloc') else float(predictions[idx])
+    All series are fit in one batched LM solve. Intervals come from a
+    residual bootstrap: each of ``n_bootstrap`` resampled datasets moves the
+    fit by one Gauss-Newton step (a linearized refit), and a resampled
+    residual is added to each replicate's curve at the target year.
 
-            # Uncertainty grows with horizon
-            steps = idx + 1
-            uncertainty = sigma * np.sqrt(steps) * 1.645  # 90% CI
+    Jobs whose variable has fewer than two waves before the cutoff are skipped.
+    Raises ValueError if ``n_bootstrap`` is less than 1.
+    """
+    if n_bootstrap < 1:
+        raise ValueError(f"n_bootstrap must be at least 1, got {n_bootstrap}")
+    jobs = [job for job in jobs if _n_waves(job) >= 2]
+    if not jobs:
+        return []
+    rng = np.random.default_rng(seed)
+    x, y, sampling_var, mask = _pad_series(jobs)
+    n = mask.sum(-1)
+    theta = fit_logistic_curves(x, y, mask)
+    fitted, _ = _logistic_curve(theta, x)
+    weight = precision_weights(
+        (y - fitted) * mask, sampling_var, mask, N_LOGISTIC_PARAMS
+    )
+    theta = fit_logistic_curves(x, y, weight, theta0=theta)
+    # Residuals and Jacobian scaled by sqrt(weight): the bootstrap resamples
+    # standardized residuals, and a draw at an average wave has weight 1.
+    fitted, jac = _logistic_curve(theta, x)
+    resid = (y - fitted) * np.sqrt(weight)
+    jac *= np.sqrt(weight)[..., None]
+    # Linearized bootstrap: each replicate moves the fit by one Gauss-Newton
+    # step toward its resampled data, theta* = theta + gain @ e*.
+    precision = np.einsum("jti,jtk->jik", jac, jac) / LOGISTIC_NOISE_SD**2
+    precision += np.diag(1 / LOGISTIC_PRIOR_SD**2)
+    gain = np.linalg.solve(precision, jac.transpose(0, 2, 1) / LOGISTIC_NOISE_SD**2)
+
+    targets = [np.asarray(t, dtype=float) for _, _, t in jobs]
+    horizon = max(len(t) for t in targets)
+    xt = np.zeros((len(jobs), horizon))
+    for j, ((_, cutoff, _), t) in enumerate(zip(jobs, targets)):
+        xt[j, : len(t)] = (t - cutoff) / 10
+    samples = []
+    for start in range(0, n_bootstrap, BOOTSTRAP_CHUNK):
+        size = min(BOOTSTRAP_CHUNK, n_bootstrap - start)
+        errors = _draw_residuals(resid, n, (size, *y.shape), rng) * mask
+        boot_theta = theta + (gain @ errors[..., None])[..., 0]
+        curves, _ = _logistic_curve(boot_theta, xt)
+        samples.append(curves + _draw_residuals(resid, n, curves.shape, rng))
+    point, _ = _logistic_curve(theta, xt)
+    alpha = (1 - level) / 2
+    lower, upper = np.quantile(np.concatenate(samples), [alpha, 1 - alpha], axis=0)
 
+    forecasts = []
+    for j, (variable, cutoff, target_years) in enumerate(jobs):
+        level_pct = 100 * _sigmoid(theta[j, 0])
+        description = (
+            f"y = {level_pct:.1f} * sigmoid({theta[j, 1]:.3f} + "
+            f"{theta[j, 2]:.3f} * (t - {cutoff}) / 10)"
+        )
+        for h, target_year in enumerate(target_years):
             forecasts.append(
                 Forecast(
                     variable=variable,
-                    cutoff_year=cutoff_year,
+                    cutoff_year=cutoff,
                     target_year=target_year,
-                    point_estimate=max(0, min(100, point)),
-                    lower_bound=max(0, point - uncertainty),
-                    upper_bound=min(100, point + uncertainty),
-                    model="ets_holt",
-                    raw_response=f"ETS forecast: {point:.1f}",
+                    point_estimate=float(point[j, h]),
+                    lower_bound=float(max(0.0, lower[j, h])),
+                    upper_bound=float(min(100.0, upper[j, h])),
+                    model="logistic_diffusion",
+                    raw_response=description,
                 )
             )
+    return forecasts
 
-        return forecasts
 
-    except Exception as e:
-        warnings.warn(f"ETS failed: {e}")
-        return []
+def _n_waves(job) -> int:
+    variable, cutoff, _ = job
+    return sum(y <= cutoff for y in HISTORICAL_TRAJECTORIES.get(variable, {}))
+
+
+def run_logistic_forecast(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+) -> list[Forecast]:
+    """
+    Logistic diffusion baseline: an S-curve bounded in (0, 100).
+
+    Fits ``y = L * sigmoid(a + b * decades)`` to the waves up to the cutoff,
+    with 90% residual-bootstrap intervals. See :func:`run_logistic_forecasts`
+    to fit many series in one batch.
+    """
+    return run_logistic_forecasts([(variable, cutoff_year, target_years)])
@@ -0,0 +1,262 @@
+"""Dry-run token, cost and wall-clock estimates for a planned sweep.
+
+:func:`estimate_budget` counts the tokens of every prompt that a sweep would
+send, without calling any API. It combines the counts with the model's prices
+and rate limits (see :mod:`value_forecasting.models`):
+
+    jobs = [("HOMOSEX", 2000, [2010, 2018]), ("GRASS", 2000, [2010, 2018])]
+    budget = estimate_budget(jobs, "gpt-3.5-turbo", concurrency=8)
+    print(budget.summary())
+
+Prompts are sized from the pieces they are made of: the system prompt, the
+context header, one line per wave, and the instructions. Each piece is
+rendered and counted once. A variable's contexts at later cutoffs only add
+lines to those at earlier cutoffs, so a 100,000-job grid takes about a
+second. By default, tokens are approximated at about four characters each,
+which gives exactly :func:`value_forecasting.planning.estimate_tokens` of
+each rendered prompt. Pass ``tokenizer=`` to count with a real tokenizer,
+e.g. ``lambda text: len(encoding.encode(text))`` with tiktoken. Summing
+counts over the pieces then matches the whole prompt to within a few tokens.
+Completion tokens are an estimate of the usual JSON answer.
+
+The wall-clock time is a lower bound. ``concurrency`` calls are in flight,
+each taking ``latency`` seconds, and the model's request and token rate
+limits cap the throughput. Retries and queueing are not included, and
+neither is the turnaround of a batch API (``batch=True`` only changes the
+price).
+"""
+
+from bisect import bisect_right
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import accumulate
+
+from value_forecasting.forecaster import (
+    create_forecast_instructions,
+    create_packed_instructions,
+    create_system_prompt,
+    packs,
+)
+from value_forecasting.gss_variables import GSS_VARIABLES, historical_context_parts
+from value_forecasting.heterogeneity import (
+    create_distribution_instructions,
+    create_distribution_system_prompt,
+    create_distributions_instructions,
+    distribution_context_parts,
+)
+from value_forecasting.models import get_model
+from value_forecasting.planning import (
+    CHARS_PER_TOKEN,
+    RESPONSE_TOKENS,
+    TOKENS_PER_PREDICTION,
+    ForecastJob,
+)
+
+KINDS = ("forecast", "packed", "distribution", "distributions")
+# Default per-call latency: time to first token plus generation speed.
+FIRST_TOKEN_SECONDS = 0.5
+OUTPUT_TOKENS_PER_SECOND = 50.0
+
+
+@dataclass
+class Budget:
+    """Projected size, cost and duration of a sweep on one model."""
+
+    model: str
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    cost: float  # USD
+    min_wall_time: float  # seconds
+    limited_by: str  # "concurrency", "requests per minute" or "tokens per minute"
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def summary(self) -> str:
+        return (
+            f"{self.model}: {self.calls:,} calls, {self.input_tokens:,} input + "
+            f"{self.output_tokens:,} output tokens, ${self.cost:,.2f}, "
+            f"at least {_duration(self.min_wall_time)} "
+            f"(limited by {self.limited_by})"
+        )
+
+
+def _duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def _approx_tokens(chars: int) -> int:
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+def _context_sizes(jobs: list[ForecastJob], context_parts, size) -> dict:
+    """
+    Size of the context for every (variable, cutoff) in ``jobs``.
+
+    A variable's contexts for later cutoffs extend those for earlier ones, so
+    its lines are rendered and sized once, up to its latest cutoff.
+    """
+    cutoffs: dict[str, set[int]] = {}
+    for variable, cutoff, _ in jobs:
+        cutoffs.setdefault(variable, set()).add(cutoff)
+    sizes = {}
+    for variable, variable_cutoffs in cutoffs.items():
+        header, lines = context_parts(variable, max(variable_cutoffs))
+        years = [year for year, _ in lines]
+        cumulative = list(
+            accumulate((size(line) for _, line in lines), initial=size(header))
+        )
+        for cutoff in variable_cutoffs:
+            sizes[variable, cutoff] = cumulative[bisect_right(years, cutoff)]
+    return sizes
+
+
+def _calls(jobs: list[ForecastJob], kind: str, pack_size: int | None):
+    """
+    (cutoff, variables, texts, output tokens) for every call. The prompt is
+    the variables' contexts plus the texts.
+    """
+    if kind == "forecast":
+        for variable, cutoff, targets in jobs:
+            yield (
+                cutoff,
+                [variable],
+                ["\n\n" + create_forecast_instructions(cutoff, targets)],
+                RESPONSE_TOKENS + TOKENS_PER_PREDICTION * len(targets),
+            )
+    elif kind == "packed":
+        # run_forecast_packed: variables with the same cutoff and targets
+        # share a call; a pack of one is a plain run_forecast prompt.
+        groups: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+        for variable, cutoff, targets in jobs:
+            groups.setdefault((cutoff, tuple(targets)), []).append(variable)
+        for (cutoff, targets), variables in groups.items():
+            for pack in packs(variables, pack_size):
+                completion = TOKENS_PER_PREDICTION * len(targets) * len(pack)
+                if len(pack) == 1:
+                    instructions = create_forecast_instructions(cutoff, list(targets))
+                    texts = ["\n\n" + instructions]
+                else:
+                    # "Variable: NAME\n", the context, then a blank line.
+                    texts = [f"Variable: {variable}\n\n" for variable in pack]
+                    texts.append(
+                        create_packed_instructions(pack, cutoff, list(targets))
+                    )
+                yield cutoff, pack, texts, RESPONSE_TOKENS + completion
+    elif kind == "distributions":
+        # forecast_distributions_llm: one call for all target years.
+        for variable, cutoff, targets in jobs:
+            n_responses = len(GSS_VARIABLES[variable]["responses"])
+            yield (
+                cutoff,
+                [variable],
+                ["\n\n" + create_distributions_instructions(variable, cutoff, targets)],
+                RESPONSE_TOKENS + TOKENS_PER_PREDICTION * n_responses * len(targets),
+            )
+    else:
+        # forecast_distribution_llm: one call per target year, one entry
+        # per response option.
+        for variable, cutoff, targets in jobs:
+            n_responses = len(GSS_VARIABLES[variable]["responses"])
+            for target in targets:
+                instructions = create_distribution_instructions(
+                    variable, cutoff, target
+                )
+                yield (
+                    cutoff,
+                    [variable],
+                    ["\n\n" + instructions],
+                    RESPONSE_TOKENS + TOKENS_PER_PREDICTION * n_responses,
+                )
+
+
+def estimate_budget(
+    jobs: list[ForecastJob],
+    model: str,
+    kind: str = "forecast",
+    concurrency: int = 1,
+    batch: bool = False,
+    latency: float | None = None,
+    tokenizer: Callable[[str], int] | None = None,
+    pack_size: int | None = None,
+) -> Budget:
+    """
+    Project tokens, cost and minimum wall-clock time without calling the API.
+
+    Args:
+        jobs: ``(variable, cutoff_year, target_years)`` jobs, e.g. an
+            incremental ``UpdatePlan.jobs``.
+        model: A registered model name.
+        kind: ``"forecast"`` (``run_forecast``, one call per job),
+            ``"distribution"`` (``forecast_distribution_llm``, one call per
+            target year), ``"distributions"``
+            (``forecast_distributions_llm``, one call per job) or
+            ``"packed"`` (``run_forecast_packed``, one call per pack of jobs
+            with the same cutoff and target years).
+        concurrency: Calls in flight at once.
+        batch: Price at the batch-API discount, where the model has one.
+        latency: Seconds per call (default: from the expected completion
+            length).
+        tokenizer: ``text -> token count`` (default: about four characters
+            per token).
+        pack_size: Variables per call for ``"packed"`` (default: all).
+
+    Returns:
+        The projected budget.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind {kind!r}; expected {KINDS}")
+    spec = get_model(model)
+    if tokenizer is None:
+        # Character counts add up exactly, so the estimate for each prompt
+        # matches estimate_tokens() on the rendered text.
+        size = len
+        to_tokens = _approx_tokens
+    else:
+        size, to_tokens = tokenizer, int
+    if kind in ("forecast", "packed"):
+        context_parts, system_prompt = historical_context_parts, create_system_prompt
+    else:
+        context_parts = distribution_context_parts
+        system_prompt = create_distribution_system_prompt
+    context_sizes = _context_sizes(jobs, context_parts, size)
+    system_sizes: dict[int, int] = {}
+
+    calls = input_tokens = output_tokens = 0
+    for cutoff, variables, texts, completion in _calls(jobs, kind, pack_size):
+        if cutoff not in system_sizes:
+            system_sizes[cutoff] = to_tokens(size(system_prompt(cutoff)))
+        prompt_size = sum(context_sizes[v, cutoff] for v in variables)
+        prompt_size += sum(size(text) for text in texts)
+        calls += 1
+        input_tokens += system_sizes[cutoff] + to_tokens(prompt_size)
+        output_tokens += completion
+
+    wall_time, limited_by = 0.0, "concurrency"
+    if calls:
+        if latency is None:
+            per_call = output_tokens / calls
+            latency = FIRST_TOKEN_SECONDS + per_call / OUTPUT_TOKENS_PER_SECOND
+        rates = {"concurrency": concurrency / latency * 60}  # calls per minute
+        if spec.requests_per_minute is not None:
+            rates["requests per minute"] = spec.requests_per_minute
+        if spec.tokens_per_minute is not None:
+            tokens_per_call = (input_tokens + output_tokens) / calls
+            rates["tokens per minute"] = spec.tokens_per_minute / tokens_per_call
+        limited_by = min(rates, key=rates.get)
+        wall_time = calls / rates[limited_by] * 60
+    return Budget(
+        model=model,
+        calls=calls,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost=spec.cost(input_tokens, output_tokens, batch=batch),
+        min_wall_time=wall_time,
+        limited_by=limited_by,
+    )
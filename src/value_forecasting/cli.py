@@ -0,0 +1,377 @@
+"""Command-line interface: ``value-forecasting <command>``.
+
+Commands:
+
+    forecast   LLM forecasts (Anthropic, OpenAI or local), optionally concurrent
+               and routed across models (see ``value_forecasting.models``)
+    baseline   statistical baselines, optionally across worker processes
+    evaluate   metrics for one or more saved results files
+    export     chunked data for the web app (see ``value_forecasting.export``)
+
+``forecast`` and ``baseline`` go through :mod:`value_forecasting.incremental`:
+with ``--cache-dir`` completed (variable, cutoff) jobs are saved every few
+seconds and when the run stops, and ``--resume`` reuses those forecasts
+instead of starting over.
+
+Only ``argparse`` is imported up front; numerical and API client modules are
+imported by the command that needs them, so ``--help`` is fast.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+BASELINES = ("linear", "naive", "arima", "ets", "pooled", "logistic", "cohort")
+PROVIDERS = ("anthropic", "openai")
+ROUTES = ("cost", "throughput")
+DEFAULT_MODELS = {
+    "anthropic": "claude-sonnet-4-20250514",
+    "openai": "gpt-3.5-turbo",
+}
+
+
+def _baseline_forecaster(method: str):
+    if method == "linear":
+        from value_forecasting.forecaster import run_baseline_forecast
+
+        return run_baseline_forecast
+    if method == "pooled":
+        from value_forecasting.pooled import run_pooled_forecast
+
+        return run_pooled_forecast
+    if method == "cohort":
+        from value_forecasting.cohort import run_cohort_forecast
+
+        return run_cohort_forecast
+    from value_forecasting import baselines
+
+    return getattr(baselines, f"run_{method}_forecast")
+
+
+def _llm_forecaster(provider: str | None, model: str, base_url: str | None):
+    from functools import partial
+
+    from value_forecasting import forecaster, models
+
+    if provider is None and model in models.MODELS:
+        return models.forecaster_for(model, base_url)
+    if provider == "openai":
+        run = forecaster.run_forecast_openai
+    else:
+        run = forecaster.run_forecast
+    return partial(run, model=model, base_url=base_url)
+
+
+def _print_metrics(name: str, metrics: dict) -> None:
+    print(f"\n{name}:")
+    print(f"  N forecasts: {metrics['n_forecasts']}")
+    print(f"  MAE: {metrics['mae']:.1f}%")
+    print(f"  RMSE: {metrics['rmse']:.1f}%")
+    print(f"  Bias: {metrics['bias']:.1f}%")
+    print(f"  Coverage (90% CI): {metrics['coverage_90']:.1%}")
+    print(f"  Calibration error: {metrics['calibration_error']:.1%}")
+
+
+def _contamination_policy(args, label: str) -> str | None:
+    """``--contamination`` when ``label`` has a known training cutoff."""
+    from value_forecasting.models import MODELS
+
+    if args.route:
+        return None  # routing only sends years a model cannot have seen
+    if label not in MODELS:
+        print(
+            f"No training cutoff for {label}; contamination not checked",
+            file=sys.stderr,
+        )
+        return None
+    return args.contamination
+
+
+def _run(
+    args,
+    label: str,
+    forecaster,
+    executor_class,
+    n_workers: int,
+    contamination: str | None = None,
+) -> int:
+    from value_forecasting.evaluation import evaluate_model
+    from value_forecasting.export import write_results
+    from value_forecasting.incremental import ForecastCache, run_incremental
+    from value_forecasting.models import get_model
+
+    cache = ForecastCache(args.cache_dir)
+    if not args.resume:
+        cache.clear(label)
+
+    executor = executor_class(n_workers) if n_workers > 1 else None
+    try:
+        results, plan = run_incremental(
+            label,
+            forecaster,
+            variables=args.variables,
+            cutoff_years=args.cutoffs,
+            cache=cache,
+            executor=executor,
+            contamination=contamination,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print(plan.summary())
+    if plan.contamination is not None:
+        print(plan.contamination.summary())
+    groups = {label: results}
+    if contamination == "flag":
+        # As run_experiment: flagged years are reported apart from clean ones.
+        spec = get_model(label)
+        groups = {
+            label: [r for r in results if spec.is_safe_for(r.target_year)],
+            f"{label}_contaminated": [
+                r for r in results if not spec.is_safe_for(r.target_year)
+            ],
+        }
+    for name, rows in groups.items():
+        if rows:
+            _print_metrics(name, evaluate_model(rows))
+    output = args.output or Path("results") / f"{label}.{args.format or 'json'}"
+    path = write_results(groups, output, format=args.format)
+    print(f"\nResults saved to {path}")
+    return 0
+
+
+def _dry_run(args, label: str) -> int:
+    from value_forecasting.budget import estimate_budget
+    from value_forecasting.incremental import ForecastCache, plan_update
+    from value_forecasting.models import MODELS, route_jobs
+    from value_forecasting.planning import plan_contamination
+
+    # Without --resume the run starts over, so every job is planned.
+    cache = ForecastCache(args.cache_dir if args.resume else None)
+    jobs = plan_update(label, args.variables, args.cutoffs, cache).jobs
+    contamination = None
+    if not args.route and label in MODELS:
+        # Budget only the calls the real run would make.
+        contamination = plan_contamination(label, jobs, args.contamination)
+        jobs = contamination.jobs
+    if args.route:
+        candidates = args.candidates or None
+        routes = route_jobs(jobs, candidates, args.route)
+    elif label in MODELS:
+        routes = {label: jobs}
+    else:
+        print(
+            f"No prices or rate limits for {label}; see value_forecasting.models",
+            file=sys.stderr,
+        )
+        return 1
+
+    budgets = [
+        estimate_budget(model_jobs, name, concurrency=args.concurrency)
+        for name, model_jobs in routes.items()
+    ]
+    for budget in budgets:
+        print(budget.summary())
+    if contamination is not None:
+        print(contamination.summary())
+    if len(budgets) > 1:
+        calls = sum(b.calls for b in budgets)
+        tokens = sum(b.total_tokens for b in budgets)
+        cost = sum(b.cost for b in budgets)
+        print(f"Total: {calls:,} calls, {tokens:,} tokens, ${cost:,.2f}")
+    return 0
+
+
+def cmd_forecast(args) -> int:
+    from concurrent.futures import ThreadPoolExecutor
+
+    if args.route:
+        label = args.model or f"routed-{args.route}"
+    else:
+        label = args.model or DEFAULT_MODELS[args.provider or "anthropic"]
+    if args.dry_run:
+        return _dry_run(args, label)
+
+    if args.route:
+        from value_forecasting.models import RoutedForecaster
+
+        candidates = tuple(args.candidates) if args.candidates else None
+        forecaster = RoutedForecaster(candidates, args.route, args.base_url)
+    else:
+        forecaster = _llm_forecaster(args.provider, label, args.base_url)
+    contamination = _contamination_policy(args, label)
+    return _run(
+        args, label, forecaster, ThreadPoolExecutor, args.concurrency, contamination
+    )
+
+
+def cmd_baseline(args) -> int:
+    from value_forecasting.workers import WorkerPool
+
+    forecaster = _baseline_forecaster(args.method)
+    return _run(args, args.method, forecaster, WorkerPool, args.workers)
+
+
+def cmd_evaluate(args) -> int:
+    import itertools
+    import json
+
+    from value_forecasting.export import iter_results_json
+    from value_forecasting.metric_cube import build_metric_cube
+
+    cube = build_metric_cube(
+        itertools.chain.from_iterable(iter_results_json(p) for p in args.results)
+    )
+    groups = cube.rollup(args.by)
+    for key, metrics in groups.items():
+        name = " / ".join(map(str, key)) if isinstance(key, tuple) else str(key)
+        _print_metrics(name, metrics)
+    if args.output:
+        rows = [
+            {**dict(zip(args.by, key if isinstance(key, tuple) else (key,))), **m}
+            for key, m in groups.items()
+        ]
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nMetrics saved to {args.output}")
+    return 0
+
+
+def cmd_export(args) -> int:
+    from value_forecasting.export import (
+        DEFAULT_CHUNK_ROWS,
+        export_results,
+        iter_results_json,
+    )
+
+    manifest = export_results(
+        iter_results_json(args.results),
+        args.output_dir,
+        chunk_rows=args.chunk_rows or DEFAULT_CHUNK_ROWS,
+        precision=args.precision,
+    )
+    rows = sum(v["rows"] for v in manifest["variables"].values())
+    print(f"Exported {rows} results for {len(manifest['variables'])} variables")
+    return 0
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--variables", nargs="+", default=["HOMOSEX", "GRASS"], metavar="VAR"
+    )
+    parser.add_argument(
+        "--cutoffs", nargs="+", type=int, default=[1990, 2000], metavar="YEAR"
+    )
+    parser.add_argument(
+        "--output", "-o", help="results file (default: results/<model>.<format>)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl", "parquet"],
+        help="results format (default: from the --output suffix, else json); "
+        "parquet needs pyarrow",
+    )
+    parser.add_argument(
+        "--cache-dir", help="save forecasts here as jobs complete"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="reuse forecasts already in --cache-dir instead of starting over",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="value-forecasting",
+        description="Forecast, evaluate and export value-change predictions.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    forecast = commands.add_parser("forecast", help="run LLM forecasts")
+    forecast.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        help="API provider (default: from the model registry, else anthropic)",
+    )
+    forecast.add_argument(
+        "--model", help="model ID (default: per provider); also the cache label"
+    )
+    forecast.add_argument(
+        "--route",
+        choices=ROUTES,
+        help="send each target year to the cheapest or fastest registered model "
+        "whose training data ends before it",
+    )
+    forecast.add_argument(
+        "--candidates",
+        nargs="+",
+        metavar="MODEL",
+        help="models --route may choose from (default: all current API models)",
+    )
+    forecast.add_argument("--base-url", help="API base URL (e.g. the mock server)")
+    forecast.add_argument(
+        "--concurrency", type=int, default=1, help="parallel API calls (threads)"
+    )
+    forecast.add_argument(
+        "--contamination",
+        choices=["skip", "flag"],
+        default="skip",
+        help="target years the model may have seen in training: skip them "
+        "before any API call, or forecast them and report them apart as "
+        "<model>_contaminated (default: skip)",
+    )
+    forecast.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the projected calls, tokens, cost and minimum wall-clock "
+        "time instead of calling the API",
+    )
+    _add_run_arguments(forecast)
+    forecast.set_defaults(handler=cmd_forecast)
+
+    baseline = commands.add_parser("baseline", help="run a statistical baseline")
+    baseline.add_argument("--method", choices=BASELINES, default="linear")
+    baseline.add_argument(
+        "--workers", type=int, default=1, help="worker processes for fitting"
+    )
+    _add_run_arguments(baseline)
+    baseline.set_defaults(handler=cmd_baseline)
+
+    evaluate = commands.add_parser("evaluate", help="metrics for saved results")
+    evaluate.add_argument("results", nargs="+", help=".json, .jsonl or .parquet")
+    evaluate.add_argument(
+        "--by",
+        nargs="+",
+        default=["model"],
+        choices=["model", "variable", "cutoff_year", "horizon"],
+        help="group metrics by these dimensions (default: model)",
+    )
+    evaluate.add_argument("--output", "-o", help="also write the metrics as JSON")
+    evaluate.set_defaults(handler=cmd_evaluate)
+
+    export = commands.add_parser("export", help="export results for the web app")
+    export.add_argument("results", help=".json, .jsonl or .parquet results file")
+    export.add_argument("output_dir", nargs="?", default="app/public/data")
+    export.add_argument("--chunk-rows", type=int)
+    export.add_argument("--precision", type=int, default=2)
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the ``value-forecasting`` console script."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "resume", False) and not args.cache_dir:
+        parser.error("--resume needs --cache-dir")
+    for name in ("concurrency", "workers"):
+        if getattr(args, name, 1) < 1:
+            parser.error(f"--{name} must be at least 1")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
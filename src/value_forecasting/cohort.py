@@ -0,0 +1,557 @@
+"""Cohort-replacement (demographic shift) baseline.
+
+Each birth cohort keeps the support it had at the cutoff. The aggregate still
+moves, because the adult population turns over: older cohorts die out and new
+cohorts reach adulthood. New cohorts take the rate of the youngest observed
+cohort, so this is the pure-replacement projection, with no period effects.
+
+The population of cohort ``c`` (born in year ``c``) in year ``t`` is
+``E_c * l(t - c)`` for adult ages. Here ``E_c`` is the cohort's size on entering
+adulthood and ``l`` is survivorship from a :class:`LifeTable`. With
+time-invariant mortality, this is exactly what stepping a cohort-component
+projection forward one year at a time gives. Computed this way, all years
+come from one array expression. The aggregate for every variable and year is
+then one product, ``support (V, C) @ weights (C, T)``, over cohort bins.
+
+Cohort support rates come from (in order of preference):
+
+- :func:`cohort_rates_from_microdata`: respondent-level arrays (survey year,
+  birth year, liberal response, optional weight), registered per variable
+  in :data:`COHORT_MICRODATA`;
+- :data:`COHORT_SUPPORT`: supplied tables, ``variable -> survey year ->
+  birth year -> percent``;
+- for variables with neither, the cohort gradient implied by the aggregate
+  series. Past waves are regressed on the mean birth year of the adult
+  population.
+
+Projections are anchored to the last observed wave. Intervals combine the
+sampling error of the cohort rates with period shocks: wave-to-wave changes
+that replacement does not explain, accumulating like a random walk.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.stats import norm
+
+from value_forecasting import instrumentation
+from value_forecasting.forecaster import Forecast
+from value_forecasting.gss_variables import HISTORICAL_TRAJECTORIES
+
+ADULT_AGE = 18
+MAX_AGE = 99
+# Gompertz-Makeham hazard, MAKEHAM + GOMPERTZ_A * exp(GOMPERTZ_B * age): about
+# 60 years of remaining life at 18, close to recent US period life tables.
+MAKEHAM = 5e-4
+GOMPERTZ_A = 3e-5
+GOMPERTZ_B = 0.095
+COHORT_WIDTH = 10
+# Waves within this many years of the cutoff define the cohort rates.
+WINDOW = 10
+# Period-shock sd (points per decade) when a series has too few waves.
+FALLBACK_SD = 5.0
+MODEL_NAME = "cohort_replacement"
+
+# Supplied cohort tables: variable -> survey year -> birth year -> percent
+# giving the liberal response. Birth years are grouped into COHORT_WIDTH bins.
+COHORT_SUPPORT: dict[str, dict[int, dict[int, float]]] = {}
+# Respondent-level data: variable -> {"year", "birth_year", "liberal" and
+# optionally "weight"} -> one array entry per response.
+COHORT_MICRODATA: dict[str, dict[str, np.ndarray]] = {}
+
+
+@dataclass
+class LifeTable:
+    """Annual death probabilities for ages ADULT_AGE..MAX_AGE."""
+
+    death_prob: np.ndarray
+    # Growth per year in the size of each cohort entering adulthood.
+    entry_growth: float = 0.0
+
+    @classmethod
+    def gompertz(
+        cls,
+        makeham: float = MAKEHAM,
+        a: float = GOMPERTZ_A,
+        b: float = GOMPERTZ_B,
+        entry_growth: float = 0.0,
+    ) -> "LifeTable":
+        """Gompertz-Makeham mortality (the default life table)."""
+        ages = np.arange(ADULT_AGE, MAX_AGE + 1)
+        hazard = makeham + a * np.exp(b * ages)
+        return cls(1 - np.exp(-hazard), entry_growth)
+
+    def survivorship(self) -> np.ndarray:
+        """Share of an entering cohort alive at each age ADULT_AGE..MAX_AGE."""
+        return np.concatenate([[1.0], np.cumprod(1 - self.death_prob[:-1])])
+
+    def population(self, years, birth_years) -> np.ndarray:
+        """Adult population shares, shape (len(years), len(birth_years))."""
+        years = np.asarray(years)[:, None]
+        birth_years = np.asarray(birth_years)[None, :]
+        age = years - birth_years
+        alive = (age >= ADULT_AGE) & (age <= MAX_AGE)
+        survivors = self.survivorship()[
+            np.clip(age - ADULT_AGE, 0, MAX_AGE - ADULT_AGE)
+        ]
+        entrants = (1 + self.entry_growth) ** (birth_years - birth_years.max())
+        counts = np.where(alive, entrants * survivors, 0.0)
+        return counts / counts.sum(axis=1, keepdims=True)
+
+
+@dataclass
+class CohortRates:
+    """
+    Support by birth cohort for several variables at one cutoff.
+
+    Attributes:
+        variables: Rows of ``support``.
+        cutoff_year: Rates describe cohorts as of this year.
+        cohorts: First birth year of each bin, shape (C,).
+        support: Percent support per variable and bin, shape (V, C).
+        cov: Sampling covariance of ``support`` (percent^2), shape (V, C, C).
+        source: Where each variable's rates came from ("microdata", "table"
+            or "implied").
+    """
+
+    variables: list[str]
+    cutoff_year: int
+    cohorts: np.ndarray
+    support: np.ndarray
+    cov: np.ndarray
+    source: list[str]
+
+    def bin_weights(self, years, life: LifeTable) -> np.ndarray:
+        """Population shares per cohort bin, shape (len(years), C)."""
+        years = np.asarray(years)
+        births = np.arange(years.min() - MAX_AGE, years.max() - ADULT_AGE + 1)
+        width = self.cohorts[1] - self.cohorts[0] if len(self.cohorts) > 1 else 1
+        # Cohorts outside the observed bins take the nearest bin's rate: new
+        # cohorts inherit the youngest observed cohort's support.
+        index = np.clip((births - self.cohorts[0]) // width, 0, len(self.cohorts) - 1)
+        onehot = index[:, None] == np.arange(len(self.cohorts))
+        return life.population(years, births) @ onehot
+
+    def project(self, years, life: LifeTable | None = None):
+        """Implied aggregate support and its sampling sd, each shape (V, len(years))."""
+        weights = self.bin_weights(years, life or LifeTable.gompertz())
+        mean = self.support @ weights.T
+        var = np.einsum("tb,vbc,tc->vt", weights, self.cov, weights)
+        return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def cohort_grid(cutoff_year: int, cohort_width: int = COHORT_WIDTH) -> np.ndarray:
+    """First birth year of each bin of cohorts that are adults at the cutoff."""
+    first = (cutoff_year - MAX_AGE) // cohort_width * cohort_width
+    last = (cutoff_year - ADULT_AGE) // cohort_width * cohort_width
+    return np.arange(first, last + 1, cohort_width)
+
+
+def _fill_nearest(support: np.ndarray, cov: np.ndarray):
+    """Fill bins without data (NaN) from the nearest bin with data in each row."""
+    n_bins = support.shape[1]
+    observed = ~np.isnan(support)
+    positions = np.where(observed, np.arange(n_bins), -1)
+    before = np.maximum.accumulate(positions, axis=1)
+    after = np.where(observed, np.arange(n_bins), n_bins)
+    after = np.minimum.accumulate(after[:, ::-1], axis=1)[:, ::-1]
+    bins = np.arange(n_bins)
+    use_after = (before < 0) | ((after < n_bins) & (after - bins < bins - before))
+    source = np.where(use_after, after, before)
+    rows = np.arange(len(support))[:, None]
+    support = support[rows, source]
+    cov = cov[rows[..., None], source[:, :, None], source[:, None, :]]
+    return support, cov
+
+
+def _from_bins(variables, cutoff_year, grid, support, var, source) -> CohortRates:
+    cov = np.zeros((*support.shape, support.shape[1]))
+    index = np.arange(support.shape[1])
+    cov[:, index, index] = np.nan_to_num(var)
+    support, cov = _fill_nearest(support, cov)
+    return CohortRates(
+        list(variables), cutoff_year, grid, support, cov, [source] * len(variables)
+    )
+
+
+def cohort_rates_from_microdata(
+    variable,
+    year,
+    birth_year,
+    liberal,
+    cutoff_year: int,
+    weight=None,
+    window: int = WINDOW,
+    cohort_width: int = COHORT_WIDTH,
+) -> CohortRates:
+    """
+    Cohort support rates from respondent-level data.
+
+    Args:
+        variable: Variable name per response.
+        year: Survey year per response.
+        birth_year: Respondent's birth year.
+        liberal: 1 if the response is the liberal one, else 0.
+        cutoff_year: Only responses from the ``window`` years up to and
+            including the cutoff are used.
+        weight: Optional survey weights.
+        window: Years of waves pooled into the rates.
+        cohort_width: Birth years per cohort bin.
+
+    Returns:
+        Rates for every variable with responses in the window. Bins without
+        respondents take the nearest bin's rate. Sampling variances use the
+        Kish effective sample size.
+    """
+    variable = np.asarray(variable)
+    year = np.asarray(year)
+    birth_year = np.asarray(birth_year)
+    liberal = np.asarray(liberal, dtype=float)
+    weight = np.ones(len(year)) if weight is None else np.asarray(weight, float)
+    keep = (year <= cutoff_year) & (year > cutoff_year - window)
+    grid = cohort_grid(cutoff_year, cohort_width)
+    if not keep.any():
+        return _from_bins([], cutoff_year, grid, np.zeros((0, len(grid))), 0.0, "")
+    names, codes = np.unique(variable[keep], return_inverse=True)
+    bins = np.clip((birth_year[keep] - grid[0]) // cohort_width, 0, len(grid) - 1)
+    cells = codes * len(grid) + bins.astype(int)
+    size = len(names) * len(grid)
+
+    def total(values):
+        return np.bincount(cells, values, minlength=size).reshape(len(names), -1)
+
+    w = weight[keep]
+    sum_w, sum_wy, sum_w2 = total(w), total(w * liberal[keep]), total(w * w)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = sum_wy / sum_w
+        n_eff = sum_w**2 / sum_w2
+        var = 100**2 * share * (1 - share) / n_eff
+    return _from_bins(names.tolist(), cutoff_year, grid, 100 * share, var, "microdata")
+
+
+def cohort_rates_from_registered(
+    cutoff_year: int,
+    variables: list[str] | None = None,
+    window: int = WINDOW,
+    cohort_width: int = COHORT_WIDTH,
+) -> CohortRates:
+    """
+    Cohort support rates from :data:`COHORT_MICRODATA`.
+
+    Variables without responses in the ``window`` years up to the cutoff
+    are left out.
+    """
+    names = [
+        name
+        for name in (COHORT_MICRODATA if variables is None else variables)
+        if name in COHORT_MICRODATA
+    ]
+    data = [COHORT_MICRODATA[name] for name in names]
+
+    def column(key):
+        return np.concatenate([np.asarray(d[key], float) for d in data] or [[]])
+
+    sizes = [len(d["year"]) for d in data]
+    weight = None
+    if any("weight" in d for d in data):
+        weights = [d.get("weight", np.ones(n)) for d, n in zip(data, sizes)]
+        weight = np.concatenate(weights).astype(float)
+    return cohort_rates_from_microdata(
+        np.repeat(names, sizes),
+        column("year"),
+        column("birth_year"),
+        column("liberal"),
+        cutoff_year,
+        weight,
+        window,
+        cohort_width,
+    )
+
+
+def cohort_rates_from_tables(
+    cutoff_year: int,
+    variables: list[str] | None = None,
+    window: int = WINDOW,
+    cohort_width: int = COHORT_WIDTH,
+) -> CohortRates:
+    """
+    Cohort support rates from :data:`COHORT_SUPPORT`.
+
+    Rates are averaged over the waves in the ``window`` years up to the
+    cutoff. Tables carry no sample sizes, so the sampling covariance is zero.
+    Variables without a table wave in the window are left out.
+    """
+    grid = cohort_grid(cutoff_year, cohort_width)
+    names, rows = [], []
+    for name in COHORT_SUPPORT if variables is None else variables:
+        waves = COHORT_SUPPORT.get(name, {})
+        cells = [
+            (birth, value)
+            for year, table in waves.items()
+            if cutoff_year - window < year <= cutoff_year
+            for birth, value in table.items()
+        ]
+        if not cells:
+            continue
+        births, values = np.array(cells, dtype=float).T
+        bins = np.clip((births - grid[0]) // cohort_width, 0, len(grid) - 1).astype(int)
+        counts = np.bincount(bins, minlength=len(grid))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rows.append(np.bincount(bins, values, minlength=len(grid)) / counts)
+        names.append(name)
+    support = np.array(rows).reshape(len(names), len(grid))
+    return _from_bins(names, cutoff_year, grid, support, 0.0, "table")
+
+
+def _padded_waves(variables, cutoff_year):
+    """Pre-cutoff waves as padded (V, W) years, values and mask."""
+    series = [
+        sorted(
+            (y, v)
+            for y, v in HISTORICAL_TRAJECTORIES.get(name, {}).items()
+            if y <= cutoff_year
+        )
+        for name in variables
+    ]
+    width = max((len(s) for s in series), default=0) or 1
+    years = np.full((len(series), width), cutoff_year)
+    values = np.zeros((len(series), width))
+    mask = np.zeros((len(series), width), dtype=bool)
+    for i, points in enumerate(series):
+        if points:
+            years[i, : len(points)], values[i, : len(points)] = np.array(points).T
+            mask[i, : len(points)] = True
+    return years, values, mask
+
+
+def implied_cohort_rates(
+    cutoff_year: int,
+    variables: list[str],
+    life: LifeTable | None = None,
+    cohort_width: int = COHORT_WIDTH,
+) -> CohortRates:
+    """
+    Cohort rates implied by the aggregate series alone.
+
+    Support is taken to be linear in birth year, ``s(c) = a + b * (c -
+    cutoff) / 10``. The aggregate in year ``t`` is then ``a + b * m(t)``,
+    where ``m(t)`` is the population-weighted mean of ``(c - cutoff) / 10``.
+    ``a`` and ``b`` are fit by least squares on the pre-cutoff waves; all
+    variables are solved at once. Variables with fewer than two waves are
+    left out.
+    """
+    life = life or LifeTable.gompertz()
+    years, values, mask = _padded_waves(variables, cutoff_year)
+    keep = mask.sum(axis=1) >= 2
+    years, values, mask = years[keep], values[keep], mask[keep]
+    names = [name for name, k in zip(variables, keep) if k]
+    grid = cohort_grid(cutoff_year, cohort_width)
+    if not names:
+        return _from_bins([], cutoff_year, grid, np.zeros((0, len(grid))), 0.0, "")
+
+    wave_years = np.unique(years)
+    births = np.arange(wave_years.min() - MAX_AGE, wave_years.max() - ADULT_AGE + 1)
+    mean_birth = life.population(wave_years, births) @ ((births - cutoff_year) / 10)
+    m = np.where(mask, mean_birth[np.searchsorted(wave_years, years)], 0.0)
+    n = mask.sum(axis=1)
+    sm, sy = m.sum(axis=1), (values * mask).sum(axis=1)
+    smm, smy = (m * m).sum(axis=1), (m * values).sum(axis=1)
+    denom = n * smm - sm**2
+    slope = (n * smy - sm * sy) / denom
+    intercept = (sy - slope * sm) / n
+    resid = (values - intercept[:, None] - slope[:, None] * m) * mask
+    df = n - 2
+    resid_var = np.where(
+        df > 0, (resid**2).sum(axis=1) / np.maximum(df, 1), FALLBACK_SD**2
+    )
+    # OLS covariance of (a, b): resid_var * inv([[n, sm], [sm, smm]]).
+    coef_cov = (
+        resid_var[:, None, None]
+        * np.stack([np.stack([smm, -sm], -1), np.stack([-sm, n], -1)], -2)
+        / denom[:, None, None]
+    )
+
+    design = np.stack(
+        [np.ones(len(grid)), (grid + (cohort_width - 1) / 2 - cutoff_year) / 10], -1
+    )
+    support = np.clip(intercept[:, None] + slope[:, None] * design[:, 1], 0, 100)
+    cov = np.einsum("ci,vij,dj->vcd", design, coef_cov, design)
+    return CohortRates(names, cutoff_year, grid, support, cov, ["implied"] * len(names))
+
+
+def cohort_rates(
+    cutoff_year: int,
+    variables: list[str],
+    life: LifeTable | None = None,
+    cohort_width: int = COHORT_WIDTH,
+) -> CohortRates:
+    """
+    Rates from :data:`COHORT_MICRODATA` where available, then from
+    :data:`COHORT_SUPPORT`, else implied ones.
+    """
+    microdata = cohort_rates_from_registered(
+        cutoff_year, variables, cohort_width=cohort_width
+    )
+    rest = [name for name in variables if name not in microdata.variables]
+    tables = cohort_rates_from_tables(cutoff_year, rest, cohort_width=cohort_width)
+    rest = [name for name in rest if name not in tables.variables]
+    implied = implied_cohort_rates(cutoff_year, rest, life, cohort_width)
+    parts = (microdata, tables, implied)
+    return CohortRates(
+        [name for part in parts for name in part.variables],
+        cutoff_year,
+        implied.cohorts,
+        np.concatenate([part.support for part in parts]),
+        np.concatenate([part.cov for part in parts]),
+        [source for part in parts for source in part.source],
+    )
+
+
+@instrumentation.timed("cohort.project")
+def project_cohort_support(
+    rates: CohortRates,
+    target_years: list[int],
+    life: LifeTable | None = None,
+    level: float = 0.9,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Project aggregate support for every variable in ``rates``.
+
+    Args:
+        rates: Cohort rates at the cutoff.
+        target_years: Years to project to.
+        life: Mortality and cohort entry (default: :meth:`LifeTable.gompertz`).
+        level: Central interval coverage.
+
+    Returns:
+        Point projections and lower/upper bounds in percent, each (V, H).
+        Projections are shifted to match each variable's last observed wave
+        when it has one.
+    """
+    life = life or LifeTable.gompertz()
+    targets = np.asarray(target_years, dtype=int)
+    if not len(targets):
+        empty = np.zeros((len(rates.variables), 0))
+        return empty, empty.copy(), empty.copy()
+    years, values, mask = _padded_waves(rates.variables, rates.cutoff_year)
+    all_years = np.unique(np.concatenate([years.ravel(), targets]))
+    mean, sd = rates.project(all_years, life)
+    rows = np.arange(len(rates.variables))[:, None]
+    gap = np.where(mask, values - mean[rows, np.searchsorted(all_years, years)], 0.0)
+
+    # Anchor on the last wave; period shocks are changes in the gap between waves.
+    n = mask.sum(axis=1)
+    last = np.maximum(n - 1, 0)
+    offset = gap[rows[:, 0], last]
+    last_year = np.where(n > 0, years[rows[:, 0], last], rates.cutoff_year)
+    step = np.diff(gap, axis=1)
+    decades = np.maximum(np.diff(years, axis=1), 1) / 10
+    pairs = mask[:, 1:] & mask[:, :-1]
+    period_var = np.where(
+        pairs.sum(axis=1) > 0,
+        (np.where(pairs, step**2 / decades, 0)).sum(axis=1)
+        / np.maximum(pairs.sum(axis=1), 1),
+        FALLBACK_SD**2,
+    )
+
+    columns = np.searchsorted(all_years, targets)
+    point = mean[:, columns] + offset[:, None]
+    ahead = np.maximum(targets[None, :] - last_year[:, None], 0) / 10
+    spread = np.sqrt(sd[:, columns] ** 2 + period_var[:, None] * ahead)
+    z = norm.ppf(0.5 + level / 2)
+    return (
+        np.clip(point, 0, 100),
+        np.clip(point - z * spread, 0, 100),
+        np.clip(point + z * spread, 0, 100),
+    )
+
+
+def run_cohort_forecasts(
+    jobs: list[tuple[str, int, list[int]]],
+    life: LifeTable | None = None,
+    level: float = 0.9,
+) -> list[Forecast]:
+    """
+    Cohort-replacement forecasts for many ``(variable, cutoff, targets)`` jobs.
+
+    Jobs are grouped by cutoff, with one projection per cutoff covering all
+    its variables and target years. Variables with no microdata, no cohort
+    tables and fewer than two waves before the cutoff get no forecasts.
+    """
+    by_cutoff: dict[int, list] = {}
+    for job in jobs:
+        by_cutoff.setdefault(job[1], []).append(job)
+    forecasts = []
+    for cutoff, group in by_cutoff.items():
+        targets = sorted({year for _, _, years in group for year in years})
+        if not targets:
+            continue
+        variables = list(dict.fromkeys(variable for variable, _, _ in group))
+        rates = cohort_rates(cutoff, variables, life)
+        if not rates.variables:
+            continue
+        point, lower, upper = project_cohort_support(rates, targets, life, level)
+        row = {name: i for i, name in enumerate(rates.variables)}
+        column = {year: h for h, year in enumerate(targets)}
+        for variable, _, target_years in group:
+            if variable not in row:
+                continue
+            j = row[variable]
+            youngest = rates.support[j, -1]
+            description = (
+                f"Cohort replacement ({rates.source[j]} rates); youngest cohort "
+                f"{youngest:.1f}%, oldest {rates.support[j, 0]:.1f}%"
+            )
+            for year in target_years:
+                h = column[year]
+                forecasts.append(
+                    Forecast(
+                        variable=variable,
+                        cutoff_year=cutoff,
+                        target_year=year,
+                        point_estimate=float(point[j, h]),
+                        lower_bound=float(lower[j, h]),
+                        upper_bound=float(upper[j, h]),
+                        model=MODEL_NAME,
+                        raw_response=description,
+                    )
+                )
+    return forecasts
+
+
+def run_cohort_forecast(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+) -> list[Forecast]:
+    """
+    Cohort-replacement baseline for one variable.
+
+    See :func:`run_cohort_forecasts` to project many series at once.
+    """
+    return run_cohort_forecasts([(variable, cutoff_year, target_years)])
+
+
+def cohort_fingerprint(variable: str, cutoff_year: int) -> str:
+    """
+    Hash of the variable's cohort tables and microdata.
+
+    Used as ``run_cohort_forecast.fingerprint`` by
+    :mod:`value_forecasting.incremental`, so registering or revising them
+    invalidates cached cohort forecasts.
+    """
+    tables = sorted(
+        (year, sorted(table.items()))
+        for year, table in COHORT_SUPPORT.get(variable, {}).items()
+        if year <= cutoff_year
+    )
+    digest = hashlib.blake2b(json.dumps(tables).encode(), digest_size=8)
+    for key, values in sorted(COHORT_MICRODATA.get(variable, {}).items()):
+        digest.update(key.encode())
+        digest.update(np.asarray(values, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+run_cohort_forecast.fingerprint = cohort_fingerprint
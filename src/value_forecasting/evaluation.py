@@ -2,6 +2,8 @@
 
 from dataclasses import dataclass, field
 
+from value_forecasting import instrumentation
+
 
 @dataclass
 class ForecastResult:
@@ -80,6 +82,23 @@ def calculate_bias(results: list[ForecastResult]) -> float:
     return sum(r.error for r in results) / len(results)
 
 
+def calculate_crps(probabilities, actual: float) -> float:
+    """
+    Continuous Ranked Probability Score for a forecast over integer bins 0-100.
+
+    ``probabilities[k]`` is the forecast probability of ``k`` percent. Uses the
+    discrete form sum_k (F(k) - 1{actual <= k})^2 with unit bin width, so the
+    score is in percentage points and lower is better.
+    """
+    cdf = 0.0
+    total = 0.0
+    for k, p in enumerate(probabilities):
+        cdf += p
+        total += (cdf - (1.0 if actual <= k else 0.0)) ** 2
+    return total
+
+
+@instrumentation.timed("evaluation.evaluate_model")
 def evaluate_model(results: list[ForecastResult]) -> dict:
     """Calculate all evaluation metrics for a set of forecasts."""
     return {
@@ -0,0 +1,292 @@
+"""Chunked export of forecast results for the web app.
+
+Streams :class:`ForecastResult` rows into per-variable chunk files that the
+dashboard can fetch lazily, plus precomputed aggregates so the browser never
+recomputes metrics over the full result set::
+
+    <output_dir>/
+        manifest.json           variables -> chunk files, row counts, models
+        aggregates.json         per-model metrics, overall and per variable
+        cube.json               metric cube for slicing (see metric_cube)
+        historical.json         observed trajectories from gss_variables
+        forecasts/<VARIABLE>/part-00000.json
+
+Chunks are columnar JSON (``{"column": [values, ...]}``) with floats rounded
+to ``precision`` decimals.
+
+Rows are buffered per variable and written every ``chunk_rows`` rows, and
+metrics are accumulated as running sums, so memory stays bounded however many
+results are exported.
+
+From the command line::
+
+    python -m value_forecasting.export results/forecasts.json app/public/data
+"""
+
+import argparse
+import json
+import shutil
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict
+from pathlib import Path
+
+from value_forecasting import instrumentation
+from value_forecasting.evaluation import ForecastResult
+from value_forecasting.gss_variables import GSS_VARIABLES, HISTORICAL_TRAJECTORIES
+from value_forecasting.metric_cube import CubeBuilder
+
+DEFAULT_CHUNK_ROWS = 5000
+# The variable is implied by the chunk's directory.
+COLUMNS = (
+    "cutoff_year",
+    "target_year",
+    "predicted",
+    "actual",
+    "lower",
+    "upper",
+    "model",
+)
+FLOAT_COLUMNS = ("predicted", "actual", "lower", "upper")
+RESULT_FIELDS = ("variable", *COLUMNS)
+RESULT_FORMATS = ("json", "jsonl", "parquet")
+
+
+def _require_pyarrow(purpose: str):
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f"{purpose} needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def iter_results_json(path: str | Path) -> Iterator[ForecastResult]:
+    """
+    Read results written by ``run_experiment.main`` or :func:`write_results`.
+
+    ``.json`` files are ``{group: [row, ...]}`` as written by ``main()``;
+    ``.jsonl`` files (one row per line) are streamed; ``.parquet`` files are
+    read with pandas (needs ``pyarrow``).
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield ForecastResult(**json.loads(line))
+        return
+    if path.suffix == ".parquet":
+        import pandas as pd
+
+        _require_pyarrow("Parquet input")
+        frame = pd.read_parquet(path, columns=RESULT_FIELDS)
+        for row in frame.itertuples(index=False):
+            yield ForecastResult(
+                row.variable,
+                int(row.cutoff_year),
+                int(row.target_year),
+                float(row.predicted),
+                float(row.actual),
+                float(row.lower),
+                float(row.upper),
+                row.model,
+            )
+        return
+    with open(path) as f:
+        groups = json.load(f)
+    for rows in groups.values():
+        for row in rows:
+            yield ForecastResult(**row)
+
+
+def write_results(
+    results: dict[str, list[ForecastResult]],
+    path: str | Path,
+    format: str | None = None,
+) -> Path:
+    """
+    Write grouped results in a format :func:`iter_results_json` reads back.
+
+    Args:
+        results: Results by group, as returned by ``run_experiment``.
+        path: Output file; parent directories are created.
+        format: ``"json"`` (grouped, as ``run_experiment.main``), ``"jsonl"``
+            or ``"parquet"`` (flat rows; needs ``pyarrow``). Inferred from the
+            suffix of ``path`` when omitted.
+
+    Returns:
+        The path written.
+    """
+    path = Path(path)
+    format = format or {".jsonl": "jsonl", ".parquet": "parquet"}.get(
+        path.suffix, "json"
+    )
+    if format not in RESULT_FORMATS:
+        raise ValueError(f"Unknown results format: {format!r}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if format == "json":
+        with open(path, "w") as f:
+            json.dump(
+                {group: [asdict(r) for r in rows] for group, rows in results.items()},
+                f,
+                indent=2,
+            )
+    elif format == "jsonl":
+        with open(path, "w") as f:
+            for rows in results.values():
+                for r in rows:
+                    f.write(json.dumps(asdict(r)) + "\n")
+    else:
+        import pandas as pd
+
+        _require_pyarrow("Parquet output")
+        rows = [asdict(r) for group in results.values() for r in group]
+        frame = pd.DataFrame(rows, columns=list(RESULT_FIELDS))
+        frame.to_parquet(path, index=False)
+    return path
+
+
+def _chunk_name(variable: str) -> str:
+    # Variable names are GSS mnemonics; keep paths safe regardless.
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in variable)
+
+
+class _ChunkWriter:
+    def __init__(self, directory: Path, precision: int):
+        self.directory = directory
+        self.precision = precision
+        self.counts: dict[str, int] = defaultdict(int)
+        self.files: dict[str, list[str]] = defaultdict(list)
+
+    def write(self, variable: str, columns: dict[str, list]) -> None:
+        folder = self.directory / _chunk_name(variable)
+        folder.mkdir(parents=True, exist_ok=True)
+        name = f"part-{len(self.files[variable]):05d}.json"
+        for column in FLOAT_COLUMNS:
+            columns[column] = [round(v, self.precision) for v in columns[column]]
+        with open(folder / name, "w") as f:
+            json.dump(columns, f, separators=(",", ":"))
+        self.files[variable].append(f"forecasts/{folder.name}/{name}")
+        self.counts[variable] += len(columns["model"])
+
+
+def _historical() -> dict:
+    return {
+        variable: {
+            "question": info.get("question", ""),
+            "description": info.get("description", ""),
+            "data": [
+                {"year": year, "value": value}
+                for year, value in sorted(
+                    HISTORICAL_TRAJECTORIES.get(variable, {}).items()
+                )
+            ],
+        }
+        for variable, info in GSS_VARIABLES.items()
+        if variable in HISTORICAL_TRAJECTORIES
+    }
+
+
+def _write_json(path: Path, data) -> None:
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    tmp.replace(path)
+
+
+@instrumentation.timed("export.export_results")
+def export_results(
+    results: Iterable[ForecastResult],
+    output_dir: str | Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    precision: int = 2,
+) -> dict:
+    """
+    Stream results into chunked per-variable files plus aggregates.
+
+    Args:
+        results: Any iterable of results (e.g. :func:`iter_results_json`);
+            consumed once.
+        output_dir: Directory the app serves (e.g. ``app/public/data``).
+            Existing chunks under ``forecasts/`` are replaced.
+        chunk_rows: Maximum rows per chunk file.
+        precision: Decimals kept for floats.
+
+    Returns:
+        The manifest that was written to ``manifest.json``.
+    """
+    output_dir = Path(output_dir)
+    chunk_dir = output_dir / "forecasts"
+    if chunk_dir.exists():
+        shutil.rmtree(chunk_dir)
+    chunk_dir.mkdir(parents=True)
+
+    writer = _ChunkWriter(chunk_dir, precision)
+    buffers: dict[str, dict[str, list]] = {}
+    cube = CubeBuilder()
+    models: dict[str, set[str]] = defaultdict(set)
+
+    for result in results:
+        buffer = buffers.get(result.variable)
+        if buffer is None:
+            buffer = buffers[result.variable] = {c: [] for c in COLUMNS}
+        for column in COLUMNS:
+            buffer[column].append(getattr(result, column))
+        cube.add(result)
+        models[result.variable].add(result.model)
+        if len(buffer["model"]) >= chunk_rows:
+            writer.write(result.variable, buffer)
+            del buffers[result.variable]
+
+    for variable, buffer in buffers.items():
+        writer.write(variable, buffer)
+
+    manifest = {
+        "version": 1,
+        "format": "json",
+        "columns": list(COLUMNS),
+        "variables": {
+            variable: {
+                "rows": writer.counts[variable],
+                "models": sorted(models[variable]),
+                "chunks": writer.files[variable],
+            }
+            for variable in sorted(writer.files)
+        },
+    }
+    metric_cube = cube.build()
+    by_variable: dict[str, dict] = defaultdict(dict)
+    for (variable, model), metrics in metric_cube.rollup(["variable", "model"]).items():
+        by_variable[variable][model] = metrics
+    aggregates = {"models": metric_cube.rollup(["model"]), "by_variable": by_variable}
+    _write_json(output_dir / "aggregates.json", aggregates)
+    _write_json(output_dir / "cube.json", metric_cube.to_json())
+    _write_json(output_dir / "historical.json", _historical())
+    # The manifest goes last so a reader never sees it point at missing chunks.
+    _write_json(output_dir / "manifest.json", manifest)
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Export a results file for the web app."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "results", help="results/forecasts.json, or a .jsonl or .parquet file"
+    )
+    parser.add_argument("output_dir", nargs="?", default="app/public/data")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--precision", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    manifest = export_results(
+        iter_results_json(args.results),
+        args.output_dir,
+        chunk_rows=args.chunk_rows,
+        precision=args.precision,
+    )
+    rows = sum(v["rows"] for v in manifest["variables"].values())
+    print(f"Exported {rows} results for {len(manifest['variables'])} variables")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,36 @@
 """Core forecasting logic using LLMs."""
 
+import importlib
 import json
+import os
 import re
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import InitVar, dataclass, field
+from typing import TYPE_CHECKING
 
-from anthropic import Anthropic
-from openai import OpenAI
+from . import instrumentation, response_store
+from .gss_variables import get_historical_context
+from .models import MODELS, api_style
 
-from .gss_variables import GSS_VARIABLES, get_historical_context
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+    from openai import OpenAI
 
 
-# Model cutoff dates for reference
-MODEL_CUTOFFS = {
-    "davinci-002": "Oct 2019",  # Original GPT-3
-    "text-davinci-002": "June 2021",
-    "text-davinci-003": "June 2021",
-    "gpt-3.5-turbo-0301": "Sep 2021",
-    "gpt-3.5-turbo": "Sep 2021",
-    "gpt-4-0314": "Sep 2021",
-    "claude-sonnet-4-20250514": "Early 2024",  # Contaminated for GSS 2021
-}
+# Model cutoff dates for reference (see models.MODELS for the full specs)
+MODEL_CUTOFFS = {name: spec.training_cutoff for name, spec in MODELS.items()}
 
 
-@dataclass
+@response_store.stores_raw_response
+@dataclass(slots=True)
 class Forecast:
-    """A single forecast with uncertainty."""
+    """
+    A single forecast with uncertainty.
+
+    ``raw_response`` is kept once in the response store; the forecast holds
+    only its ``response_id`` and loads the text when it is accessed.
+    """
 
     variable: str
     cutoff_year: int
@@ -33,7 +39,12 @@ class Forecast:
     lower_bound: float  # 90% CI
     upper_bound: float
     model: str
-    raw_response: str
+    raw_response: InitVar[str] = ""
+    response_id: str = field(default="", repr=False)
+
+    def __post_init__(self, raw_response: str):
+        if raw_response:
+            self.response_id = response_store.put(raw_response)
 
 
 def create_forecast_prompt(
@@ -43,10 +54,13 @@ def create_forecast_prompt(
 ) -> str:
     """Create a prompt for value forecasting."""
     context = get_historical_context(variable, cutoff_year)
-    var_info = GSS_VARIABLES[variable]
+    instructions = create_forecast_instructions(cutoff_year, target_years)
+    return f"{context}\n\n{instructions}"
 
-    prompt = f"""{context}
 
+def create_forecast_instructions(cutoff_year: int, target_years: list[int]) -> str:
+    """The task part of the forecast prompt, after the historical context."""
+    return f"""\
 You are a social scientist in {cutoff_year} analyzing trends in American public opinion.
 Based ONLY on the historical data above and your knowledge of social change patterns
 up to {cutoff_year}, predict what percentage will give the liberal/progressive response
@@ -73,48 +87,81 @@ Respond in JSON format:
     "reasoning": "Brief explanation of your reasoning"
 }}
 """
-    return prompt
 
 
-def extract_predictions(response_text: str) -> dict:
-    """Extract JSON predictions from model response."""
-    # Try to find JSON in the response
-    json_match = re.search(r"\{[\s\S]*\}", response_text)
-    if json_match:
-        try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-    return {"predictions": [], "reasoning": "Failed to parse"}
-
-
-def run_forecast(
-    variable: str,
+def create_packed_prompt(
+    variables: list[str],
     cutoff_year: int,
     target_years: list[int],
-    model: str = "claude-sonnet-4-20250514",
-) -> list[Forecast]:
-    """Run a forecast using Claude."""
-    client = Anthropic()
+) -> str:
+    """Create one prompt forecasting several variables from the same cutoff."""
+    sections = [
+        f"Variable: {variable}\n{get_historical_context(variable, cutoff_year)}\n"
+        for variable in variables
+    ]
+    instructions = create_packed_instructions(variables, cutoff_year, target_years)
+    return "".join(sections) + instructions
 
-    prompt = create_forecast_prompt(variable, cutoff_year, target_years)
 
-    # System prompt to set temporal context
-    system = f"""You are a social scientist conducting research in {cutoff_year}.
+def create_packed_instructions(
+    variables: list[str], cutoff_year: int, target_years: list[int]
+) -> str:
+    """The task part of the packed prompt, after the variables' contexts."""
+    return f"""\
+You are a social scientist in {cutoff_year} analyzing trends in American public opinion.
+Based ONLY on the historical data above and your knowledge of social change patterns
+up to {cutoff_year}, predict what percentage will give the liberal/progressive response
+to EACH question above in future years.
+
+For each variable and target year, provide:
+1. Your point estimate (%)
+2. A 90% confidence interval (lower%, upper%)
+
+Consider factors like:
+- Generational replacement (younger cohorts replacing older ones)
+- Social exposure and contact effects
+- Information cascades and tipping points
+- Historical patterns of moral change
+
+Variables to predict: {variables}
+Target years to predict: {target_years}
+
+Respond in JSON format, with an entry for every variable:
+{{
+    "predictions": {{
+        "VARIABLE": [
+            {{"year": YYYY, "estimate": XX, "lower": XX, "upper": XX}},
+            ...
+        ],
+        ...
+    }},
+    "reasoning": "Brief explanation of your reasoning"
+}}
+"""
+
+
+def create_system_prompt(cutoff_year: int) -> str:
+    """System prompt that fixes the forecaster's temporal vantage point."""
+    return f"""You are a social scientist conducting research in {cutoff_year}.
 You have access only to information available up to {cutoff_year}.
 You do not know what happened after {cutoff_year}.
 Base your predictions solely on historical patterns visible in the data provided."""
 
-    response = client.messages.create(
-        model=model,
-        max_tokens=1024,
-        system=system,
-        messages=[{"role": "user", "content": prompt}],
-    )
 
-    raw_response = response.content[0].text
-    parsed = extract_predictions(raw_response)
+def forecasts_from_response(
+    raw_response: str,
+    variable: str,
+    cutoff_year: int,
+    model: str,
+) -> list[Forecast]:
+    """Parse a JSON forecast response into Forecast objects."""
+    with instrumentation.stage("forecaster.parse"):
+        parsed = extract_predictions(raw_response)
+        if not parsed.get("predictions"):
+            instrumentation.record(parse_failures=1)
 
+    # Every forecast from this response shares one stored copy of it.
+    response_id = response_store.put(raw_response)
     forecasts = []
     for pred in parsed.get("predictions", []):
         forecasts.append(
@@ -126,18 +173,146 @@ Base your predictions solely on historical patterns visible in the data provided
                 lower_bound=pred["lower"],
                 upper_bound=pred["upper"],
                 model=model,
-                raw_response=raw_response,
+                response_id=response_id,
             )
         )
-
     return forecasts
 
 
+# The SDKs take about a second to import, so they are loaded on first use.
+_SDK_MODULES = {"Anthropic": "anthropic", "OpenAI": "openai"}
+
+
+def __getattr__(name: str):
+    if name not in _SDK_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    client_class = getattr(importlib.import_module(_SDK_MODULES[name]), name)
+    globals()[name] = client_class
+    return client_class
+
+
+def _client_class(name: str):
+    # Through globals() so a patched forecaster.Anthropic is honoured.
+    return globals().get(name) or __getattr__(name)
+
+
+_CLIENTS: dict[tuple, object] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _cached_client(client_class, key_env: str, base_url: str | None):
+    # SDK clients are thread-safe and expensive to build (~50 ms each, mostly
+    # TLS and HTTP pool setup), so reuse one per (client class, endpoint).
+    cache_key = (client_class, base_url)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(cache_key)
+        if client is None:
+            kwargs = {"max_retries": 0}
+            if base_url is not None:
+                kwargs["base_url"] = base_url
+                if not os.environ.get(key_env):
+                    kwargs["api_key"] = "mock"
+            client = _CLIENTS[cache_key] = client_class(**kwargs)
+    return client
+
+
+def create_anthropic_client(base_url: str | None = None) -> "Anthropic":
+    """
+    Return a shared Anthropic client, optionally pointed at another endpoint.
+
+    ``base_url`` (or the SDK's own ``ANTHROPIC_BASE_URL``) lets forecasts run
+    against :mod:`value_forecasting.mock_llm` or a proxy. A placeholder key is
+    used for custom endpoints when none is configured.
+    """
+    return _cached_client(_client_class("Anthropic"), "ANTHROPIC_API_KEY", base_url)
+
+
+def create_openai_client(base_url: str | None = None) -> "OpenAI":
+    """Return a shared OpenAI client, optionally pointed at another endpoint."""
+    return _cached_client(_client_class("OpenAI"), "OPENAI_API_KEY", base_url)
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """Whether an API exception is worth retrying (rate limits, 5xx, network)."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def call_with_retries(create, max_retries: int = 2, backoff: float = 0.5, **kwargs):
+    """
+    Call an SDK ``create`` method, retrying transient failures.
+
+    Clients are built with SDK-level retries disabled so that every retry is
+    visible here and can be counted by the instrumentation layer. A numeric
+    ``Retry-After`` header on the error response overrides the backoff.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return create(**kwargs)
+        except Exception as e:
+            if attempt == max_retries or not is_retryable_error(e):
+                raise
+            instrumentation.record(retries=1)
+            delay = backoff * 2**attempt
+            response = getattr(e, "response", None)
+            retry_after = response.headers.get("retry-after") if response else None
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                pass
+            time.sleep(delay)
+
+
+def extract_predictions(response_text: str) -> dict:
+    """Extract JSON predictions from model response."""
+    # Try to find JSON in the response
+    json_match = re.search(r"\{[\s\S]*\}", response_text)
+    if json_match:
+        try:
+            return json.loads(json_match.group())
+        except json.JSONDecodeError:
+            pass
+    return {"predictions": [], "reasoning": "Failed to parse"}
+
+
+def run_forecast(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    model: str = "claude-sonnet-4-20250514",
+    base_url: str | None = None,
+) -> list[Forecast]:
+    """Run a forecast using Claude."""
+    client = create_anthropic_client(base_url)
+
+    with instrumentation.stage("forecaster.prompt"):
+        prompt = create_forecast_prompt(variable, cutoff_year, target_years)
+
+    # System prompt to set temporal context
+    system = create_system_prompt(cutoff_year)
+
+    with instrumentation.stage("forecaster.api_call"):
+        response = call_with_retries(
+            client.messages.create,
+            model=model,
+            max_tokens=1024,
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        instrumentation.record_usage(response)
+
+    raw_response = response.content[0].text
+    return forecasts_from_response(raw_response, variable, cutoff_year, model)
+
+
 def run_forecast_openai(
     variable: str,
     cutoff_year: int,
     target_years: list[int],
     model: str = "gpt-3.5-turbo",
+    base_url: str | None = None,
 ) -> list[Forecast]:
     """
     Run a forecast using OpenAI models.
@@ -146,68 +321,183 @@ def run_forecast_openai(
     - davinci-002 (Oct 2019): Can predict 2021, 2022
     - gpt-3.5-turbo (Sep 2021): Can predict 2022
     """
-    client = OpenAI()
+    client = create_openai_client(base_url)
 
-    prompt = create_forecast_prompt(variable, cutoff_year, target_years)
-    system = f"""You are a social scientist conducting research in {cutoff_year}.
-You have access only to information available up to {cutoff_year}.
-You do not know what happened after {cutoff_year}.
-Base your predictions solely on historical patterns visible in the data provided."""
+    with instrumentation.stage("forecaster.prompt"):
+        prompt = create_forecast_prompt(variable, cutoff_year, target_years)
+    system = create_system_prompt(cutoff_year)
 
     try:
-        if model.startswith("davinci") or model.startswith("text-davinci"):
+        if api_style(model) == "completion":
             # Completion API for older models
             full_prompt = f"{system}\n\n{prompt}"
-            response = client.completions.create(
-                model=model,
-                prompt=full_prompt,
-                max_tokens=1024,
-                temperature=0.7,
-            )
+            with instrumentation.stage("forecaster.api_call"):
+                response = call_with_retries(
+                    client.completions.create,
+                    model=model,
+                    prompt=full_prompt,
+                    max_tokens=1024,
+                    temperature=0.7,
+                )
+                instrumentation.record_usage(response)
             raw_response = response.choices[0].text
         else:
             # Chat API for newer models
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=1024,
-            )
-            raw_response = response.choices[0].message.content
-
-        parsed = extract_predictions(raw_response)
-
-        forecasts = []
-        for pred in parsed.get("predictions", []):
-            forecasts.append(
-                Forecast(
-                    variable=variable,
-                    cutoff_year=cutoff_year,
-                    target_year=pred["year"],
-                    point_estimate=pred["estimate"],
-                    lower_bound=pred["lower"],
-                    upper_bound=pred["upper"],
+            with instrumentation.stage("forecaster.api_call"):
+                response = call_with_retries(
+                    client.chat.completions.create,
                     model=model,
-                    raw_response=raw_response,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=1024,
                 )
-            )
+                instrumentation.record_usage(response)
+            raw_response = response.choices[0].message.content
 
-        return forecasts
+        return forecasts_from_response(raw_response, variable, cutoff_year, model)
 
     except Exception as e:
         print(f"OpenAI forecast failed: {e}")
         return []
 
 
+def packs(variables: list[str], pack_size: int | None = None) -> list[list[str]]:
+    """Split ``variables`` into consecutive packs of at most ``pack_size``."""
+    if pack_size is None:
+        pack_size = max(len(variables), 1)
+    if pack_size < 1:
+        raise ValueError(f"pack_size must be at least 1, got {pack_size}")
+    return [variables[i : i + pack_size] for i in range(0, len(variables), pack_size)]
+
+
+def packed_forecasts_from_response(
+    raw_response: str,
+    variables: list[str],
+    cutoff_year: int,
+    model: str,
+) -> dict[str, list[Forecast]]:
+    """
+    Parse a packed JSON response into forecasts keyed by variable.
+
+    Every variable gets a key. Predictions that lack a year, estimate or
+    bound are dropped, and a variable with none left counts as a parse
+    failure.
+    """
+    with instrumentation.stage("forecaster.parse"):
+        predictions = extract_predictions(raw_response).get("predictions")
+        if not isinstance(predictions, dict):
+            predictions = {}
+
+        response_id = response_store.put(raw_response)
+        forecasts = {}
+        for variable in variables:
+            forecasts[variable] = []
+            entries = predictions.get(variable)
+            for pred in entries if isinstance(entries, list) else []:
+                try:
+                    year = int(pred["year"])
+                    estimate = float(pred["estimate"])
+                    lower, upper = float(pred["lower"]), float(pred["upper"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                forecasts[variable].append(
+                    Forecast(
+                        variable=variable,
+                        cutoff_year=cutoff_year,
+                        target_year=year,
+                        point_estimate=estimate,
+                        lower_bound=lower,
+                        upper_bound=upper,
+                        model=model,
+                        response_id=response_id,
+                    )
+                )
+            if not forecasts[variable]:
+                instrumentation.record(parse_failures=1)
+    return forecasts
+
+
+def run_forecast_packed(
+    variables: list[str],
+    cutoff_year: int,
+    target_years: list[int],
+    pack_size: int | None = None,
+    model: str = "claude-sonnet-4-20250514",
+    base_url: str | None = None,
+) -> dict[str, list[Forecast]]:
+    """
+    Forecast several variables per Claude call.
+
+    The system prompt and instructions are sent once per pack instead of once
+    per variable.
+
+    Args:
+        variables: Variables to forecast, all from ``cutoff_year``.
+        cutoff_year: Last year of data in the prompts.
+        target_years: Years to forecast for every variable.
+        pack_size: Variables per call (default: all in one call). With 1,
+            each variable gets its own ``create_forecast_prompt``, exactly as
+            with :func:`run_forecast`, for comparison.
+        model: Anthropic model ID.
+        base_url: API base URL (e.g. the mock server).
+
+    Returns:
+        Forecasts keyed by variable, in the order of ``variables``.
+    """
+    forecasts = {}
+    for pack in packs(variables, pack_size):
+        if len(pack) == 1:
+            forecasts[pack[0]] = run_forecast(
+                pack[0], cutoff_year, target_years, model, base_url
+            )
+            continue
+        client = create_anthropic_client(base_url)
+        with instrumentation.stage("forecaster.prompt"):
+            prompt = create_packed_prompt(pack, cutoff_year, target_years)
+        with instrumentation.stage("forecaster.api_call"):
+            response = call_with_retries(
+                client.messages.create,
+                model=model,
+                # Room for every variable's predictions on top of the reasoning.
+                max_tokens=1024 + 256 * len(pack),
+                system=create_system_prompt(cutoff_year),
+                messages=[{"role": "user", "content": prompt}],
+            )
+            instrumentation.record_usage(response)
+        raw_response = response.content[0].text
+        forecasts.update(
+            packed_forecasts_from_response(raw_response, pack, cutoff_year, model)
+        )
+    return forecasts
+
+
+def _weighted_line(xs, ys, weights) -> tuple[float, float]:
+    """Weighted least-squares slope and intercept."""
+    total = sum(weights)
+    mean_x = sum(w * x for w, x in zip(weights, xs)) / total
+    mean_y = sum(w * y for w, y in zip(weights, ys)) / total
+    sxx = sum(w * (x - mean_x) ** 2 for w, x in zip(weights, xs))
+    sxy = sum(w * (x - mean_x) * (y - mean_y) for w, x, y in zip(weights, xs, ys))
+    slope = sxy / sxx
+    return slope, mean_y - slope * mean_x
+
+
+@instrumentation.timed("forecaster.linear_baseline")
 def run_baseline_forecast(
     variable: str,
     cutoff_year: int,
     target_years: list[int],
 ) -> list[Forecast]:
-    """Simple linear extrapolation baseline."""
-    from .gss_variables import HISTORICAL_TRAJECTORIES
+    """
+    Simple linear extrapolation baseline.
+
+    Waves are weighted by their precision: sampling variance plus the
+    scatter around the trend that sampling does not explain (two-step
+    feasible weighted least squares).
+    """
+    from .gss_variables import HISTORICAL_TRAJECTORIES, standard_error
 
     trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
     pre_cutoff = {y: v for y, v in trajectory.items() if y <= cutoff_year}
@@ -215,23 +505,25 @@ def run_baseline_forecast(
     if len(pre_cutoff) < 2:
         return []
 
-    # Simple linear regression
     years = sorted(pre_cutoff.keys())
     values = [pre_cutoff[y] for y in years]
-
     n = len(years)
-    sum_x = sum(years)
-    sum_y = sum(values)
-    sum_xy = sum(x * y for x, y in zip(years, values))
-    sum_x2 = sum(x**2 for x in years)
-
-    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x**2)
-    intercept = (sum_y - slope * sum_x) / n
-
-    # Calculate residual standard error for uncertainty
-    predictions_in_sample = [slope * y + intercept for y in years]
-    residuals = [actual - pred for actual, pred in zip(values, predictions_in_sample)]
-    se = (sum(r**2 for r in residuals) / (n - 2)) ** 0.5 if n > 2 else 5
+
+    slope, intercept = _weighted_line(years, values, [1.0] * n)
+    se = 5
+    if n > 2:
+        # Residual variance left after sampling error, shared by all waves;
+        # refit with weights 1 / (that + the wave's squared SE).
+        sampling_var = [standard_error(variable, y) ** 2 for y in years]
+        residuals = [v - (slope * y + intercept) for y, v in zip(years, values)]
+        excess = sum(r**2 for r in residuals) / (n - 2) - sum(sampling_var) / n
+        precision = [1 / (max(excess, 0.0) + v) for v in sampling_var]
+        weights = [n * p / sum(precision) for p in precision]
+        slope, intercept = _weighted_line(years, values, weights)
+
+        # Residual standard error for uncertainty
+        residuals = [v - (slope * y + intercept) for y, v in zip(years, values)]
+        se = (sum(w * r**2 for w, r in zip(weights, residuals)) / (n - 2)) ** 0.5
 
     forecasts = []
     for target_year in target_years:
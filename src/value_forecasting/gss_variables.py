@@ -142,9 +142,73 @@ HISTORICAL_TRAJECTORIES = {
     },
 }
 
+# Completed GSS interviews per survey year. Items asked on a split ballot reach
+# only part of the sample, so for those these overstate the item's n; put
+# counts from the microdata in ITEM_SAMPLE_SIZES (variable -> year -> n).
+SAMPLE_SIZES = {
+    1972: 1613,
+    1973: 1504,
+    1974: 1484,
+    1975: 1490,
+    1976: 1499,
+    1977: 1530,
+    1978: 1532,
+    1980: 1468,
+    1982: 1860,
+    1983: 1599,
+    1984: 1473,
+    1985: 1534,
+    1986: 1470,
+    1987: 1819,
+    1988: 1481,
+    1989: 1537,
+    1990: 1372,
+    1991: 1517,
+    1993: 1606,
+    1994: 2992,
+    1996: 2904,
+    1998: 2832,
+    2000: 2817,
+    2002: 2765,
+    2004: 2812,
+    2006: 4510,
+    2008: 2023,
+    2010: 2044,
+    2012: 1974,
+    2014: 2538,
+    2016: 2867,
+    2018: 2348,
+    2021: 4032,
+    2022: 3544,
+    2024: 3309,
+}
+ITEM_SAMPLE_SIZES: dict[str, dict[int, int]] = {}
+# Variance inflation from the GSS's clustered area-probability design.
+DESIGN_EFFECT = 1.5
+# Sample size assumed for a year missing from both tables.
+DEFAULT_SAMPLE_SIZE = 1500
 
-def get_historical_context(variable: str, cutoff_year: int) -> str:
-    """Generate historical context for prompting up to cutoff year."""
+
+def sample_size(variable: str, year: int) -> int:
+    """Respondents behind ``variable``'s value in ``year``."""
+    item = ITEM_SAMPLE_SIZES.get(variable, {})
+    return item.get(year, SAMPLE_SIZES.get(year, DEFAULT_SAMPLE_SIZE))
+
+
+def standard_error(variable: str, year: int) -> float:
+    """Sampling standard error, in percentage points, of a trajectory value."""
+    p = min(max(HISTORICAL_TRAJECTORIES[variable][year], 0.5), 99.5) / 100
+    n = sample_size(variable, year)
+    return 100 * (DESIGN_EFFECT * p * (1 - p) / n) ** 0.5
+
+
+def historical_context_parts(
+    variable: str, cutoff_year: int
+) -> tuple[str, list[tuple[int, str]]]:
+    """
+    :func:`get_historical_context` as its header and one ``(year, line)``
+    per wave, so contexts for later cutoffs extend earlier ones.
+    """
     if variable not in GSS_VARIABLES:
         raise ValueError(f"Unknown variable: {variable}")
 
@@ -154,13 +218,24 @@ def get_historical_context(variable: str, cutoff_year: int) -> str:
     # Filter to pre-cutoff years
     pre_cutoff = {y: v for y, v in trajectory.items() if y <= cutoff_year}
 
-    context = f"""Question: {var_info['question']}
+    header = f"""Question: {var_info['question']}
 
 The General Social Survey has tracked American opinions on this question since {var_info['first_year']}.
 
-Historical data (% giving the liberal/progressive response):
+Historical data (% giving the liberal/progressive response, with the number of
+respondents and the sampling standard error in percentage points):
 """
+    lines = []
     for year in sorted(pre_cutoff.keys()):
-        context += f"- {year}: {pre_cutoff[year]}%\n"
+        n = sample_size(variable, year)
+        se = standard_error(variable, year)
+        line = f"- {year}: {pre_cutoff[year]}% (n={n:,}, SE {se:.1f})\n"
+        lines.append((year, line))
+
+    return header, lines
 
-    return context
+
+def get_historical_context(variable: str, cutoff_year: int) -> str:
+    """Generate historical context for prompting up to cutoff year."""
+    header, lines = historical_context_parts(variable, cutoff_year)
+    return header + "".join(line for _, line in lines)
@@ -2,14 +2,22 @@
 
 import json
 import re
-from dataclasses import dataclass, field
-
-from anthropic import Anthropic
-
+from dataclasses import InitVar, dataclass, field
+
+from value_forecasting import instrumentation, response_store
+from value_forecasting.forecaster import (
+    call_with_retries,
+    create_anthropic_client,
+    extract_predictions,
+)
 from value_forecasting.gss_variables import GSS_VARIABLES
 
+# Largest distance from 100% accepted for a year's predicted distribution.
+SUM_TOLERANCE = 5.0
+
 
-@dataclass
+@response_store.stores_raw_response
+@dataclass(slots=True)
 class DistributionForecast:
     """A forecast of the full response distribution with uncertainty."""
 
@@ -19,7 +27,12 @@ class DistributionForecast:
     distribution: dict[str, float]  # response -> percentage
     distribution_ci: dict[str, tuple[float, float]]  # response -> (lower, upper)
     model: str
-    raw_response: str = ""
+    raw_response: InitVar[str] = ""
+    response_id: str = field(default="", repr=False)
+
+    def __post_init__(self, raw_response: str):
+        if raw_response:
+            self.response_id = response_store.put(raw_response)
 
 
 # Historical full distributions for key variables
@@ -80,8 +93,10 @@ HISTORICAL_DISTRIBUTIONS = {
 }
 
 
-def get_distribution_context(variable: str, cutoff_year: int) -> str:
-    """Generate historical distribution context for prompting."""
+def distribution_context_parts(
+    variable: str, cutoff_year: int
+) -> tuple[str, list[tuple[int, str]]]:
+    """:func:`get_distribution_context` as its header and one block per wave."""
     if variable not in GSS_VARIABLES:
         raise ValueError(f"Unknown variable: {variable}")
 
@@ -90,21 +105,30 @@ def get_distribution_context(variable: str, cutoff_year: int) -> str:
 
     pre_cutoff = {y: d for y, d in distributions.items() if y <= cutoff_year}
 
-    context = f"""Question: {var_info['question']}
+    header = f"""Question: {var_info['question']}
 
 Response options: {list(var_info['responses'].values())}
 
 Historical response distributions (% for each response):
 """
+    blocks = []
     for year in sorted(pre_cutoff.keys()):
         dist = pre_cutoff[year]
-        context += f"\n{year}:\n"
+        block = f"\n{year}:\n"
         for response, pct in dist.items():
-            context += f"  - {response}: {pct}%\n"
+            block += f"  - {response}: {pct}%\n"
+        blocks.append((year, block))
 
-    return context
+    return header, blocks
 
 
+def get_distribution_context(variable: str, cutoff_year: int) -> str:
+    """Generate historical distribution context for prompting."""
+    header, blocks = distribution_context_parts(variable, cutoff_year)
+    return header + "".join(block for _, block in blocks)
+
+
+@instrumentation.timed("heterogeneity.linear")
 def forecast_distribution(
     variable: str,
     cutoff_year: int,
@@ -187,25 +211,22 @@ def forecast_distribution(
     )
 
 
-def forecast_distribution_llm(
-    variable: str,
-    cutoff_year: int,
-    target_year: int,
-    model: str = "claude-sonnet-4-20250514",
-) -> DistributionForecast:
-    """
-    Forecast full response distribution using LLM.
-
-    Asks the LLM to predict the entire distribution, not just one category.
-    """
-    client = Anthropic()
-
+def create_distribution_prompt(
+    variable: str, cutoff_year: int, target_year: int
+) -> str:
+    """Create a prompt for forecasting a full response distribution."""
     context = get_distribution_context(variable, cutoff_year)
-    var_info = GSS_VARIABLES[variable]
-    responses = list(var_info["responses"].values())
+    instructions = create_distribution_instructions(variable, cutoff_year, target_year)
+    return f"{context}\n\n{instructions}"
 
-    prompt = f"""{context}
 
+def create_distribution_instructions(
+    variable: str, cutoff_year: int, target_year: int
+) -> str:
+    """The task part of the distribution prompt, after the historical context."""
+    responses = list(GSS_VARIABLES[variable]["responses"].values())
+
+    return f"""\
 You are a social scientist in {cutoff_year} analyzing trends in American public opinion.
 Based ONLY on the historical distributions above and your knowledge of social change patterns
 up to {cutoff_year}, predict the FULL response distribution in {target_year}.
@@ -228,48 +249,74 @@ Respond in JSON format:
 }}
 """
 
-    system = f"""You are a social scientist conducting research in {cutoff_year}.
+
+def create_distribution_system_prompt(cutoff_year: int) -> str:
+    """System prompt for distribution forecasts made as of ``cutoff_year``."""
+    return f"""You are a social scientist conducting research in {cutoff_year}.
 You have access only to information available up to {cutoff_year}.
 Base predictions solely on historical patterns visible in the data provided."""
 
-    response = client.messages.create(
-        model=model,
-        max_tokens=1024,
-        system=system,
-        messages=[{"role": "user", "content": prompt}],
-    )
 
-    raw_response = response.content[0].text
+def forecast_distribution_llm(
+    variable: str,
+    cutoff_year: int,
+    target_year: int,
+    model: str = "claude-sonnet-4-20250514",
+    base_url: str | None = None,
+) -> DistributionForecast:
+    """
+    Forecast full response distribution using LLM.
 
-    # Extract JSON
-    json_match = re.search(r"\{[\s\S]*\}", raw_response)
-    if json_match:
-        try:
-            parsed = json.loads(json_match.group())
-            predictions = parsed.get("predictions", {})
+    Asks the LLM to predict the entire distribution, not just one category.
+    """
+    client = create_anthropic_client(base_url)
 
-            distribution = {}
-            distribution_ci = {}
+    prompt = create_distribution_prompt(variable, cutoff_year, target_year)
+    system = create_distribution_system_prompt(cutoff_year)
 
-            for resp_name, pred in predictions.items():
-                if isinstance(pred, dict):
-                    distribution[resp_name] = pred.get("estimate", 0)
-                    distribution_ci[resp_name] = (
-                        pred.get("lower", 0),
-                        pred.get("upper", 100),
-                    )
+    with instrumentation.stage("heterogeneity.api_call"):
+        response = call_with_retries(
+            client.messages.create,
+            model=model,
+            max_tokens=1024,
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        instrumentation.record_usage(response)
 
-            return DistributionForecast(
-                variable=variable,
-                cutoff_year=cutoff_year,
-                target_year=target_year,
-                distribution=distribution,
-                distribution_ci=distribution_ci,
-                model=model,
-                raw_response=raw_response,
-            )
-        except json.JSONDecodeError:
-            pass
+    raw_response = response.content[0].text
+
+    with instrumentation.stage("heterogeneity.parse"):
+        # Extract JSON
+        json_match = re.search(r"\{[\s\S]*\}", raw_response)
+        if json_match:
+            try:
+                parsed = json.loads(json_match.group())
+                predictions = parsed.get("predictions", {})
+
+                distribution = {}
+                distribution_ci = {}
+
+                for resp_name, pred in predictions.items():
+                    if isinstance(pred, dict):
+                        distribution[resp_name] = pred.get("estimate", 0)
+                        distribution_ci[resp_name] = (
+                            pred.get("lower", 0),
+                            pred.get("upper", 100),
+                        )
+
+                return DistributionForecast(
+                    variable=variable,
+                    cutoff_year=cutoff_year,
+                    target_year=target_year,
+                    distribution=distribution,
+                    distribution_ci=distribution_ci,
+                    model=model,
+                    raw_response=raw_response,
+                )
+            except json.JSONDecodeError:
+                pass
+        instrumentation.record(parse_failures=1)
 
     # Fallback
     return DistributionForecast(
@@ -281,3 +328,166 @@ Base predictions solely on historical patterns visible in the data provided."""
         model=model,
         raw_response=raw_response,
     )
+
+
+def create_distributions_prompt(
+    variable: str, cutoff_year: int, target_years: list[int]
+) -> str:
+    """Create a prompt for full response distributions in several years."""
+    context = get_distribution_context(variable, cutoff_year)
+    instructions = create_distributions_instructions(
+        variable, cutoff_year, target_years
+    )
+    return f"{context}\n\n{instructions}"
+
+
+def create_distributions_instructions(
+    variable: str, cutoff_year: int, target_years: list[int]
+) -> str:
+    """The task part of the multi-year prompt, after the historical context."""
+    responses = list(GSS_VARIABLES[variable]["responses"].values())
+
+    return f"""\
+You are a social scientist in {cutoff_year} analyzing trends in American public opinion.
+Based ONLY on the historical distributions above and your knowledge of social
+change patterns up to {cutoff_year}, predict the FULL response distribution in
+each target year.
+
+For EACH target year and EACH response option, predict:
+1. The percentage who will give that response
+2. A 90% confidence interval
+
+Each year's percentages must sum to approximately 100%.
+
+Target years to predict: {target_years}
+Response options to predict: {responses}
+
+Respond in JSON format:
+{{
+    "predictions": [
+        {{
+            "year": YYYY,
+            "distribution": {{
+                "response_name": {{"estimate": XX, "lower": XX, "upper": XX}},
+                ...
+            }}
+        }},
+        ...
+    ],
+    "reasoning": "Brief explanation"
+}}
+"""
+
+
+def validate_distribution(
+    prediction, responses: list[str]
+) -> tuple[dict[str, float], dict[str, tuple[float, float]]] | None:
+    """
+    Distribution and 90% CIs from one year's prediction, or None if invalid.
+
+    A valid prediction gives every response option an estimate between 0 and
+    100 inside its interval (missing bounds default to 0 and 100), and the
+    estimates sum to within :data:`SUM_TOLERANCE` of 100.
+    """
+    if not isinstance(prediction, dict):
+        return None
+    distribution = {}
+    distribution_ci = {}
+    for response in responses:
+        pred = prediction.get(response)
+        if not isinstance(pred, dict):
+            return None
+        try:
+            estimate = float(pred["estimate"])
+            lower = float(pred.get("lower", 0))
+            upper = float(pred.get("upper", 100))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not 0 <= lower <= estimate <= upper <= 100:
+            return None
+        distribution[response] = estimate
+        distribution_ci[response] = (lower, upper)
+    if abs(sum(distribution.values()) - 100) > SUM_TOLERANCE:
+        return None
+    return distribution, distribution_ci
+
+
+def distributions_from_response(
+    raw_response: str,
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    model: str,
+) -> list[DistributionForecast]:
+    """
+    Parse a multi-year distribution response, validating each year.
+
+    Returns one forecast per target year. Years that are missing or fail
+    :func:`validate_distribution` get an empty distribution and count as a
+    parse failure.
+    """
+    responses = list(GSS_VARIABLES[variable]["responses"].values())
+    with instrumentation.stage("heterogeneity.parse"):
+        predictions = extract_predictions(raw_response).get("predictions")
+        by_year = {}
+        for pred in predictions if isinstance(predictions, list) else []:
+            try:
+                year = int(pred["year"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            by_year.setdefault(year, pred.get("distribution"))
+
+        response_id = response_store.put(raw_response)
+        forecasts = []
+        for target_year in target_years:
+            valid = validate_distribution(by_year.get(target_year), responses)
+            if valid is None:
+                instrumentation.record(parse_failures=1)
+                valid = {}, {}
+            forecasts.append(
+                DistributionForecast(
+                    variable=variable,
+                    cutoff_year=cutoff_year,
+                    target_year=target_year,
+                    distribution=valid[0],
+                    distribution_ci=valid[1],
+                    model=model,
+                    response_id=response_id,
+                )
+            )
+    return forecasts
+
+
+def forecast_distributions_llm(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    model: str = "claude-sonnet-4-20250514",
+    base_url: str | None = None,
+) -> list[DistributionForecast]:
+    """
+    Forecast full response distributions for several years in one LLM call.
+
+    Like :func:`forecast_distribution_llm`, but the historical context is sent
+    once for all ``target_years`` instead of once per year.
+    """
+    client = create_anthropic_client(base_url)
+
+    prompt = create_distributions_prompt(variable, cutoff_year, target_years)
+    system = create_distribution_system_prompt(cutoff_year)
+
+    with instrumentation.stage("heterogeneity.api_call"):
+        response = call_with_retries(
+            client.messages.create,
+            model=model,
+            # Room for every year's distribution on top of the reasoning.
+            max_tokens=1024 + 256 * len(target_years),
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        instrumentation.record_usage(response)
+
+    raw_response = response.content[0].text
+    return distributions_from_response(
+        raw_response, variable, cutoff_year, target_years, model
+    )
@@ -0,0 +1,335 @@
+"""Incremental re-evaluation when new survey waves arrive.
+
+A forecast for (model, variable, cutoff, target_year) depends only on the
+variable's definition and its waves up to the cutoff. Each cached forecast is
+stored with a fingerprint of exactly those inputs, so when a wave is added or
+revised:
+
+- forecasts whose inputs are unchanged are reused (no API call, no refit);
+- forecasts whose pre-cutoff data changed are marked stale and recomputed;
+- new target years (e.g. a freshly released wave) are forecast on their own,
+  batched into one call per (variable, cutoff).
+
+Forecasters that see more than one variable's data, such as the pooled
+baseline, declare it with a ``fingerprint`` attribute: a ``(variable,
+cutoff_year) -> str`` hash of their other inputs, which is added to the key.
+
+Evaluations are rebuilt from the cached forecasts and the current actuals,
+which is cheap; :class:`UpdatePlan` lists the ones whose forecast or actual
+changed.
+
+    cache = ForecastCache("results/cache")
+    results, plan = run_incremental("claude", run_forecast, cache=cache)
+    print(plan.summary())
+"""
+
+import hashlib
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from value_forecasting import instrumentation, response_store
+from value_forecasting.evaluation import ForecastResult
+from value_forecasting.forecaster import Forecast
+from value_forecasting.gss_variables import (
+    GSS_VARIABLES,
+    HISTORICAL_TRAJECTORIES,
+    sample_size,
+)
+from value_forecasting.models import get_model
+from value_forecasting.planning import ContaminationPlan, plan_contamination
+from value_forecasting.response_store import ResponseStore
+
+# (variable, cutoff_year, target_years) -> forecasts, e.g. run_forecast
+Forecaster = Callable[[str, int, list[int]], list[Forecast]]
+
+ForecastJob = tuple[str, int, list[int]]
+
+# Seconds between cache writes during a run. Each write rewrites the whole
+# cache file, so saving after every job would cost O(jobs x cache size).
+SAVE_INTERVAL = 5.0
+
+
+def data_fingerprint(variable: str, cutoff_year: int) -> str:
+    """Hash of everything a forecast at ``cutoff_year`` can see."""
+    trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
+    inputs = {
+        "definition": GSS_VARIABLES.get(variable, {}),
+        "data": sorted(
+            (y, v, sample_size(variable, y))
+            for y, v in trajectory.items()
+            if y <= cutoff_year
+        ),
+    }
+    blob = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
+
+def _fingerprint(forecaster: Forecaster | None, variable: str, cutoff_year: int) -> str:
+    fingerprint = data_fingerprint(variable, cutoff_year)
+    extra = getattr(forecaster, "fingerprint", None)
+    if extra is not None:
+        fingerprint += "-" + extra(variable, cutoff_year)
+    return fingerprint
+
+
+def _key(model: str, variable: str, cutoff_year: int, target_year: int) -> str:
+    return f"{model}|{variable}|{cutoff_year}|{target_year}"
+
+
+class ForecastCache:
+    """
+    On-disk cache of forecasts keyed by (model, variable, cutoff, target_year).
+
+    Forecasts live in ``<directory>/forecasts.json``; their raw responses are
+    kept in a :class:`ResponseStore` under ``<directory>/responses``. Without
+    a directory the cache only lives in memory.
+    """
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory) if directory else None
+        self.entries: dict[str, dict] = {}
+        self.responses = ResponseStore(
+            self.directory / "responses" if self.directory else None
+        )
+        if self.directory and (self.directory / "forecasts.json").exists():
+            with open(self.directory / "forecasts.json") as f:
+                self.entries = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(
+        self, model: str, variable: str, cutoff_year: int, target_year: int
+    ) -> dict | None:
+        """Raw cache entry (with its ``fingerprint``), or None."""
+        return self.entries.get(_key(model, variable, cutoff_year, target_year))
+
+    def get(
+        self,
+        model: str,
+        variable: str,
+        cutoff_year: int,
+        target_year: int,
+        fingerprint: str,
+    ) -> Forecast | None:
+        """Cached forecast if present and computed from the same inputs."""
+        entry = self.lookup(model, variable, cutoff_year, target_year)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        response_id = entry["response_id"]
+        if response_id:
+            response_store.get_store().adopt(
+                response_id, self.responses.blob(response_id)
+            )
+        return Forecast(
+            variable=variable,
+            cutoff_year=cutoff_year,
+            target_year=target_year,
+            point_estimate=entry["point_estimate"],
+            lower_bound=entry["lower_bound"],
+            upper_bound=entry["upper_bound"],
+            model=entry["model"],
+            response_id=response_id,
+        )
+
+    def put(self, model: str, forecast: Forecast, fingerprint: str) -> None:
+        """Cache ``forecast`` under ``model`` with its input fingerprint."""
+        if forecast.response_id:
+            self.responses.adopt(
+                forecast.response_id,
+                response_store.get_store().blob(forecast.response_id),
+            )
+        key = _key(model, forecast.variable, forecast.cutoff_year, forecast.target_year)
+        self.entries[key] = {
+            "fingerprint": fingerprint,
+            "point_estimate": forecast.point_estimate,
+            "lower_bound": forecast.lower_bound,
+            "upper_bound": forecast.upper_bound,
+            "model": forecast.model,
+            "response_id": forecast.response_id,
+            "actual": HISTORICAL_TRAJECTORIES.get(forecast.variable, {}).get(
+                forecast.target_year
+            ),
+        }
+
+    def clear(self, model: str | None = None) -> None:
+        """Drop cached forecasts for ``model`` (or every model)."""
+        if model is None:
+            self.entries.clear()
+        else:
+            prefix = f"{model}|"
+            self.entries = {
+                k: v for k, v in self.entries.items() if not k.startswith(prefix)
+            }
+
+    def save(self) -> None:
+        """Write the cache to disk (no-op for in-memory caches)."""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / "forecasts.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        tmp.replace(self.directory / "forecasts.json")
+
+
+@dataclass
+class UpdatePlan:
+    """What an incremental run has to recompute."""
+
+    jobs: list[ForecastJob] = field(default_factory=list)
+    reused: int = 0
+    stale: int = 0  # cached, but the pre-cutoff data changed
+    new: int = 0  # never forecast before (e.g. a new target wave)
+    changed_actuals: list[tuple[str, int, int]] = field(default_factory=list)
+    # Set when the jobs were checked against the model's training cutoff.
+    contamination: ContaminationPlan | None = None
+
+    @property
+    def n_calls(self) -> int:
+        return len(self.jobs)
+
+    def summary(self) -> str:
+        return (
+            f"{self.reused} forecasts reused, {self.stale} stale, {self.new} new; "
+            f"{self.n_calls} forecast calls, "
+            f"{len(self.changed_actuals)} evaluations with changed actuals"
+        )
+
+
+def _grid(variables, cutoff_years):
+    for variable in variables:
+        trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
+        for cutoff in cutoff_years:
+            targets = sorted(y for y in trajectory if y > cutoff)
+            if targets:
+                yield variable, cutoff, targets
+
+
+def plan_update(
+    model: str,
+    variables: list[str],
+    cutoff_years: list[int],
+    cache: ForecastCache,
+    forecaster: Forecaster | None = None,
+) -> UpdatePlan:
+    """
+    Work out which forecasts must be (re)computed for the current data.
+
+    Pass the ``forecaster`` if it declares a ``fingerprint`` of its inputs.
+    """
+    plan = UpdatePlan()
+    for variable, cutoff, targets in _grid(variables, cutoff_years):
+        fingerprint = _fingerprint(forecaster, variable, cutoff)
+        trajectory = HISTORICAL_TRAJECTORIES[variable]
+        missing = []
+        for target in targets:
+            entry = cache.lookup(model, variable, cutoff, target)
+            if entry is None:
+                plan.new += 1
+                missing.append(target)
+            elif entry["fingerprint"] != fingerprint:
+                plan.stale += 1
+                missing.append(target)
+            else:
+                plan.reused += 1
+                if entry.get("actual") != trajectory[target]:
+                    plan.changed_actuals.append((variable, cutoff, target))
+        if missing:
+            plan.jobs.append((variable, cutoff, missing))
+    return plan
+
+
+@instrumentation.timed("incremental.run")
+def run_incremental(
+    model: str,
+    forecaster: Forecaster,
+    variables: list[str] | None = None,
+    cutoff_years: list[int] | None = None,
+    cache: ForecastCache | None = None,
+    executor: Executor | None = None,
+    contamination: str | None = None,
+    save_interval: float = SAVE_INTERVAL,
+) -> tuple[list[ForecastResult], UpdatePlan]:
+    """
+    Bring ``model``'s forecasts and evaluations up to date with the data.
+
+    Args:
+        model: Cache label for this forecaster (e.g. ``"linear"``, ``"claude"``).
+        forecaster: Called once per job in the plan. Its ``fingerprint``
+            attribute, if any, is part of each forecast's cache key.
+        variables: Variables to cover (default: HOMOSEX, GRASS, as in
+            ``run_experiment``).
+        cutoff_years: Cutoffs to cover (default: 1990, 2000).
+        cache: Forecast cache; saved at most every ``save_interval``
+            seconds while jobs complete, and when the run ends or fails, so
+            an interrupted run resumes close to where it stopped.
+        executor: Optional thread or process pool to run jobs concurrently
+            (process pools need a picklable ``forecaster``).
+        contamination: ``"skip"`` or ``"flag"`` to check the planned jobs
+            against the training cutoff of the registered model ``model``
+            before any call (see :func:`plan_contamination`). Skipped years
+            are left out of the results, cached or not; flagged ones are
+            forecast and returned.
+        save_interval: Minimum seconds between cache writes during the run.
+
+    Returns:
+        Results for every (variable, cutoff, target) with a forecast, and the
+        plan that was executed.
+    """
+    variables = variables or ["HOMOSEX", "GRASS"]
+    cutoff_years = cutoff_years or [1990, 2000]
+    cache = cache if cache is not None else ForecastCache()
+
+    plan = plan_update(model, variables, cutoff_years, cache, forecaster)
+    if contamination is not None:
+        plan.contamination = plan_contamination(model, plan.jobs, contamination)
+        plan.jobs = plan.contamination.jobs
+    if executor is None:
+        outputs = (forecaster(*job) for job in plan.jobs)
+    else:
+        outputs = executor.map(forecaster, *zip(*plan.jobs)) if plan.jobs else []
+    last_save = time.monotonic()
+    try:
+        for (variable, cutoff, targets), forecasts in zip(plan.jobs, outputs):
+            fingerprint = _fingerprint(forecaster, variable, cutoff)
+            for forecast in forecasts:
+                if forecast.target_year in targets:
+                    cache.put(model, forecast, fingerprint)
+            if time.monotonic() - last_save >= save_interval:
+                cache.save()
+                last_save = time.monotonic()
+    finally:
+        if plan.jobs:
+            cache.save()
+
+    results = []
+    skip = get_model(model) if contamination == "skip" else None
+    for variable, cutoff, targets in _grid(variables, cutoff_years):
+        fingerprint = _fingerprint(forecaster, variable, cutoff)
+        trajectory = HISTORICAL_TRAJECTORIES[variable]
+        if skip is not None:
+            targets = [year for year in targets if skip.is_safe_for(year)]
+        for target in targets:
+            forecast = cache.get(model, variable, cutoff, target, fingerprint)
+            if forecast is None:
+                continue  # e.g. the forecaster could not produce this year
+            cache.lookup(model, variable, cutoff, target)["actual"] = trajectory[target]
+            results.append(
+                ForecastResult(
+                    variable=variable,
+                    cutoff_year=cutoff,
+                    target_year=target,
+                    predicted=forecast.point_estimate,
+                    actual=trajectory[target],
+                    lower=forecast.lower_bound,
+                    upper=forecast.upper_bound,
+                    model=forecast.model,
+                )
+            )
+    cache.save()
+    return results, plan
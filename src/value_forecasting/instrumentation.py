@@ -0,0 +1,250 @@
+"""Per-stage timing and token instrumentation for the forecasting pipeline.
+
+Instrumentation is off by default. When disabled, ``stage`` hands back a shared
+no-op context manager and the ``record_*`` helpers return after a single global
+check, so instrumented code pays essentially nothing.
+
+Enable it programmatically::
+
+    from value_forecasting import instrumentation
+
+    instrumentation.enable("results/metrics.jsonl")
+    ...  # run forecasts, baselines, evaluation
+    instrumentation.disable()  # flushes to disk
+
+or by setting ``VALUE_FORECASTING_METRICS=results/metrics.prom`` before import.
+Paths ending in ``.prom`` are written in the Prometheus text exposition format;
+anything else is written as JSONL (one line per completed stage).
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+COUNTERS = (
+    "input_tokens",
+    "output_tokens",
+    "cached_tokens",
+    "retries",
+    "parse_failures",
+    "errors",
+)
+
+
+@dataclass
+class StageStats:
+    """Aggregated measurements for one named stage."""
+
+    calls: int = 0
+    wall_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    retries: int = 0
+    parse_failures: int = 0
+    errors: int = 0
+
+
+class Recorder:
+    """Collects stage events in memory and exports them on flush."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else None
+        self.stats: dict[str, StageStats] = {}
+        self.events: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add_event(self, event: dict) -> None:
+        """Fold a completed stage event into the aggregates."""
+        with self._lock:
+            self.events.append(event)
+            stats = self.stats.setdefault(event["stage"], StageStats())
+            stats.calls += 1
+            stats.wall_time += event["wall_time"]
+            for name in COUNTERS:
+                setattr(stats, name, getattr(stats, name) + event.get(name, 0))
+
+    def summary(self) -> dict[str, dict]:
+        """Return aggregated stats keyed by stage name."""
+        with self._lock:
+            return {name: asdict(s) for name, s in sorted(self.stats.items())}
+
+    def to_prometheus(self) -> str:
+        """Render aggregates in the Prometheus text exposition format."""
+        lines = [
+            "# TYPE value_forecasting_stage_calls_total counter",
+            "# TYPE value_forecasting_stage_seconds_total counter",
+        ]
+        for name in COUNTERS:
+            lines.append(f"# TYPE value_forecasting_stage_{name}_total counter")
+        for stage_name, stats in self.summary().items():
+            label = f'{{stage="{stage_name}"}}'
+            lines.append(f"value_forecasting_stage_calls_total{label} {stats['calls']}")
+            lines.append(
+                f"value_forecasting_stage_seconds_total{label} {stats['wall_time']:.6f}"
+            )
+            for name in COUNTERS:
+                lines.append(
+                    f"value_forecasting_stage_{name}_total{label} {stats[name]}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def flush(self, path: str | Path | None = None) -> Path | None:
+        """
+        Write collected measurements to disk.
+
+        JSONL output appends the events gathered since the last flush;
+        Prometheus output (``.prom``) rewrites the file with current totals.
+        """
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            return None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.suffix == ".prom":
+            target.write_text(self.to_prometheus())
+        else:
+            with self._lock:
+                events, self.events = self.events, []
+            with open(target, "a") as f:
+                for event in events:
+                    f.write(json.dumps(event) + "\n")
+        return target
+
+
+_recorder: Recorder | None = None
+_current: contextvars.ContextVar["_Stage | None"] = contextvars.ContextVar(
+    "value_forecasting_stage", default=None
+)
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    """Context manager that times a block and accumulates counters."""
+
+    __slots__ = ("name", "recorder", "counts", "start", "token")
+
+    def __init__(self, recorder: Recorder, name: str):
+        self.recorder = recorder
+        self.name = name
+        self.counts: dict[str, int] = {}
+
+    def __enter__(self) -> "_Stage":
+        self.token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall_time = time.perf_counter() - self.start
+        _current.reset(self.token)
+        if exc_type is not None:
+            self.counts["errors"] = self.counts.get("errors", 0) + 1
+        self.recorder.add_event(
+            {
+                "stage": self.name,
+                "timestamp": time.time(),
+                "wall_time": wall_time,
+                **self.counts,
+            }
+        )
+        return False
+
+
+def enable(path: str | Path | None = None) -> Recorder:
+    """Start recording; returns the active recorder."""
+    global _recorder
+    _recorder = Recorder(path)
+    return _recorder
+
+
+def disable() -> Recorder | None:
+    """Stop recording, flush to disk if a path was given, and return the recorder."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.flush()
+    return recorder
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is currently recording."""
+    return _recorder is not None
+
+
+def get_recorder() -> Recorder | None:
+    """Return the active recorder, if any."""
+    return _recorder
+
+
+def stage(name: str):
+    """Time a block of code under ``name`` (no-op when disabled)."""
+    if _recorder is None:
+        return _NULL_STAGE
+    return _Stage(_recorder, name)
+
+
+def timed(name: str):
+    """Decorator form of :func:`stage`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _Stage(_recorder, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record(**counts: int) -> None:
+    """Add counters (e.g. ``retries=1``) to the innermost active stage."""
+    if _recorder is None:
+        return
+    current = _current.get()
+    if current is None:
+        return
+    for name, value in counts.items():
+        current.counts[name] = current.counts.get(name, 0) + value
+
+
+def record_usage(response) -> None:
+    """
+    Record token usage from an Anthropic or OpenAI response object.
+
+    Handles both the Messages (``input_tokens``/``output_tokens``) and the
+    Chat/Completions (``prompt_tokens``/``completion_tokens``) usage shapes.
+    """
+    if _recorder is None:
+        return
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "prompt_tokens", 0)
+    output_tokens = getattr(usage, "output_tokens", None)
+    if output_tokens is None:
+        output_tokens = getattr(usage, "completion_tokens", 0)
+    cached_tokens = getattr(usage, "cache_read_input_tokens", None)
+    if cached_tokens is None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) if details else 0
+    record(
+        input_tokens=input_tokens or 0,
+        output_tokens=output_tokens or 0,
+        cached_tokens=cached_tokens or 0,
+    )
+
+
+if os.environ.get("VALUE_FORECASTING_METRICS"):
+    enable(os.environ["VALUE_FORECASTING_METRICS"])
+    atexit.register(disable)
@@ -0,0 +1,276 @@
+"""Local open-weights model backend for offline, batched forecasting.
+
+Runs the same completion-style prompt used for ``davinci-002`` (system prompt
+followed by :func:`create_forecast_prompt`) through a Hugging Face causal LM on
+CPU or GPU and returns :class:`Forecast` objects, so contamination-controlled
+historical models (see ``MODEL_CUTOFFS``) can be swept without API costs.
+
+Jobs are sorted so prompts that share a prefix (same cutoff, same variable) are
+batched together. The shared prefix is prefilled once, its KV cache is kept in
+a small LRU, and every prompt in the batch decodes only its own suffix.
+
+Requires the optional ``local`` extra (``torch`` and ``transformers``).
+"""
+
+import copy
+from collections import OrderedDict
+from typing import Protocol
+
+from value_forecasting import instrumentation
+from value_forecasting.forecaster import (
+    Forecast,
+    create_forecast_prompt,
+    create_system_prompt,
+    forecasts_from_response,
+)
+
+ForecastJob = tuple[str, int, list[int]]  # (variable, cutoff_year, target_years)
+
+
+class LocalEngine(Protocol):
+    """Anything that can complete a batch of prompts."""
+
+    model_name: str
+
+    def generate(self, prompts: list[str], max_new_tokens: int) -> list[str]:
+        """Return one completion per prompt."""
+        ...
+
+
+def create_local_prompt(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+) -> str:
+    """Completion-style prompt (system text, then the forecast prompt)."""
+    return (
+        f"{create_system_prompt(cutoff_year)}\n\n"
+        f"{create_forecast_prompt(variable, cutoff_year, target_years)}"
+    )
+
+
+def common_prefix_length(sequences: list[list[int]]) -> int:
+    """Length of the longest prefix shared by every sequence."""
+    if not sequences:
+        return 0
+    shortest = min(len(s) for s in sequences)
+    for i in range(shortest):
+        token = sequences[0][i]
+        if any(s[i] != token for s in sequences[1:]):
+            return i
+    return shortest
+
+
+class TransformersEngine:
+    """
+    Greedy batched generation with a Hugging Face causal LM.
+
+    Each batch is laid out as ``[shared prefix][left padding][own suffix]``
+    with the padding masked out, so the prefix KV cache can be computed once
+    and broadcast across the batch.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cpu",
+        torch_dtype: str | None = None,
+        prefix_cache_size: int = 8,
+    ):
+        try:
+            import torch
+            from transformers import AutoModelForCausalLM, AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The local backend needs torch and transformers: "
+                "pip install 'value-forecasting[local]'"
+            ) from e
+
+        self.torch = torch
+        self.model_name = model_name
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if self.tokenizer.pad_token_id is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        dtype = getattr(torch, torch_dtype) if torch_dtype else None
+        self.model = AutoModelForCausalLM.from_pretrained(model_name, dtype=dtype)
+        self.model.to(device).eval()
+        self.prefix_cache_size = prefix_cache_size
+        self._prefix_caches: OrderedDict[tuple[int, ...], object] = OrderedDict()
+
+    def _prefix_cache(self, prefix: tuple[int, ...]):
+        """KV cache for ``prefix``, computed once and kept in an LRU."""
+        cache = self._prefix_caches.get(prefix)
+        if cache is not None:
+            self._prefix_caches.move_to_end(prefix)
+            instrumentation.record(cached_tokens=len(prefix))
+            return cache
+        ids = self.torch.tensor([prefix], device=self.device)
+        with self.torch.no_grad():
+            cache = self.model(input_ids=ids, use_cache=True).past_key_values
+        self._prefix_caches[prefix] = cache
+        if len(self._prefix_caches) > self.prefix_cache_size:
+            self._prefix_caches.popitem(last=False)
+        return cache
+
+    def encode_batch(self, prompts: list[str]):
+        """
+        Tokenize a batch around its shared prefix.
+
+        Returns ``(input_ids, attention_mask, prefix_length)``; every row is
+        the shared prefix, then left padding, then the row's own suffix.
+        """
+        torch = self.torch
+        ids = [self.tokenizer(p).input_ids for p in prompts]
+        # Keep at least one suffix token per row so generation has an input.
+        prefix_len = min(common_prefix_length(ids), min(len(s) for s in ids) - 1)
+        suffixes = [s[prefix_len:] for s in ids]
+        width = max(len(s) for s in suffixes)
+        pad = self.tokenizer.pad_token_id
+        input_ids, mask = [], []
+        for seq, suffix in zip(ids, suffixes):
+            padding = width - len(suffix)
+            input_ids.append(seq[:prefix_len] + [pad] * padding + suffix)
+            mask.append([1] * prefix_len + [0] * padding + [1] * len(suffix))
+        return (
+            torch.tensor(input_ids, device=self.device),
+            torch.tensor(mask, device=self.device),
+            prefix_len,
+        )
+
+    def generate(self, prompts: list[str], max_new_tokens: int = 512) -> list[str]:
+        """Greedy-decode a batch of prompts that (ideally) share a prefix."""
+        input_ids, attention_mask, prefix_len = self.encode_batch(prompts)
+        kwargs = {}
+        if prefix_len > 0:
+            cache = copy.deepcopy(
+                self._prefix_cache(tuple(input_ids[0, :prefix_len].tolist()))
+            )
+            cache.batch_repeat_interleave(len(prompts))
+            kwargs["past_key_values"] = cache
+        with self.torch.no_grad():
+            output = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=self.tokenizer.pad_token_id,
+                **kwargs,
+            )
+        instrumentation.record(
+            input_tokens=int(attention_mask.sum()),
+            output_tokens=int(output.shape[1] - input_ids.shape[1]) * len(prompts),
+        )
+        new_tokens = output[:, input_ids.shape[1] :]
+        return self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+
+    def score_continuations(self, prompt: str, continuations: list[str]) -> list[float]:
+        """
+        Total log-probability of each continuation given ``prompt``.
+
+        The prompt (minus its last token) comes from the prefix cache; the last
+        prompt token plus every right-padded continuation are scored in one
+        batched forward pass.
+        """
+        torch = self.torch
+        prompt_ids = self.tokenizer(prompt).input_ids
+        cont_ids = [
+            self.tokenizer(c, add_special_tokens=False).input_ids
+            for c in continuations
+        ]
+        prefix_len = len(prompt_ids) - 1
+        width = 1 + max(len(c) for c in cont_ids)
+        pad = self.tokenizer.pad_token_id
+        rows, masks = [], []
+        for ids in cont_ids:
+            padding = width - 1 - len(ids)
+            rows.append([prompt_ids[-1]] + ids + [pad] * padding)
+            masks.append([1] * (1 + len(ids)) + [0] * padding)
+        input_ids = torch.tensor(rows, device=self.device)
+        suffix_mask = torch.tensor(masks, device=self.device)
+        attention_mask = torch.cat(
+            [
+                torch.ones(
+                    len(rows), prefix_len, dtype=torch.long, device=self.device
+                ),
+                suffix_mask,
+            ],
+            dim=1,
+        )
+        position_ids = prefix_len + torch.arange(width, device=self.device)
+        kwargs = {}
+        if prefix_len > 0:
+            cache = copy.deepcopy(self._prefix_cache(tuple(prompt_ids[:-1])))
+            cache.batch_repeat_interleave(len(rows))
+            kwargs["past_key_values"] = cache
+        with torch.no_grad():
+            logits = self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids.expand(len(rows), -1),
+                **kwargs,
+            ).logits
+        logprobs = torch.log_softmax(logits[:, :-1].float(), dim=-1)
+        targets = input_ids[:, 1:]
+        token_logprobs = logprobs.gather(-1, targets.unsqueeze(-1)).squeeze(-1)
+        instrumentation.record(input_tokens=len(prompt_ids) + int(suffix_mask.sum()))
+        return (token_logprobs * suffix_mask[:, 1:]).sum(dim=1).tolist()
+
+
+_ENGINES: dict[tuple[str, str], TransformersEngine] = {}
+
+
+def get_local_engine(model_name: str, device: str = "cpu") -> TransformersEngine:
+    """Load a model once per process and reuse it."""
+    key = (model_name, device)
+    if key not in _ENGINES:
+        _ENGINES[key] = TransformersEngine(model_name, device=device)
+    return _ENGINES[key]
+
+
+def run_forecasts_local(
+    jobs: list[ForecastJob],
+    engine: LocalEngine | str = "gpt2-xl",
+    batch_size: int = 8,
+    max_new_tokens: int = 512,
+) -> list[list[Forecast]]:
+    """
+    Forecast many (variable, cutoff, target_years) jobs with a local model.
+
+    Jobs are grouped by cutoff and variable so each batch shares as long a
+    prompt prefix as possible. Results are returned in the order of ``jobs``.
+    """
+    if isinstance(engine, str):
+        engine = get_local_engine(engine)
+
+    order = sorted(range(len(jobs)), key=lambda i: (jobs[i][1], jobs[i][0]))
+    results: list[list[Forecast]] = [[] for _ in jobs]
+
+    for start in range(0, len(order), batch_size):
+        batch = order[start : start + batch_size]
+        with instrumentation.stage("local_backend.prompt"):
+            prompts = [create_local_prompt(*jobs[i]) for i in batch]
+        with instrumentation.stage("local_backend.generate"):
+            completions = engine.generate(prompts, max_new_tokens=max_new_tokens)
+        for i, completion in zip(batch, completions):
+            variable, cutoff_year, _ = jobs[i]
+            results[i] = forecasts_from_response(
+                completion, variable, cutoff_year, engine.model_name
+            )
+
+    return results
+
+
+def run_forecast_local(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    engine: LocalEngine | str = "gpt2-xl",
+    max_new_tokens: int = 512,
+) -> list[Forecast]:
+    """Run a single forecast with a local model."""
+    return run_forecasts_local(
+        [(variable, cutoff_year, target_years)],
+        engine=engine,
+        max_new_tokens=max_new_tokens,
+    )[0]
@@ -0,0 +1,214 @@
+"""Forecast distributions from token log-probabilities.
+
+Instead of asking for a JSON answer, the prompt stops exactly where the
+forecast percentage would be written and the model's next-token
+log-probabilities over the integer bins 0-100 are read off. One short call per
+(variable, cutoff, target year) yields a whole predictive distribution, which
+is turned into quantiles and a :class:`Forecast` (median, 90% interval) and can
+be scored directly with :func:`value_forecasting.evaluation.calculate_crps`.
+
+- Completion models (``davinci-002``): ``max_tokens=1`` with ``logprobs=5``.
+  The legacy API returns at most five alternatives, so the distribution is
+  supported on the (up to) five most likely bins. The prompt ends in a space,
+  because cl100k_base writes " 57" as " " followed by "57".
+- Local models: every bin continuation is scored exactly in one batched
+  forward pass over the cached prompt prefix.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from value_forecasting import instrumentation
+from value_forecasting.forecaster import (
+    Forecast,
+    call_with_retries,
+    create_openai_client,
+    create_system_prompt,
+)
+from value_forecasting.gss_variables import get_historical_context
+
+BIN_VALUES = np.arange(101)
+
+
+@dataclass
+class BinnedForecast:
+    """A predictive distribution over integer percentages 0-100."""
+
+    variable: str
+    cutoff_year: int
+    target_year: int
+    probabilities: np.ndarray  # shape (101,), sums to 1
+    model: str
+    numeric_mass: float = 1.0  # probability the model put on numeric bins
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Quantiles of the binned distribution."""
+        return bin_quantiles(self.probabilities, qs)
+
+    @property
+    def mean(self) -> float:
+        return float(self.probabilities @ BIN_VALUES)
+
+    def to_forecast(self) -> Forecast:
+        """Median with a 90% (5th-95th percentile) interval."""
+        lower, median, upper = self.quantiles([0.05, 0.5, 0.95])
+        return Forecast(
+            variable=self.variable,
+            cutoff_year=self.cutoff_year,
+            target_year=self.target_year,
+            point_estimate=float(median),
+            lower_bound=float(lower),
+            upper_bound=float(upper),
+            model=f"{self.model}:logprobs",
+            raw_response=f"mean={self.mean:.1f}, numeric_mass={self.numeric_mass:.3f}",
+        )
+
+
+def create_logprob_prompt(
+    variable: str, cutoff_year: int, target_year: int, trailing_space: bool = False
+) -> str:
+    """
+    Completion prompt ending where the forecast percentage is written.
+
+    With ``trailing_space``, the prompt ends in "will be ", so that the next
+    token is the number itself. cl100k_base (``davinci-002``) needs this
+    because it splits " 57" into " " and "57". Without it, the prompt ends
+    in "will be", which suits tokenizers such as GPT-2's that have single
+    " 57" tokens.
+    """
+    context = get_historical_context(variable, cutoff_year)
+    return (
+        f"{create_system_prompt(cutoff_year)}\n\n{context}\n"
+        f"Forecast made in {cutoff_year}: in {target_year}, the percentage giving "
+        f"the liberal/progressive response will be{' ' if trailing_space else ''}"
+    )
+
+
+def bins_from_logprobs(logprobs: dict[str, float]) -> tuple[np.ndarray, float]:
+    """
+    Map token log-probabilities onto the 0-100 bins.
+
+    Tokens that are not an integer percentage are ignored. Returns the
+    normalized bin probabilities and the total mass that fell on bins.
+    """
+    probs = np.zeros(len(BIN_VALUES))
+    for token, logprob in logprobs.items():
+        text = token.strip().rstrip("%")
+        if text.isdigit() and int(text) <= 100:
+            probs[int(text)] += math.exp(logprob)
+    mass = float(probs.sum())
+    if mass == 0:
+        raise ValueError("No numeric tokens among the returned log-probabilities")
+    return probs / mass, mass
+
+
+def bin_quantiles(probabilities, qs) -> np.ndarray:
+    """
+    Quantiles of a 0-100 binned distribution.
+
+    Bin ``k`` is treated as uniform on ``[k - 0.5, k + 0.5]`` (clipped to
+    [0, 100]) so quantiles interpolate smoothly between bins.
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    edges = np.clip(np.arange(len(probabilities) + 1) - 0.5, 0, 100)
+    cdf = np.concatenate([[0.0], np.cumsum(probabilities)])
+    cdf /= cdf[-1]
+    # Keep only edges of occupied bins; runs of empty bins would otherwise give
+    # a flat CDF stretch and make the inverse ambiguous.
+    rises = np.diff(cdf) > 0
+    keep = np.concatenate([rises, [False]]) | np.concatenate([[False], rises])
+    return np.interp(np.asarray(qs, dtype=float), cdf[keep], edges[keep])
+
+
+def forecast_bins_openai(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    model: str = "davinci-002",
+    base_url: str | None = None,
+) -> list[BinnedForecast]:
+    """Binned distributions from a completion model, one short call per year."""
+    client = create_openai_client(base_url)
+    results = []
+    for target_year in target_years:
+        with instrumentation.stage("logprobs.prompt"):
+            prompt = create_logprob_prompt(
+                variable, cutoff_year, target_year, trailing_space=True
+            )
+        with instrumentation.stage("logprobs.api_call"):
+            response = call_with_retries(
+                client.completions.create,
+                model=model,
+                prompt=prompt,
+                max_tokens=1,
+                temperature=0,
+                logprobs=5,
+            )
+            instrumentation.record_usage(response)
+        with instrumentation.stage("logprobs.parse"):
+            top = response.choices[0].logprobs.top_logprobs[0]
+            try:
+                probabilities, mass = bins_from_logprobs(dict(top))
+            except ValueError:
+                instrumentation.record(parse_failures=1)
+                continue
+        results.append(
+            BinnedForecast(
+                variable=variable,
+                cutoff_year=cutoff_year,
+                target_year=target_year,
+                probabilities=probabilities,
+                model=model,
+                numeric_mass=mass,
+            )
+        )
+    return results
+
+
+def forecast_bins_local(
+    jobs: list[tuple[str, int, int]],
+    engine,
+) -> list[BinnedForecast]:
+    """
+    Binned distributions from a local model for (variable, cutoff, year) jobs.
+
+    ``engine`` must provide ``score_continuations(prompt, continuations)``
+    (see :class:`value_forecasting.local_backend.TransformersEngine`).
+    """
+    continuations = [f" {k}" for k in BIN_VALUES]
+    results = []
+    for variable, cutoff_year, target_year in jobs:
+        prompt = create_logprob_prompt(variable, cutoff_year, target_year)
+        with instrumentation.stage("logprobs.score"):
+            logprobs = np.asarray(engine.score_continuations(prompt, continuations))
+        # Exact scores over the bins: normalize in log space for stability.
+        weights = np.exp(logprobs - logprobs.max())
+        results.append(
+            BinnedForecast(
+                variable=variable,
+                cutoff_year=cutoff_year,
+                target_year=target_year,
+                probabilities=weights / weights.sum(),
+                model=engine.model_name,
+                numeric_mass=float(np.exp(logprobs).sum()),
+            )
+        )
+    return results
+
+
+def run_forecast_logprobs(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    model: str = "davinci-002",
+    base_url: str | None = None,
+) -> list[Forecast]:
+    """Logprob-mode counterpart of ``run_forecast_openai``."""
+    return [
+        binned.to_forecast()
+        for binned in forecast_bins_openai(
+            variable, cutoff_year, target_years, model=model, base_url=base_url
+        )
+    ]
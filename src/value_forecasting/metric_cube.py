@@ -0,0 +1,193 @@
+"""Precomputed metric cube for slicing results interactively.
+
+Instead of re-running ``evaluate_model`` over filtered result lists, results
+are reduced once to sufficient statistics per (model, variable, cutoff_year,
+horizon) cell:
+
+    count, sum_error, sum_abs_error, sum_sq_error, covered
+
+Any roll-up (e.g. "MAE per model for cutoffs before 2000") is then a sum over
+the selected cells, whose cost depends on the number of cells rather than the
+number of results, and yields exactly the metrics ``evaluate_model`` reports.
+
+Cubes are saved as compressed ``.npz`` for Python and as sparse JSON (only
+non-empty cells) for the web app.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from value_forecasting.evaluation import ForecastResult
+
+DIMENSIONS = ("model", "variable", "cutoff_year", "horizon")
+STATISTICS = ("count", "sum_error", "sum_abs_error", "sum_sq_error", "covered")
+
+
+def metrics_from_stats(stats: np.ndarray, target_coverage: float = 0.90) -> dict:
+    """Metrics (as in ``evaluate_model``) from one vector of STATISTICS."""
+    count, sum_error, sum_abs, sum_sq, covered = (float(s) for s in stats)
+    if not count:
+        return {
+            "n_forecasts": 0,
+            "mae": 0.0,
+            "rmse": 0.0,
+            "bias": 0.0,
+            "coverage_90": 0.0,
+            "calibration_error": 0.0,
+        }
+    coverage = covered / count
+    return {
+        "n_forecasts": int(count),
+        "mae": sum_abs / count,
+        "rmse": (sum_sq / count) ** 0.5,
+        "bias": sum_error / count,
+        "coverage_90": coverage,
+        "calibration_error": abs(target_coverage - coverage),
+    }
+
+
+@dataclass
+class MetricCube:
+    """Sufficient statistics over DIMENSIONS, shape (*label counts, STATISTICS)."""
+
+    labels: dict[str, list]
+    stats: np.ndarray
+
+    def _positions(self, selection: dict) -> list[list[int]]:
+        unknown = set(selection) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimensions: {sorted(unknown)}")
+        positions = []
+        for dim in DIMENSIONS:
+            if dim in selection:
+                lookup = {label: i for i, label in enumerate(self.labels[dim])}
+                wanted = _as_list(selection[dim])
+                positions.append([lookup[w] for w in wanted if w in lookup])
+            else:
+                positions.append(list(range(len(self.labels[dim]))))
+        return positions
+
+    def select(self, **selection) -> np.ndarray:
+        """
+        Sub-cube for a selection, e.g. ``select(model="linear", horizon=[10])``.
+
+        Each keyword names a dimension and gives one label or a list of labels;
+        unnamed dimensions are kept whole.
+        """
+        return self.stats[np.ix_(*self._positions(selection))]
+
+    def metrics(self, **selection) -> dict:
+        """Metrics over every result in the selection."""
+        sub = self.select(**selection)
+        return metrics_from_stats(sub.reshape(-1, len(STATISTICS)).sum(axis=0))
+
+    def rollup(self, by: list[str], **selection) -> dict:
+        """
+        Metrics grouped by the ``by`` dimensions within a selection.
+
+        Keys are labels (one dimension) or label tuples; empty groups are
+        omitted.
+        """
+        positions = self._positions(selection)
+        sub = self.stats[np.ix_(*positions)]
+        keep = [DIMENSIONS.index(dim) for dim in by]
+        drop = tuple(i for i in range(len(DIMENSIONS)) if i not in keep)
+        grouped = sub.sum(axis=drop)
+        # Summed axes keep DIMENSIONS order; put them in the order of ``by``.
+        kept = sorted(keep)
+        grouped = grouped.transpose([kept.index(k) for k in keep] + [len(keep)])
+        labels = [[self.labels[DIMENSIONS[k]][p] for p in positions[k]] for k in keep]
+        results = {}
+        for index in np.ndindex(*grouped.shape[:-1]):
+            stats = grouped[index]
+            if not stats[0]:
+                continue
+            key = tuple(labels[d][i] for d, i in enumerate(index))
+            results[key[0] if len(by) == 1 else key] = metrics_from_stats(stats)
+        return results
+
+    def save(self, path: str | Path) -> None:
+        """Save as compressed ``.npz``."""
+        np.savez_compressed(
+            path,
+            stats=self.stats,
+            labels=json.dumps(self.labels),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MetricCube":
+        """Load a cube written by :meth:`save`."""
+        with np.load(path) as data:
+            return cls(labels=json.loads(str(data["labels"])), stats=data["stats"])
+
+    def to_json(self) -> dict:
+        """Sparse JSON: labels plus coordinates and stats of non-empty cells."""
+        cells = np.nonzero(self.stats[..., 0])
+        return {
+            "dimensions": list(DIMENSIONS),
+            "statistics": list(STATISTICS),
+            "labels": self.labels,
+            "coords": [c.tolist() for c in cells],
+            "stats": [self.stats[cells][:, k].tolist() for k in range(len(STATISTICS))],
+        }
+
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, list | tuple | set) else [value]
+
+
+class CubeBuilder:
+    """Accumulates results one at a time into a :class:`MetricCube`."""
+
+    def __init__(self):
+        self._codes: list[dict] = [{} for _ in DIMENSIONS]
+        self._cells: dict[tuple[int, ...], list[float]] = {}
+
+    def add(self, result: ForecastResult) -> None:
+        models, variables, cutoffs, horizons = self._codes
+        horizon = result.target_year - result.cutoff_year
+        key = (
+            models.setdefault(result.model, len(models)),
+            variables.setdefault(result.variable, len(variables)),
+            cutoffs.setdefault(result.cutoff_year, len(cutoffs)),
+            horizons.setdefault(horizon, len(horizons)),
+        )
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = [0.0, 0.0, 0.0, 0.0, 0.0]
+        error = result.predicted - result.actual
+        cell[0] += 1
+        cell[1] += error
+        cell[2] += abs(error)
+        cell[3] += error * error
+        cell[4] += result.lower <= result.actual <= result.upper
+
+    def build(self) -> MetricCube:
+        """Dense cube with each dimension's labels sorted."""
+        orders = []
+        labels = {}
+        for dim, codes in zip(DIMENSIONS, self._codes):
+            ordered = sorted(codes)
+            labels[dim] = ordered
+            remap = np.empty(len(codes), dtype=int)
+            for new, label in enumerate(ordered):
+                remap[codes[label]] = new
+            orders.append(remap)
+        stats = np.zeros([len(labels[d]) for d in DIMENSIONS] + [len(STATISTICS)])
+        if self._cells:
+            keys = np.array(list(self._cells))
+            index = tuple(orders[d][keys[:, d]] for d in range(len(DIMENSIONS)))
+            stats[index] = np.array(list(self._cells.values()))
+        return MetricCube(labels=labels, stats=stats)
+
+
+def build_metric_cube(results: Iterable[ForecastResult]) -> MetricCube:
+    """Reduce results (any iterable, consumed once) to a :class:`MetricCube`."""
+    builder = CubeBuilder()
+    for result in results:
+        builder.add(result)
+    return builder.build()
@@ -0,0 +1,433 @@
+"""Offline stand-in for the Anthropic and OpenAI APIs.
+
+Serves the Messages (``POST /v1/messages``), Chat Completions
+(``POST /v1/chat/completions``) and legacy Completions (``POST /v1/completions``)
+wire formats with configurable latency, injected 429/5xx errors and canned or
+generated JSON forecasts, so the forecasting path can be load-tested without
+network access.
+
+Point the clients at it with ``base_url``::
+
+    with MockLLMServer(MockConfig(latency="lognormal", latency_median=0.5)) as srv:
+        run_forecast("HOMOSEX", 2000, [2010], base_url=srv.anthropic_base_url)
+        run_forecast_openai("HOMOSEX", 2000, [2010], base_url=srv.openai_base_url)
+
+or run it standalone with ``python -m value_forecasting.mock_llm --port 8765``.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server."""
+
+    latency: str = "fixed"  # "fixed", "uniform" or "lognormal"
+    latency_median: float = 0.0  # seconds
+    latency_spread: float = 0.5  # uniform half-width (s) or lognormal sigma
+    rate_limit_rate: float = 0.0  # probability of a 429
+    server_error_rate: float = 0.0  # probability of a 500/503
+    retry_after: float = 0.0  # seconds sent in the Retry-After header
+    canned_response: str | None = None  # fixed reply text, else generated
+    seed: int | None = None
+
+
+@dataclass
+class MockStats:
+    """Counters updated by the server (read them for throughput numbers)."""
+
+    requests: int = 0
+    responses: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    by_endpoint: dict[str, int] = field(default_factory=dict)
+
+
+def _history_from_prompt(prompt: str) -> list[tuple[int, float]]:
+    return [
+        (int(year), float(value))
+        for year, value in re.findall(r"^- (\d{4}): ([\d.]+)%", prompt, re.M)
+    ]
+
+
+def generate_response(prompt: str) -> str:
+    """
+    Produce a well-formed JSON forecast for a prompt.
+
+    Point-forecast prompts get a linear extrapolation of the historical values
+    they contain (per variable for packed prompts); distribution prompts get
+    an even split over the listed response options, for each target year when
+    the prompt lists several.
+    """
+    years_match = re.search(r"Target years to predict: (\[[\d, ]*\])", prompt)
+    target_years = json.loads(years_match.group(1)) if years_match else []
+    options_match = re.search(r"Response options to predict: (\[.*\])", prompt)
+    if options_match:
+        options = json.loads(options_match.group(1).replace("'", '"'))
+        share = 100 / len(options)
+        distribution = {
+            option: {"estimate": share, "lower": share / 2, "upper": share * 1.5}
+            for option in options
+        }
+        if years_match:
+            predictions = [
+                {"year": year, "distribution": distribution} for year in target_years
+            ]
+        else:
+            predictions = distribution
+        return json.dumps({"predictions": predictions, "reasoning": "mock"})
+
+    if re.search(r"^Variables to predict: ", prompt, re.M):
+        # One "Variable: NAME" section per variable, each with its history.
+        sections = re.split(r"^Variable: (\S+)$", prompt, flags=re.M)
+        predictions = {
+            name: _point_predictions(_history_from_prompt(section), target_years)
+            for name, section in zip(sections[1::2], sections[2::2])
+        }
+    else:
+        predictions = _point_predictions(_history_from_prompt(prompt), target_years)
+    return json.dumps({"predictions": predictions, "reasoning": "mock"})
+
+
+def _point_predictions(
+    history: list[tuple[int, float]], target_years: list[int]
+) -> list[dict]:
+    """Linear extrapolation of ``history`` with intervals widening by year."""
+    if len(history) >= 2:
+        (y0, v0), (y1, v1) = history[0], history[-1]
+        slope = (v1 - v0) / (y1 - y0)
+    elif history:
+        y1, v1, slope = history[-1][0], history[-1][1], 0.0
+    else:
+        y1, v1, slope = 0, 50.0, 0.0
+
+    predictions = []
+    for year in target_years:
+        estimate = min(100.0, max(0.0, v1 + slope * (year - y1)))
+        half_width = 2.0 + 0.5 * abs(year - y1)
+        predictions.append(
+            {
+                "year": year,
+                "estimate": round(estimate, 1),
+                "lower": round(max(0.0, estimate - half_width), 1),
+                "upper": round(min(100.0, estimate + half_width), 1),
+            }
+        )
+    return predictions
+
+
+def generate_top_logprobs(prompt: str, k: int = 5) -> dict[str, float]:
+    """
+    Next-token alternatives for a logprob-mode prompt.
+
+    Centres a discretized normal (sd 3 points) on the linear extrapolation of
+    the prompt's history and returns the ``k`` most likely integer tokens.
+
+    Tokenization follows cl100k_base (``davinci-002``), which splits " 57"
+    into " " and "57". Integer tokens therefore only come after a prompt
+    that ends in a space. After any other prompt, the alternatives are
+    whitespace and words.
+    """
+    if not prompt.endswith(" "):
+        words = [" ", "\n", " about", " approximately", " around", " roughly"]
+        return {word: math.log(0.5) - i for i, word in enumerate(words[:k])}
+    year_match = re.search(r"in (\d{4}), the percentage", prompt)
+    history = _history_from_prompt(prompt)
+    if year_match and len(history) >= 2:
+        (y0, v0), (y1, v1) = history[0], history[-1]
+        center = v1 + (v1 - v0) / (y1 - y0) * (int(year_match.group(1)) - y1)
+    else:
+        center = history[-1][1] if history else 50.0
+    center = min(100.0, max(0.0, center))
+    weights = {v: math.exp(-0.5 * ((v - center) / 3) ** 2) for v in range(101)}
+    top = sorted(weights, key=weights.get, reverse=True)[:k]
+    total = sum(weights.values())
+    return {str(v): math.log(weights[v] / total) for v in top}
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence access log
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.server.lock:
+                body = dict(self.server.stats.__dict__)
+            self._send(200, body)
+        else:
+            self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+        anthropic_style = path.endswith("/messages")
+
+        with self.server.lock:
+            stats = self.server.stats
+            stats.requests += 1
+            stats.by_endpoint[path] = stats.by_endpoint.get(path, 0) + 1
+            delay = self.server.draw_latency()
+            roll = self.server.rng.random()
+
+        time.sleep(delay)
+
+        config = self.server.config
+        if roll < config.rate_limit_rate:
+            with self.server.lock:
+                self.server.stats.rate_limited += 1
+            return self._send_error(429, "rate_limit_error", anthropic_style)
+        if roll < config.rate_limit_rate + config.server_error_rate:
+            with self.server.lock:
+                self.server.stats.server_errors += 1
+            band = (roll - config.rate_limit_rate) / config.server_error_rate
+            status = 500 if band < 0.5 else 503
+            return self._send_error(status, "api_error", anthropic_style)
+
+        if path.endswith("/messages"):
+            body = self._messages(payload)
+        elif path.endswith("/chat/completions"):
+            body = self._chat_completions(payload)
+        elif path.endswith("/completions"):
+            body = self._completions(payload)
+        else:
+            return self._send(404, {"error": {"message": f"unknown path {path}"}})
+
+        with self.server.lock:
+            self.server.stats.responses += 1
+        self._send(200, body)
+
+    def _reply_text(self, prompt: str) -> str:
+        canned = self.server.config.canned_response
+        return canned if canned is not None else generate_response(prompt)
+
+    def _messages(self, payload: dict) -> dict:
+        prompt = "\n".join(
+            m["content"] if isinstance(m["content"], str) else json.dumps(m["content"])
+            for m in payload.get("messages", [])
+        )
+        text = self._reply_text(prompt)
+        return {
+            "id": f"msg_mock_{uuid.uuid4().hex[:12]}",
+            "type": "message",
+            "role": "assistant",
+            "model": payload.get("model", "mock"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": _count_tokens(str(payload.get("system", "")) + prompt),
+                "output_tokens": _count_tokens(text),
+            },
+        }
+
+    def _chat_completions(self, payload: dict) -> dict:
+        prompt = "\n".join(m.get("content", "") for m in payload.get("messages", []))
+        text = self._reply_text(prompt)
+        return {
+            "id": f"chatcmpl-mock{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": self._openai_usage(prompt, text),
+        }
+
+    def _completions(self, payload: dict) -> dict:
+        prompt = payload.get("prompt", "")
+        if payload.get("logprobs"):
+            top = generate_top_logprobs(prompt, k=payload["logprobs"])
+            text = max(top, key=top.get)
+            logprobs = {
+                "tokens": [text],
+                "token_logprobs": [top[text]],
+                "top_logprobs": [top],
+                "text_offset": [len(prompt)],
+            }
+        else:
+            text, logprobs = self._reply_text(prompt), None
+        return {
+            "id": f"cmpl-mock{uuid.uuid4().hex[:12]}",
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "text": text,
+                    "logprobs": logprobs,
+                    "finish_reason": "length" if logprobs else "stop",
+                }
+            ],
+            "usage": self._openai_usage(prompt, text),
+        }
+
+    @staticmethod
+    def _openai_usage(prompt: str, text: str) -> dict:
+        prompt_tokens, completion_tokens = _count_tokens(prompt), _count_tokens(text)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _send_error(self, status: int, error_type: str, anthropic_style: bool):
+        message = f"mock injected {status}"
+        if anthropic_style:
+            body = {"type": "error", "error": {"type": error_type, "message": message}}
+        else:
+            body = {"error": {"message": message, "type": error_type, "code": None}}
+        self._send(status, body, {"retry-after": str(self.server.config.retry_after)})
+
+    def _send(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The stdlib default backlog of 5 drops connections under load tests.
+    request_queue_size = 1024
+
+    def __init__(self, address, config: MockConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = MockStats()
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+
+    def draw_latency(self) -> float:
+        config = self.config
+        if config.latency == "fixed":
+            return config.latency_median
+        if config.latency == "uniform":
+            low = max(0.0, config.latency_median - config.latency_spread)
+            return self.rng.uniform(low, config.latency_median + config.latency_spread)
+        if config.latency == "lognormal":
+            if config.latency_median <= 0:
+                return 0.0
+            return self.rng.lognormvariate(0, config.latency_spread) * (
+                config.latency_median
+            )
+        raise ValueError(f"Unknown latency distribution: {config.latency}")
+
+
+class MockLLMServer:
+    """Run the mock API in a background thread (usable as a context manager)."""
+
+    def __init__(
+        self,
+        config: MockConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self._server = _Server((host, port), config or MockConfig())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def anthropic_base_url(self) -> str:
+        """Base URL for ``Anthropic(base_url=...)``."""
+        return self.url
+
+    @property
+    def openai_base_url(self) -> str:
+        """Base URL for ``OpenAI(base_url=...)``."""
+        return f"{self.url}/v1"
+
+    @property
+    def stats(self) -> MockStats:
+        return self._server.stats
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    """Serve the mock API in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", choices=["fixed", "uniform", "lognormal"], default="fixed"
+    )
+    parser.add_argument("--latency-median", type=float, default=0.0)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--canned-response", default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        latency_median=args.latency_median,
+        latency_spread=args.latency_spread,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        retry_after=args.retry_after,
+        canned_response=args.canned_response,
+        seed=args.seed,
+    )
+    server = MockLLMServer(config, host=args.host, port=args.port)
+    print(f"Mock LLM API on {server.url} (OpenAI base URL {server.openai_base_url})")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Registry of forecasting models and cost/throughput-aware routing.
+
+Each :class:`ModelSpec` records what the pipeline needs to know about a model:
+its provider and API style, training cutoff, context window, rate limits,
+prices and batch support. The forecasters use it to pick the right API call,
+and :func:`select_model` / :class:`RoutedForecaster` use it to send each
+target year to the cheapest (or fastest) model that cannot have seen it.
+
+A forecast for ``target_year`` is contamination-safe when the model's training
+data ends before that year (a "Sep 2021" model can forecast 2022, not 2021).
+
+Rate limits depend on the account tier. The defaults below are low-tier
+values; register a copy with your own limits::
+
+    from dataclasses import replace
+
+    register(replace(get_model("gpt-3.5-turbo"), requests_per_minute=10_000))
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+PROVIDERS = ("anthropic", "openai", "local")
+API_STYLES = ("messages", "chat", "completion", "local")
+OBJECTIVES = ("cost", "throughput")
+# Batch APIs (Anthropic Message Batches, OpenAI Batch) halve the price.
+BATCH_DISCOUNT = 0.5
+# Rough size of one forecast call, for comparing models before any prompt is
+# rendered: the prompt with its historical context, and a JSON answer.
+PROMPT_TOKENS = 600
+COMPLETION_TOKENS = 300
+
+ForecastJob = tuple[str, int, list[int]]  # (variable, cutoff_year, target_years)
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """
+    What the pipeline needs to know about one model.
+
+    Attributes:
+        name: Model ID as passed to the API or the local engine.
+        provider: One of :data:`PROVIDERS`.
+        api: ``"messages"`` (Anthropic), ``"chat"`` or ``"completion"``
+            (OpenAI), or ``"local"``.
+        training_cutoff: End of the training data as the provider states it,
+            e.g. ``"Oct 2019"`` or ``"Early 2024"``.
+        context_window: Prompt plus completion tokens.
+        input_price: USD per million prompt tokens.
+        output_price: USD per million completion tokens.
+        requests_per_minute: Request rate limit; None for none (local models).
+        tokens_per_minute: Token rate limit (prompt plus completion); None
+            for none.
+        batch: Whether the provider's discounted batch API serves the model.
+        retired: No longer served; kept for its cutoff and past results.
+    """
+
+    name: str
+    provider: str
+    api: str
+    training_cutoff: str
+    context_window: int
+    input_price: float = 0.0
+    output_price: float = 0.0
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    batch: bool = False
+    retired: bool = False
+
+    def __post_init__(self):
+        if self.provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider {self.provider!r}")
+        if self.api not in API_STYLES:
+            raise ValueError(f"Unknown API style {self.api!r}")
+        if not re.search(r"\d{4}", self.training_cutoff):
+            raise ValueError(f"No year in training cutoff {self.training_cutoff!r}")
+
+    @property
+    def cutoff_year(self) -> int:
+        """Calendar year in which the training data ends."""
+        return int(re.findall(r"\d{4}", self.training_cutoff)[-1])
+
+    def is_safe_for(self, target_year: int) -> bool:
+        """Whether the training data ends before ``target_year``."""
+        return target_year > self.cutoff_year
+
+    def cost(
+        self, input_tokens: float, output_tokens: float, batch: bool = False
+    ) -> float:
+        """USD for the given token counts."""
+        usd = (
+            input_tokens * self.input_price + output_tokens * self.output_price
+        ) / 1e6
+        return usd * BATCH_DISCOUNT if batch and self.batch else usd
+
+    def calls_per_minute(self, tokens_per_call: float) -> float:
+        """Sustained calls per minute allowed by the rate limits."""
+        limits = [math.inf]
+        if self.requests_per_minute is not None:
+            limits.append(self.requests_per_minute)
+        if self.tokens_per_minute is not None:
+            limits.append(self.tokens_per_minute / max(tokens_per_call, 1))
+        return min(limits)
+
+
+MODELS: dict[str, ModelSpec] = {}
+
+
+def register(spec: ModelSpec) -> ModelSpec:
+    """Add ``spec`` to the registry, replacing any model of the same name."""
+    MODELS[spec.name] = spec
+    return spec
+
+
+def get_model(name: str) -> ModelSpec:
+    """The registered spec for ``name``."""
+    try:
+        return MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown model {name!r}; register it first") from None
+
+
+def api_style(name: str) -> str:
+    """
+    API style for ``name``.
+
+    Unregistered OpenAI names (e.g. fine-tunes) fall back to the completion
+    API for the davinci family and chat otherwise.
+    """
+    if name in MODELS:
+        return MODELS[name].api
+    return "completion" if re.match(r"(text-)?davinci", name) else "chat"
+
+
+# Original GPT-3 base model; completion API only.
+register(
+    ModelSpec(
+        "davinci-002",
+        "openai",
+        "completion",
+        "Oct 2019",
+        context_window=16_384,
+        input_price=2.0,
+        output_price=2.0,
+        requests_per_minute=3_000,
+        tokens_per_minute=250_000,
+    )
+)
+for _name in ("text-davinci-002", "text-davinci-003"):
+    register(
+        ModelSpec(
+            _name,
+            "openai",
+            "completion",
+            "June 2021",
+            context_window=4_097,
+            input_price=20.0,
+            output_price=20.0,
+            retired=True,
+        )
+    )
+register(
+    ModelSpec(
+        "gpt-3.5-turbo-0301",
+        "openai",
+        "chat",
+        "Sep 2021",
+        context_window=4_096,
+        input_price=1.5,
+        output_price=2.0,
+        retired=True,
+    )
+)
+register(
+    ModelSpec(
+        "gpt-3.5-turbo",
+        "openai",
+        "chat",
+        "Sep 2021",
+        context_window=16_385,
+        input_price=0.5,
+        output_price=1.5,
+        requests_per_minute=3_500,
+        tokens_per_minute=200_000,
+        batch=True,
+    )
+)
+register(
+    ModelSpec(
+        "gpt-4-0314",
+        "openai",
+        "chat",
+        "Sep 2021",
+        context_window=8_192,
+        input_price=30.0,
+        output_price=60.0,
+        retired=True,
+    )
+)
+# Contaminated for GSS 2021.
+register(
+    ModelSpec(
+        "claude-sonnet-4-20250514",
+        "anthropic",
+        "messages",
+        "Early 2024",
+        context_window=200_000,
+        input_price=3.0,
+        output_price=15.0,
+        requests_per_minute=50,
+        tokens_per_minute=30_000,
+        batch=True,
+    )
+)
+# Open-weights models for the local backend (see local_backend.py).
+# WebText excludes links created after Dec 2017; the Pile ends in 2020.
+register(ModelSpec("gpt2-xl", "local", "local", "Dec 2017", context_window=1_024))
+for _name in ("EleutherAI/gpt-j-6b", "EleutherAI/pythia-6.9b"):
+    register(ModelSpec(_name, "local", "local", "2020", context_window=2_048))
+
+
+def _candidates(candidates) -> list[ModelSpec]:
+    if candidates is None:
+        return [
+            spec
+            for spec in MODELS.values()
+            if spec.provider != "local" and not spec.retired
+        ]
+    return [get_model(name) if isinstance(name, str) else name for name in candidates]
+
+
+def select_model(
+    target_years: list[int],
+    candidates: list[str] | None = None,
+    objective: str = "cost",
+    input_tokens: int = PROMPT_TOKENS,
+    output_tokens: int = COMPLETION_TOKENS,
+) -> ModelSpec | None:
+    """
+    The best model that can forecast every target year without contamination.
+
+    Args:
+        target_years: Years to forecast in one call.
+        candidates: Model names to choose from (default: every registered
+            API model that is not retired; local models only when named).
+        objective: ``"cost"`` for the cheapest call (ties go to the higher
+            throughput) or ``"throughput"`` for the most calls per minute
+            (ties go to the cheaper).
+        input_tokens: Prompt tokens per call.
+        output_tokens: Completion tokens per call.
+
+    Returns:
+        The chosen spec, or None if no candidate is safe for every target
+        year or has a large enough context window.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; expected {OBJECTIVES}")
+    tokens = input_tokens + output_tokens
+    valid = [
+        spec
+        for spec in _candidates(candidates)
+        if spec.context_window >= tokens
+        and all(spec.is_safe_for(year) for year in target_years)
+    ]
+    if not valid:
+        return None
+
+    def cost(spec):
+        return spec.cost(input_tokens, output_tokens)
+
+    def speed(spec):
+        return -spec.calls_per_minute(tokens)
+
+    if objective == "cost":
+        return min(valid, key=lambda spec: (cost(spec), speed(spec)))
+    return min(valid, key=lambda spec: (speed(spec), cost(spec)))
+
+
+def route_jobs(
+    jobs: list[ForecastJob],
+    candidates: list[str] | None = None,
+    objective: str = "cost",
+    input_tokens: int = PROMPT_TOKENS,
+    output_tokens: int = COMPLETION_TOKENS,
+) -> dict[str, list[ForecastJob]]:
+    """
+    Split ``(variable, cutoff, target_years)`` jobs across models.
+
+    Each target year goes to the best model for it (see
+    :func:`select_model`). A job's years that share a model stay in one
+    call. Target years that no candidate can forecast without contamination
+    are left out.
+
+    Returns:
+        Jobs per model name, in the order models were first chosen.
+    """
+    routes: dict[str, list[ForecastJob]] = {}
+    chosen: dict[int, ModelSpec | None] = {}
+    for variable, cutoff, targets in jobs:
+        by_model: dict[str, list[int]] = {}
+        for year in targets:
+            if year not in chosen:
+                chosen[year] = select_model(
+                    [year], candidates, objective, input_tokens, output_tokens
+                )
+            if chosen[year] is not None:
+                by_model.setdefault(chosen[year].name, []).append(year)
+        for name, years in by_model.items():
+            routes.setdefault(name, []).append((variable, cutoff, years))
+    return routes
+
+
+def forecaster_for(name: str, base_url: str | None = None):
+    """``(variable, cutoff, target_years) -> list[Forecast]`` for ``name``."""
+    from functools import partial
+
+    spec = get_model(name) if name in MODELS else None
+    provider = spec.provider if spec else "openai"
+    if provider == "local":
+        from value_forecasting.local_backend import run_forecast_local
+
+        return partial(run_forecast_local, engine=name)
+    from value_forecasting import forecaster
+
+    if provider == "anthropic":
+        return partial(forecaster.run_forecast, model=name, base_url=base_url)
+    return partial(forecaster.run_forecast_openai, model=name, base_url=base_url)
+
+
+@dataclass(frozen=True)
+class RoutedForecaster:
+    """
+    Forecaster that sends each target year to its best registered model.
+
+    Use it like any other forecaster, e.g. with
+    :func:`value_forecasting.incremental.run_incremental`. Each forecast's
+    ``model`` names the model that made it. It is picklable, so it also
+    works with process pools.
+    """
+
+    candidates: tuple[str, ...] | None = None
+    objective: str = "cost"
+    base_url: str | None = None
+
+    def __call__(self, variable: str, cutoff_year: int, target_years: list[int]):
+        candidates = list(self.candidates) if self.candidates else None
+        routes = route_jobs(
+            [(variable, cutoff_year, target_years)], candidates, self.objective
+        )
+        forecasts = []
+        for name, model_jobs in routes.items():
+            forecast = forecaster_for(name, self.base_url)
+            for job in model_jobs:
+                forecasts.extend(forecast(*job))
+        return forecasts
@@ -0,0 +1,116 @@
+"""Contamination check for planned LLM forecast jobs.
+
+A model whose training data runs past a target year may simply remember the
+answer, so its "forecast" for that year says nothing about forecasting skill.
+:func:`plan_contamination` cross-checks each ``(variable, cutoff,
+target_years)`` job against the model's training cutoff (``MODEL_CUTOFFS``,
+from :mod:`value_forecasting.models`) before any API call. It then either
+drops those years, or keeps them and lists them so their results can be
+reported separately:
+
+    plan = plan_contamination("claude-sonnet-4-20250514", jobs)
+    print(plan.summary())  # calls and tokens saved
+    for job in plan.jobs:
+        run_forecast(*job)
+
+Token counts are estimates, about four characters per token for the prompts,
+which is close for English text with both providers' tokenizers.
+"""
+
+from dataclasses import dataclass, field
+
+from value_forecasting.forecaster import create_forecast_prompt, create_system_prompt
+from value_forecasting.models import get_model
+
+POLICIES = ("skip", "flag")
+CHARS_PER_TOKEN = 4
+# Expected completion: the JSON wrapper and reasoning, plus one entry per year.
+RESPONSE_TOKENS = 80
+TOKENS_PER_PREDICTION = 20
+
+ForecastJob = tuple[str, int, list[int]]  # (variable, cutoff_year, target_years)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def call_tokens(variable: str, cutoff_year: int, target_years: list[int]) -> int:
+    """Estimated prompt plus completion tokens for one forecast call."""
+    prompt = create_forecast_prompt(variable, cutoff_year, target_years)
+    return (
+        estimate_tokens(create_system_prompt(cutoff_year))
+        + estimate_tokens(prompt)
+        + RESPONSE_TOKENS
+        + TOKENS_PER_PREDICTION * len(target_years)
+    )
+
+
+@dataclass
+class ContaminationPlan:
+    """Forecast jobs after checking them against a model's training cutoff."""
+
+    model: str
+    policy: str
+    jobs: list[ForecastJob] = field(default_factory=list)
+    contaminated: list[tuple[str, int, int]] = field(default_factory=list)
+    calls_saved: int = 0
+    tokens_saved: int = 0
+
+    @property
+    def n_calls(self) -> int:
+        return len(self.jobs)
+
+    def is_contaminated(
+        self, variable: str, cutoff_year: int, target_year: int
+    ) -> bool:
+        """Whether the model may have seen ``target_year`` in training."""
+        return (variable, cutoff_year, target_year) in self.contaminated
+
+    def summary(self) -> str:
+        cutoff = get_model(self.model).training_cutoff
+        action = "skipped" if self.policy == "skip" else "flagged"
+        return (
+            f"{self.model} (trained to {cutoff}): {len(self.contaminated)} "
+            f"contaminated target years {action}; {self.n_calls} forecast calls, "
+            f"{self.calls_saved} calls and ~{self.tokens_saved:,} tokens saved"
+        )
+
+
+def plan_contamination(
+    model: str, jobs: list[ForecastJob], policy: str = "skip"
+) -> ContaminationPlan:
+    """
+    Check forecast jobs against ``model``'s training cutoff.
+
+    Args:
+        model: A registered model name (see ``MODEL_CUTOFFS``).
+        jobs: ``(variable, cutoff_year, target_years)`` calls to make.
+        policy: ``"skip"`` drops contaminated target years, and jobs left
+            with none; ``"flag"`` keeps every call and only lists them.
+
+    Returns:
+        The calls to make, the contaminated ``(variable, cutoff, target)``
+        triples and, when skipping, the calls and tokens saved.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}; expected {POLICIES}")
+    spec = get_model(model)
+    plan = ContaminationPlan(model, policy)
+    for variable, cutoff, targets in jobs:
+        safe = [year for year in targets if spec.is_safe_for(year)]
+        plan.contaminated.extend(
+            (variable, cutoff, year) for year in targets if year not in safe
+        )
+        if policy == "flag" or len(safe) == len(targets):
+            plan.jobs.append((variable, cutoff, list(targets)))
+            continue
+        tokens = call_tokens(variable, cutoff, targets)
+        if safe:
+            plan.jobs.append((variable, cutoff, safe))
+            tokens -= call_tokens(variable, cutoff, safe)
+        else:
+            plan.calls_saved += 1
+        plan.tokens_saved += tokens
+    return plan
@@ -0,0 +1,178 @@
+"""Deduplicated, lazily loaded storage for raw model responses.
+
+Every forecast parsed from one LLM call used to hold its own reference to the
+full response text (and each ARIMA forecast a freshly rendered model summary),
+which dominated memory in large sweeps and was copied again whenever results
+were pickled for another process. Forecasts now keep a short content hash
+(``response_id``); the text itself lives once in a :class:`ResponseStore`,
+zlib-compressed, and is only decompressed when ``raw_response`` is read.
+
+By default the store is in memory. Point it at a directory to keep blobs on
+disk instead (one file per distinct response, written once)::
+
+    from value_forecasting import response_store
+
+    response_store.set_store(response_store.ResponseStore("results/responses"))
+
+or set ``VALUE_FORECASTING_RESPONSES=results/responses`` before import. With an
+on-disk store, pickled forecasts carry only their ID; with the in-memory store
+they carry the compressed blob, shared between forecasts in the same pickle.
+"""
+
+import dataclasses
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+
+# Responses shorter than this are stored uncompressed.
+COMPRESS_MIN_BYTES = 256
+
+_RAW, _ZLIB = b"r", b"z"
+
+
+class ResponseStore:
+    """Content-addressed store of response texts."""
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._blobs: dict[str, bytes] = {}
+        self._on_disk: set[str] = set()
+        self._lock = threading.Lock()
+        self._last: tuple[str | None, str] = (None, "")
+
+    def __len__(self) -> int:
+        return len(self._blobs) + len(self._on_disk)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in memory by stored blobs."""
+        return sum(len(b) for b in self._blobs.values())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.blob"
+
+    def put(self, text: str) -> str:
+        """Store ``text`` (once) and return its ID; empty text maps to ``""``."""
+        if not text:
+            return ""
+        last_text, last_key = self._last
+        if text is last_text:
+            return last_key
+        data = text.encode()
+        key = hashlib.blake2b(data, digest_size=8).hexdigest()
+        self._last = (text, key)
+        if key in self._blobs or key in self._on_disk:
+            return key
+        if len(data) >= COMPRESS_MIN_BYTES:
+            blob = _ZLIB + zlib.compress(data)
+        else:
+            blob = _RAW + data
+        self.adopt(key, blob)
+        return key
+
+    def adopt(self, key: str, blob: bytes) -> None:
+        """Add an already encoded blob (e.g. one shipped inside a pickle)."""
+        with self._lock:
+            if key in self._blobs or key in self._on_disk:
+                return
+            if self.directory is None:
+                self._blobs[key] = blob
+                return
+            path = self._path(key)
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_bytes(blob)
+                tmp.replace(path)
+            self._on_disk.add(key)
+
+    def blob(self, key: str) -> bytes:
+        """Encoded blob for ``key``."""
+        blob = self._blobs.get(key)
+        if blob is not None:
+            return blob
+        if self.directory is not None:
+            path = self._path(key)
+            if path.exists():
+                return path.read_bytes()
+        raise KeyError(
+            f"Response {key!r} is not in this process's store; use an on-disk "
+            "ResponseStore to share responses between processes"
+        )
+
+    def get(self, key: str) -> str:
+        """Decoded text for ``key``."""
+        if not key:
+            return ""
+        blob = self.blob(key)
+        data = zlib.decompress(blob[1:]) if blob[:1] == _ZLIB else blob[1:]
+        return data.decode()
+
+    def portable(self, key: str) -> bytes | None:
+        """Blob to ship alongside ``key`` when pickling (None if on disk)."""
+        if not key or self.directory is not None:
+            return None
+        return self._blobs.get(key)
+
+
+_store = ResponseStore(os.environ.get("VALUE_FORECASTING_RESPONSES") or None)
+
+
+def get_store() -> ResponseStore:
+    """The process-wide response store."""
+    return _store
+
+
+def set_store(store: ResponseStore) -> ResponseStore:
+    """Replace the process-wide store; returns the previous one."""
+    global _store
+    previous, _store = _store, store
+    return previous
+
+
+def put(text: str) -> str:
+    """Store ``text`` in the process-wide store and return its ID."""
+    return _store.put(text)
+
+
+def get(key: str) -> str:
+    """Load a response from the process-wide store."""
+    return _store.get(key)
+
+
+def _rebuild(cls, values: tuple, key: str, blob: bytes | None):
+    if blob is not None:
+        _store.adopt(key, blob)
+    obj = object.__new__(cls)
+    for f, value in zip(dataclasses.fields(cls), values):
+        object.__setattr__(obj, f.name, value)
+    return obj
+
+
+def stores_raw_response(cls):
+    """
+    Class decorator for dataclasses with a ``raw_response`` init-only argument.
+
+    Adds a lazy ``raw_response`` property backed by ``response_id`` and a
+    ``__reduce__`` that pickles the ID (plus the blob for in-memory stores).
+    Apply it on top of ``@dataclass``.
+    """
+
+    def _get(self) -> str:
+        return _store.get(self.response_id)
+
+    def _set(self, text: str) -> None:
+        self.response_id = _store.put(text)
+
+    def __reduce__(self):
+        values = tuple(getattr(self, f.name) for f in dataclasses.fields(cls))
+        key = self.response_id
+        return _rebuild, (cls, values, key, _store.portable(key))
+
+    cls.raw_response = property(_get, _set, doc="Raw model response text.")
+    cls.__reduce__ = __reduce__
+    return cls
@@ -10,12 +10,15 @@ from value_forecasting import (
     run_baseline_forecast,
     run_forecast,
 )
+from value_forecasting.planning import plan_contamination
 
 
 def run_experiment(
     variables: list[str] | None = None,
     cutoff_years: list[int] | None = None,
     use_llm: bool = True,
+    model: str = "claude-sonnet-4-20250514",
+    contamination: str = "skip",
 ) -> dict:
     """
     Run the value forecasting experiment.
@@ -24,6 +27,10 @@ def run_experiment(
         variables: GSS variables to test (default: HOMOSEX, GRASS)
         cutoff_years: Years to use as training cutoffs (default: 1990, 2000)
         use_llm: Whether to run LLM forecasts (requires API key)
+        model: Claude model for the LLM forecasts
+        contamination: What to do with target years inside the model's
+            training data: "skip" them before any API call, or "flag" them
+            and report their results under "llm_contaminated"
 
     Returns:
         Dictionary of results by model
@@ -33,7 +40,21 @@ def run_experiment(
     if cutoff_years is None:
         cutoff_years = [1990, 2000]
 
-    results = {"baseline": [], "llm": []}
+    results = {"baseline": [], "llm": [], "llm_contaminated": []}
+
+    # Check every LLM call against the model's training cutoff up front
+    llm_targets = {}
+    if use_llm:
+        jobs = []
+        for variable in variables:
+            available_years = sorted(HISTORICAL_TRAJECTORIES.get(variable, {}))
+            for cutoff in cutoff_years:
+                target_years = [y for y in available_years if y > cutoff]
+                if target_years:
+                    jobs.append((variable, cutoff, target_years))
+        plan = plan_contamination(model, jobs, contamination)
+        print(plan.summary())
+        llm_targets = {(v, c): targets for v, c, targets in plan.jobs}
 
     for variable in variables:
         trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
@@ -72,13 +93,19 @@ def run_experiment(
                     )
 
             # LLM forecasts
-            if use_llm:
+            if (variable, cutoff) in llm_targets:
                 try:
-                    llm_forecasts = run_forecast(variable, cutoff, target_years)
+                    llm_forecasts = run_forecast(
+                        variable, cutoff, llm_targets[variable, cutoff], model=model
+                    )
                     for f in llm_forecasts:
                         actual = trajectory.get(f.target_year)
                         if actual is not None:
-                            results["llm"].append(
+                            contaminated = plan.is_contaminated(
+                                variable, cutoff, f.target_year
+                            )
+                            group = "llm_contaminated" if contaminated else "llm"
+                            results[group].append(
                                 ForecastResult(
                                     variable=f.variable,
                                     cutoff_year=f.cutoff_year,
@@ -91,7 +118,8 @@ def run_experiment(
                                 )
                             )
                             print(
-                                f"  LLM {f.target_year}: "
+                                f"  LLM {f.target_year}"
+                                f"{' (contaminated)' if contaminated else ''}: "
                                 f"pred={f.point_estimate:.1f}% "
                                 f"[{f.lower_bound:.1f}, {f.upper_bound:.1f}], "
                                 f"actual={actual}%"
@@ -0,0 +1,287 @@
+"""Shared-memory results table for parallel sweeps.
+
+Returning ``list[Forecast]`` from every task means pickling each forecast in
+the worker and unpickling it in the parent, which caps the speedup of
+process-parallel sweeps. :func:`run_sweep` instead preallocates one
+``multiprocessing.shared_memory`` block of NumPy columns, with one row per
+(model, variable, cutoff, target year). Each task writes its forecasts into
+its own rows and returns only a count. The parent reads the same memory
+through a :class:`ResultsTable`, with no copy.
+
+    with WorkerPool(4) as pool:
+        table = run_sweep({"naive": run_naive_forecast}, jobs, executor=pool)
+    with table:
+        print(table.metrics(model="naive"))
+        results = table.to_results()  # ForecastResult objects, if needed
+
+Model and variable columns hold integer codes into ``table.models`` and
+``table.variables``. ``model`` is the label given to :func:`run_sweep`, not
+``Forecast.model``. Rows a forecaster did not fill have ``filled == 0``.
+"""
+
+import itertools
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from value_forecasting.evaluation import ForecastResult
+from value_forecasting.forecaster import Forecast
+from value_forecasting.gss_variables import HISTORICAL_TRAJECTORIES
+from value_forecasting.metric_cube import metrics_from_stats
+
+Forecaster = Callable[[str, int, list[int]], list[Forecast]]
+ForecastJob = tuple[str, int, list[int]]
+
+COLUMNS = {
+    "model": np.int32,
+    "variable": np.int32,
+    "cutoff_year": np.int32,
+    "target_year": np.int32,
+    "predicted": np.float64,
+    "lower": np.float64,
+    "upper": np.float64,
+    "actual": np.float64,
+    "filled": np.uint8,
+}
+
+
+@dataclass(frozen=True)
+class TableHandle:
+    """What a worker needs to attach to a table: the block name and row count."""
+
+    name: str
+    n_rows: int
+
+
+def _layout(n_rows: int) -> tuple[dict[str, int], int]:
+    offsets, size = {}, 0
+    for column, dtype in COLUMNS.items():
+        offsets[column] = size
+        size += -(-n_rows * np.dtype(dtype).itemsize // 8) * 8  # 8-byte aligned
+    return offsets, size
+
+
+def _columns(buffer, n_rows: int) -> dict[str, np.ndarray]:
+    offsets, _ = _layout(n_rows)
+    return {
+        column: np.ndarray(
+            (n_rows,), dtype=dtype, buffer=buffer, offset=offsets[column]
+        )
+        for column, dtype in COLUMNS.items()
+    }
+
+
+# The table a worker last attached to, so each task skips shm_open/mmap.
+_ATTACHED: dict[str, tuple[shared_memory.SharedMemory, dict]] = {}
+
+
+def _attach(handle: TableHandle) -> dict[str, np.ndarray]:
+    attached = _ATTACHED.get(handle.name)
+    if attached is None:
+        stale = [block for block, _ in _ATTACHED.values()]  # earlier sweeps
+        _ATTACHED.clear()  # drop their views before closing the blocks
+        for block in stale:
+            block.close()
+        block = shared_memory.SharedMemory(name=handle.name)
+        attached = _ATTACHED[handle.name] = (block, _columns(block.buf, handle.n_rows))
+    return attached[1]
+
+
+def fill_rows(
+    handle: TableHandle,
+    forecaster: Forecaster,
+    start: int,
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+) -> int:
+    """
+    Task body: run one job and write its forecasts into the table.
+
+    Rows ``start .. start + len(target_years)`` belong to this job, one per
+    target year. Returns the number of rows filled.
+    """
+    return _fill(
+        _attach(handle), forecaster, start, variable, cutoff_year, target_years
+    )
+
+
+def _fill(columns, forecaster, start, variable, cutoff_year, target_years) -> int:
+    rows = {year: start + i for i, year in enumerate(target_years)}
+    filled = 0
+    for forecast in forecaster(variable, cutoff_year, target_years):
+        row = rows.get(forecast.target_year)
+        if row is None:
+            continue
+        columns["predicted"][row] = forecast.point_estimate
+        columns["lower"][row] = forecast.lower_bound
+        columns["upper"][row] = forecast.upper_bound
+        columns["filled"][row] = 1
+        filled += 1
+    return filled
+
+
+class ResultsTable:
+    """
+    Columnar results backed by shared memory (a context manager).
+
+    ``columns`` are NumPy views of the shared block; they are valid until
+    :meth:`close`, which unlinks the block.
+    """
+
+    def __init__(
+        self, block: shared_memory.SharedMemory, n_rows: int, models, variables
+    ):
+        self._block = block
+        self.n_rows = n_rows
+        self.models: list[str] = list(models)
+        self.variables: list[str] = list(variables)
+        self.columns = _columns(block.buf, n_rows)
+
+    @property
+    def handle(self) -> TableHandle:
+        return TableHandle(self._block.name, self.n_rows)
+
+    def __len__(self) -> int:
+        """Number of filled rows."""
+        return int(self.columns["filled"].sum())
+
+    def mask(self, model: str | None = None, variable: str | None = None) -> np.ndarray:
+        """Filled rows, optionally for one model and/or variable."""
+        mask = self.columns["filled"].astype(bool)
+        if model is not None:
+            mask &= self.columns["model"] == self.models.index(model)
+        if variable is not None:
+            mask &= self.columns["variable"] == self.variables.index(variable)
+        return mask
+
+    def metrics(self, model: str | None = None, variable: str | None = None) -> dict:
+        """``evaluate_model`` metrics computed directly on the columns."""
+        c = self.columns
+        mask = self.mask(model, variable) & ~np.isnan(c["actual"])
+        actual = c["actual"][mask]
+        errors = c["predicted"][mask] - actual
+        covered = (c["lower"][mask] <= actual) & (actual <= c["upper"][mask])
+        stats = [
+            errors.size,
+            errors.sum(),
+            np.abs(errors).sum(),
+            (errors * errors).sum(),
+            covered.sum(),
+        ]
+        return metrics_from_stats(np.array(stats, dtype=float))
+
+    def iter_results(self) -> Iterator[ForecastResult]:
+        """Filled rows with an actual value as :class:`ForecastResult` objects."""
+        c = self.columns
+        rows = np.flatnonzero(self.mask() & ~np.isnan(c["actual"]))
+        values = {name: c[name][rows].tolist() for name in COLUMNS}
+        for i in range(len(rows)):
+            yield ForecastResult(
+                variable=self.variables[values["variable"][i]],
+                cutoff_year=values["cutoff_year"][i],
+                target_year=values["target_year"][i],
+                predicted=values["predicted"][i],
+                actual=values["actual"][i],
+                lower=values["lower"][i],
+                upper=values["upper"][i],
+                model=self.models[values["model"][i]],
+            )
+
+    def to_results(self) -> list[ForecastResult]:
+        """Copy the table out as a list (it stays valid after :meth:`close`)."""
+        return list(self.iter_results())
+
+    def close(self) -> None:
+        """Release and unlink the shared block."""
+        if self._block is None:
+            return
+        self.columns = {}
+        try:
+            self._block.close()
+        except BufferError:
+            pass  # views still held elsewhere; the mapping goes with them
+        self._block.unlink()
+        self._block = None
+
+    def __enter__(self) -> "ResultsTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def allocate_table(
+    models: list[str], jobs: list[ForecastJob]
+) -> tuple[ResultsTable, list[int]]:
+    """
+    Allocate rows for every (model, job, target year) and fill the key columns.
+
+    Returns the table and the first row of each (model, job) pair, in
+    model-major order.
+    """
+    variables = list(dict.fromkeys(variable for variable, _, _ in jobs))
+    per_model = sum(len(targets) for _, _, targets in jobs)
+    n_rows = per_model * len(models)
+    _, size = _layout(n_rows)
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    table = ResultsTable(block, n_rows, models, variables)
+
+    keys = []
+    for variable, cutoff, targets in jobs:
+        trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
+        code = variables.index(variable)
+        for target in targets:
+            keys.append((code, cutoff, target, trajectory.get(target, np.nan)))
+    keys = np.array(keys, dtype=float).reshape(-1, 4)
+    c = table.columns
+    c["model"][:] = np.repeat(np.arange(len(models)), per_model)
+    for i, name in enumerate(("variable", "cutoff_year", "target_year", "actual")):
+        c[name][:] = np.tile(keys[:, i], len(models))
+    c["predicted"][:] = c["lower"][:] = c["upper"][:] = np.nan
+    c["filled"][:] = 0
+
+    sizes = [len(targets) for _, _, targets in jobs] * len(models)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int).tolist()
+    return table, starts
+
+
+def run_sweep(
+    forecasters: dict[str, Forecaster],
+    jobs: list[ForecastJob],
+    executor: Executor | None = None,
+) -> ResultsTable:
+    """
+    Run every forecaster on every job, collecting results in shared memory.
+
+    Args:
+        forecasters: Model label -> forecaster (must be picklable for process
+            pools, e.g. a module-level function).
+        jobs: ``(variable, cutoff_year, target_years)`` tuples.
+        executor: Optional pool (e.g. :class:`~value_forecasting.workers.WorkerPool`);
+            tasks return only a row count.
+
+    Returns:
+        A :class:`ResultsTable`; close it (or use it as a context manager) to
+        free the shared memory.
+    """
+    models = list(forecasters)
+    table, starts = allocate_table(models, jobs)
+    handle = table.handle
+    tasks = [
+        (handle, forecasters[model], start, *job)
+        for (model, job), start in zip(itertools.product(models, jobs), starts)
+    ]
+    try:
+        if executor is None:
+            for _, forecaster, *job in tasks:
+                _fill(table.columns, forecaster, *job)
+        elif tasks:
+            list(executor.map(fill_rows, *zip(*tasks)))
+    except BaseException:
+        table.close()
+        raise
+    return table
@@ -0,0 +1,248 @@
+"""Monte Carlo predictive simulation for the baseline forecasters.
+
+Each baseline computes its interval with its own ad hoc formula. This module
+instead draws sample paths from every model's predictive distribution into one
+``(samples, horizon, series)`` array, using one shared random-number generator.
+Any quantile, and joint quantities across target years (for example, the
+probability that a series keeps rising), can then be read off the same draws.
+
+Models:
+
+- ``"linear"``: trend fitted by feasible weighted least squares, as the
+  linear baseline, with each wave weighted by its sampling plus residual
+  variance. Parameter uncertainty (Student-t through a
+  chi-square draw of the residual scale) is combined with observation noise.
+- ``"naive"`` / ``"arima"`` / ``"ets"``: the random walk, ARIMA(1,1,0) and
+  local linear trend (Holt) models from :mod:`value_forecasting.timeseries`.
+  They are fitted on the annual grid and simulated by running the state
+  equation forward from the filtered state. The naive walk's variance per
+  year comes from wave-to-wave changes, scaled by the gap between waves.
+
+All models are vectorized across series.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from value_forecasting import instrumentation
+from value_forecasting.forecaster import Forecast
+from value_forecasting.timeseries import (
+    fit_state_space,
+    pre_cutoff_series,
+    precision_weights,
+)
+
+SimulationSeries = tuple[str, int]  # (variable, cutoff_year)
+
+# Residual sd assumed when a series has too few waves to estimate one
+# (matches the linear baseline's fallback).
+FALLBACK_SD = 5.0
+
+MODELS = ("linear", "naive", "arima", "ets")
+STATE_SPACE_MODELS = {
+    "naive": "random_walk",
+    "arima": "arima110",
+    "ets": "local_linear_trend",
+}
+MIN_WAVES = {"linear": 2, "naive": 1, "arima": 4, "ets": 3}
+
+
+@dataclass
+class SimulationResult:
+    """Simulated predictive paths for many series over shared target years."""
+
+    model: str
+    series: list[SimulationSeries]
+    target_years: list[int]
+    point: np.ndarray  # (horizon, series)
+    draws: np.ndarray  # (samples, horizon, series), clipped to [0, 100]
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Quantiles per target year and series, shape (len(qs), horizon, series)."""
+        return np.quantile(self.draws, qs, axis=0)
+
+    def probability(self, event) -> np.ndarray:
+        """
+        Share of sample paths for which ``event(draws)`` holds, per series.
+
+        ``event`` receives the full draws array and must return a boolean
+        array of shape (samples, series), e.g.
+        ``lambda d: d[:, -1] > d[:, 0]`` for "higher in the last target year
+        than in the first".
+        """
+        return event(self.draws).mean(axis=0)
+
+    def to_forecasts(self, level: float = 0.90) -> list[list[Forecast]]:
+        """One list of :class:`Forecast` per series, with central intervals."""
+        alpha = (1 - level) / 2
+        lower, upper = self.quantiles([alpha, 1 - alpha])
+        results = []
+        for j, (variable, cutoff_year) in enumerate(self.series):
+            results.append(
+                [
+                    Forecast(
+                        variable=variable,
+                        cutoff_year=cutoff_year,
+                        target_year=target_year,
+                        point_estimate=float(self.point[h, j]),
+                        lower_bound=float(lower[h, j]),
+                        upper_bound=float(upper[h, j]),
+                        model=f"{self.model}_sim",
+                        raw_response=(
+                            f"{self.draws.shape[0]} simulated paths, "
+                            f"{level:.0%} interval"
+                        ),
+                    )
+                    for h, target_year in enumerate(self.target_years)
+                    if not np.isnan(self.point[h, j])
+                ]
+            )
+        return results
+
+
+def _pre_cutoff(series: list[SimulationSeries]) -> list[tuple[list, list, list]]:
+    return [pre_cutoff_series(variable, cutoff) for variable, cutoff in series]
+
+
+def _padded(data) -> tuple[np.ndarray, ...]:
+    """Stack ragged (years, values, SEs) into padded arrays plus a mask."""
+    width = max((len(years) for years, *_ in data), default=0)
+    years = np.zeros((len(data), width))
+    values = np.zeros((len(data), width))
+    sampling_var = np.zeros((len(data), width))
+    mask = np.zeros((len(data), width), dtype=bool)
+    for j, (ys, vs, ses) in enumerate(data):
+        years[j, : len(ys)] = ys
+        values[j, : len(vs)] = vs
+        sampling_var[j, : len(ses)] = np.square(ses)
+        mask[j, : len(ys)] = True
+    return years, values, sampling_var, mask
+
+
+def _weighted_line(years, values, w):
+    n = w.sum(axis=1)
+    center = (w * years).sum(axis=1) / n
+    t = years - center[:, None]
+    sxx = (w * t**2).sum(axis=1)
+    intercept = (w * values).sum(axis=1) / n
+    slope = (w * t * values).sum(axis=1) / np.where(sxx > 0, sxx, 1.0)
+    resid = (values - intercept[:, None] - slope[:, None] * t) * (w > 0)
+    return center, intercept, slope, sxx, resid
+
+
+def _simulate_linear(data, targets, n_samples, rng):
+    years, values, sampling_var, mask = _padded(data)
+    mask = mask.astype(float)
+    n = mask.sum(axis=1)
+    dof = n - 2
+    *_, resid = _weighted_line(years, values, mask)
+    # Refit by feasible WLS, as run_baseline_forecast does.
+    w = precision_weights(resid, sampling_var, mask, 2)
+    center, intercept, slope, sxx, resid = _weighted_line(years, values, w)
+    sd = np.where(
+        dof > 0,
+        np.sqrt((w * resid**2).sum(axis=1) / np.maximum(dof, 1)),
+        FALLBACK_SD,
+    )
+
+    dt = targets[:, None] - center[None, :]  # (horizon, series)
+    point = intercept + slope * dt
+
+    # Student-t predictive: one residual scale per sample path and series.
+    chi2 = rng.chisquare(np.maximum(dof, 1), size=(n_samples, len(data)))
+    scale = sd * np.sqrt(np.maximum(dof, 1) / chi2)  # (samples, series)
+    z = rng.standard_normal((n_samples, 2, len(data)))
+    a = intercept + scale * z[:, 0] / np.sqrt(n)
+    b = slope + scale * z[:, 1] / np.sqrt(np.where(sxx > 0, sxx, np.inf))
+    noise = rng.standard_normal((n_samples, len(targets), len(data)))
+    draws = a[:, None] + b[:, None] * dt + scale[:, None] * noise
+    return point, draws
+
+
+def _simulate_state_space(model, data, targets, n_samples, rng):
+    # One step is one calendar year. As in run_arima_forecast /
+    # run_ets_forecast, targets at or before the last wave get no paths; the
+    # naive walk just stays at the last value there.
+    if model == "naive":
+        data = [s[:2] for s in data]  # the last value, as run_naive_forecast
+    fit = fit_state_space(STATE_SPACE_MODELS[model], data)
+    mean, _ = fit.forecast(targets.astype(int))
+    draws = fit.simulate(targets.astype(int), n_samples, rng)
+    if model == "naive":
+        return mean.T, draws
+    ahead = targets[:, None] > fit.last_year[None, :]  # (horizon, series)
+    return np.where(ahead, mean.T, np.nan), np.where(ahead, draws, np.nan)
+
+
+@instrumentation.timed("simulation.simulate")
+def simulate_paths(
+    model: str,
+    series: list[SimulationSeries],
+    target_years: list[int],
+    n_samples: int = 2000,
+    seed: int | np.random.Generator | None = 0,
+) -> SimulationResult:
+    """
+    Simulate predictive sample paths for many series at once.
+
+    Args:
+        model: One of ``MODELS``.
+        series: (variable, cutoff_year) pairs; each uses waves up to its cutoff.
+        target_years: Target years shared by all series.
+        n_samples: Number of sample paths per series.
+        seed: Seed or generator; pass the same generator across models to use
+            common random numbers.
+
+    Returns:
+        A :class:`SimulationResult`. Series with too few waves for the model
+        get NaN paths (and no forecasts). With no series, ``point`` has shape
+        ``(len(target_years), 0)``.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}; expected one of {MODELS}")
+    rng = np.random.default_rng(seed)
+    targets = np.asarray(sorted(target_years), dtype=float)
+
+    data = _pre_cutoff(series)
+    usable = [j for j, (years, *_) in enumerate(data) if len(years) >= MIN_WAVES[model]]
+    if len(usable) < len(series) or not usable:
+        point = np.full((len(targets), len(series)), np.nan)
+        draws = np.full((n_samples, len(targets), len(series)), np.nan)
+
+    if usable:
+        subset = [data[j] for j in usable]
+        if model == "linear":
+            sub_point, sub_draws = _simulate_linear(subset, targets, n_samples, rng)
+        else:
+            sub_point, sub_draws = _simulate_state_space(
+                model, subset, targets, n_samples, rng
+            )
+        if len(usable) == len(series):
+            point, draws = sub_point, sub_draws
+        else:
+            point[:, usable] = sub_point
+            draws[:, :, usable] = sub_draws
+
+    return SimulationResult(
+        model=model,
+        series=list(series),
+        target_years=[int(y) for y in targets],
+        point=np.clip(point, 0, 100),
+        draws=np.clip(draws, 0, 100, out=draws),
+    )
+
+
+def run_simulated_forecast(
+    variable: str,
+    cutoff_year: int,
+    target_years: list[int],
+    model: str = "linear",
+    n_samples: int = 2000,
+    seed: int | None = 0,
+) -> list[Forecast]:
+    """Simulation-based counterpart of the single-series baseline functions."""
+    result = simulate_paths(
+        model, [(variable, cutoff_year)], target_years, n_samples, seed
+    )
+    return result.to_forecasts()[0]
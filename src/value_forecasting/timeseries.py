@@ -0,0 +1,383 @@
+"""Time-aware series layer: annual grids and batched state-space models.
+
+GSS waves are irregular (1973, 1980, 1990, 2000, 2010, 2012, ...), so "one step
+after the last wave" is not "one year later". Here every series is placed on
+an annual grid. Each column is a calendar year, with a mask of the years that
+have a wave. Series are right-aligned so the last column is the last wave.
+Years without a wave are missing observations in a linear Gaussian
+state-space model, with one step per year. A batched Kalman filter over all
+series at once skips them.
+
+Models:
+
+- ``"random_walk"``: ``y_t = level_t``, ``level_t = level_{t-1} + eta``. The
+  naive baseline.
+- ``"local_linear_trend"``: a level plus a drifting slope, observed with
+  noise. This is the state-space form of Holt's linear method (the ETS
+  baseline).
+- ``"arima110"``: ``y_t = y_{t-1} + d_t``, ``d_t = phi * d_{t-1} + eps``, with
+  survey noise on the observed waves.
+
+Parameters are estimated by concentrated maximum likelihood. The model's
+variance ratios (and ``phi``) take values on a fixed grid. One filter pass
+evaluates every grid point for every series, and the overall scale has a
+closed form. States with no prior information start diffuse, and their first
+innovations are left out of the likelihood.
+
+A series can carry each wave's sampling standard error. The squared SE is
+known observation noise, on top of the model's own, so small early samples
+pull the filtered state less than large recent ones. It does not scale with
+the fitted variance, so the scale is re-estimated a few times with the
+sampling variance converted at the previous estimate. Forecasts of a future
+survey value add the last wave's sampling variance.
+
+Fits depend only on a series' observed waves. :func:`fit_state_space` caches
+them by model and data, so rolling cutoffs that see the same waves, and
+repeated sweeps, reuse a fit.
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from value_forecasting import instrumentation
+from value_forecasting.gss_variables import HISTORICAL_TRAJECTORIES, standard_error
+
+MODELS = ("random_walk", "local_linear_trend", "arima110")
+# Per-year random-walk variance when a series has too few waves to estimate
+# one (FALLBACK_SD points per decade, as the naive baseline).
+FALLBACK_SD = 5.0
+# Pseudo-observations of the fallback variance in each scale estimate.
+SCALE_PRIOR_WEIGHT = 1.0
+# Initial variance of diffuse states, relative to the scale.
+DIFFUSE = 1e7
+# Scale re-estimates when series have sampling errors.
+MEASUREMENT_PASSES = 3
+# Fitted series kept in the cache.
+CACHE_SIZE = 4096
+
+# (years, values) or (years, values, standard errors)
+Series = (
+    tuple[Sequence[int], Sequence[float]]
+    | tuple[Sequence[int], Sequence[float], Sequence[float]]
+)
+
+
+@dataclass
+class AnnualGrid:
+    """
+    Series on a right-aligned annual grid.
+
+    Attributes:
+        values: Shape (N, T); 0 where there is no wave.
+        mask: True for years with a wave, shape (N, T).
+        last_year: Calendar year of the last column for each series, shape (N,).
+        sampling_var: Squared standard errors, shape (N, T); 0 where there is
+            no wave or no standard error.
+    """
+
+    values: np.ndarray
+    mask: np.ndarray
+    last_year: np.ndarray
+    sampling_var: np.ndarray
+
+
+def annual_grid(series: list[Series]) -> AnnualGrid:
+    """Place series on one annual grid, ending at each last wave."""
+    spans = [int(s[0][-1]) - int(s[0][0]) + 1 for s in series]
+    width = max(spans, default=1)
+    values = np.zeros((len(series), width))
+    mask = np.zeros((len(series), width), dtype=bool)
+    sampling_var = np.zeros((len(series), width))
+    last_year = np.zeros(len(series), dtype=int)
+    for j, (years, vals, *errors) in enumerate(series):
+        last_year[j] = years[-1]
+        columns = width - 1 - (last_year[j] - np.asarray(years, dtype=int))
+        values[j, columns] = vals
+        mask[j, columns] = True
+        if errors:
+            sampling_var[j, columns] = np.square(errors[0])
+    return AnnualGrid(values, mask, last_year, sampling_var)
+
+
+def _grid(model: str) -> np.ndarray:
+    """Candidate parameters, shape (G, k)."""
+    if model == "random_walk":
+        return np.zeros((1, 0))
+    if model == "local_linear_trend":
+        # Level and slope noise variances relative to the observation noise.
+        level, slope = np.meshgrid(np.logspace(-3, 2, 11), np.logspace(-5, 1, 7))
+        return np.stack([level.ravel(), slope.ravel()], axis=-1)
+    # arima110: phi and survey noise relative to the innovation variance.
+    phi, noise = np.meshgrid(np.linspace(-0.9, 0.9, 19), [0.0, 0.1, 1.0, 10.0])
+    return np.stack([phi.ravel(), noise.ravel()], axis=-1)
+
+
+def _system(model: str, params: np.ndarray):
+    """
+    Matrices for parameters (..., k), in units of the scale.
+
+    Returns the transition (..., m, m), state noise loading L with Q = L L'
+    (..., m, m), observation noise (...), initial state covariance (..., m, m)
+    and the number of diffuse states.
+    """
+    batch = params.shape[:-1]
+    if model == "random_walk":
+        one = np.ones((*batch, 1, 1))
+        return one, one, np.zeros(batch), DIFFUSE * one, 1
+    if model == "local_linear_trend":
+        transition = np.broadcast_to([[1.0, 1.0], [0.0, 1.0]], (*batch, 2, 2))
+        loading = np.zeros((*batch, 2, 2))
+        loading[..., 0, 0] = np.sqrt(params[..., 0])
+        loading[..., 1, 1] = np.sqrt(params[..., 1])
+        initial = np.broadcast_to(DIFFUSE * np.eye(2), (*batch, 2, 2))
+        return transition, loading, np.ones(batch), initial, 2
+    phi = params[..., 0]
+    transition = np.zeros((*batch, 2, 2))
+    transition[..., 0, 0] = 1.0
+    transition[..., 0, 1] = transition[..., 1, 1] = phi
+    loading = np.zeros((*batch, 2, 2))
+    loading[..., :, 0] = 1.0
+    initial = np.zeros((*batch, 2, 2))
+    initial[..., 0, 0] = DIFFUSE
+    initial[..., 1, 1] = 1 / (1 - phi**2)  # stationary differences
+    return transition, loading, params[..., 1], initial, 1
+
+
+def _filter(model: str, grid: AnnualGrid, params: np.ndarray, scale=None):
+    """
+    Kalman filter every series under every candidate parameter.
+
+    ``scale`` (N, G) converts the grid's sampling variances to units of the
+    scale; without it they are ignored. Returns filtered state means
+    (N, G, m) and covariances (N, G, m, m) at the last column, the sum of
+    squared standardized innovations, the sum of log innovation variances and
+    the number of likelihood terms, each (N, G).
+    """
+    transition, loading, noise, initial, n_diffuse = _system(model, params)
+    q = loading @ np.swapaxes(loading, -1, -2)
+    n_series, width = grid.values.shape
+    m = transition.shape[-1]
+    state = np.zeros((n_series, len(params), m))
+    cov = np.broadcast_to(initial, (n_series, *initial.shape)).copy()
+    sum_sq = np.zeros((n_series, len(params)))
+    sum_log = np.zeros((n_series, len(params)))
+    seen = np.zeros(n_series, dtype=int)
+    for t in range(width):
+        if t:
+            state = np.einsum("gij,ngj->ngi", transition, state)
+            cov = transition @ cov @ np.swapaxes(transition, -1, -2) + q
+        observed = grid.mask[:, t]
+        if not observed.any():
+            continue
+        # Observation of the first state component, for observed rows only.
+        rows = np.flatnonzero(observed)
+        a, p = state[rows], cov[rows]
+        innovation = grid.values[rows, t, None] - a[..., 0]
+        variance = p[..., 0, 0] + noise
+        if scale is not None:
+            variance = variance + grid.sampling_var[rows, t, None] / scale[rows]
+        gain = p[..., :, 0] / variance[..., None]
+        state[rows] = a + gain * innovation[..., None]
+        cov[rows] = p - gain[..., :, None] * p[..., None, 0, :]
+        counted = (seen[rows] >= n_diffuse)[:, None]
+        sum_sq[rows] += np.where(counted, innovation**2 / variance, 0.0)
+        sum_log[rows] += np.where(counted, np.log(variance), 0.0)
+        seen[rows] += 1
+    n_terms = np.maximum(seen - n_diffuse, 0)
+    return state, cov, sum_sq, sum_log, n_terms
+
+
+@dataclass
+class StateSpaceFit:
+    """
+    Fitted state-space models for many series.
+
+    Attributes:
+        model: One of :data:`MODELS`.
+        params: Selected parameters per series, shape (N, k).
+        scale: Estimated variance scale per series, shape (N,).
+        state: Filtered state at the last wave, shape (N, m).
+        state_cov: Its covariance in units of ``scale``, shape (N, m, m).
+        last_year: Year of each series' last wave, shape (N,).
+        loglike: Concentrated log-likelihood (up to a constant), shape (N,).
+        sampling_var: Sampling variance assumed for a future survey (the last
+            wave's), shape (N,).
+    """
+
+    model: str
+    params: np.ndarray
+    scale: np.ndarray
+    state: np.ndarray
+    state_cov: np.ndarray
+    last_year: np.ndarray
+    loglike: np.ndarray
+    sampling_var: np.ndarray
+
+    def _steps(self, target_years) -> np.ndarray:
+        targets = np.asarray(target_years, dtype=int)
+        return np.maximum(targets[None, :] - self.last_year[:, None], 0)
+
+    def forecast(self, target_years) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Predictive mean and sd of the survey value in each target year.
+
+        Steps are calendar years since each series' last wave; targets at or
+        before the last wave get the filtered estimate. Shapes (N, H).
+        """
+        steps = self._steps(target_years)
+        transition, loading, noise, _, _ = _system(self.model, self.params)
+        q = loading @ np.swapaxes(loading, -1, -2)
+        state, cov = self.state, self.state_cov
+        means, variances = [state[:, 0]], [cov[:, 0, 0]]
+        for _ in range(int(steps.max(initial=0))):
+            state = np.einsum("nij,nj->ni", transition, state)
+            cov = transition @ cov @ np.swapaxes(transition, -1, -2) + q
+            means.append(state[:, 0])
+            variances.append(cov[:, 0, 0])
+        rows = np.arange(len(steps))[:, None]
+        mean = np.stack(means, axis=1)[rows, steps]
+        variance = np.stack(variances, axis=1)[rows, steps] + noise[:, None]
+        variance = self.scale[:, None] * np.maximum(variance, 0.0)
+        return mean, np.sqrt(variance + self.sampling_var[:, None])
+
+    def simulate(
+        self, target_years, n_samples: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """Joint sample paths of the survey values, shape (samples, H, N)."""
+        steps = self._steps(target_years)
+        transition, loading, noise, _, _ = _system(self.model, self.params)
+        sd = np.sqrt(self.scale)[:, None]
+        # Draw the filtered state, then run the state equation forward.
+        eigval, eigvec = np.linalg.eigh(self.state_cov)
+        root = eigvec * np.sqrt(np.maximum(eigval, 0.0))[:, None, :]
+        z = rng.standard_normal((n_samples, *self.state.shape))
+        state = self.state + sd * np.einsum("nij,snj->sni", root, z)
+        paths = [state[..., 0]]
+        for _ in range(int(steps.max(initial=0))):
+            z = rng.standard_normal(state.shape)
+            state = np.einsum("nij,snj->sni", transition, state)
+            state += sd * np.einsum("nij,snj->sni", loading, z)
+            paths.append(state[..., 0])
+        paths = np.stack(paths, axis=1)  # (samples, steps + 1, N)
+        draws = np.take_along_axis(paths, steps.T[None], axis=1)
+        survey_var = self.scale * noise + self.sampling_var
+        survey = rng.standard_normal(draws.shape) * np.sqrt(survey_var)
+        return draws + survey
+
+
+def _fit_batch(model: str, series: list[Series]) -> list[tuple]:
+    grid = annual_grid(series)
+    candidates = _grid(model)
+    # The scale is shrunk toward the fallback, worth SCALE_PRIOR_WEIGHT
+    # observations, so series with a handful of waves cannot fit perfectly.
+    scale = None
+    passes = 1 + MEASUREMENT_PASSES * bool(grid.sampling_var.any())
+    for _ in range(passes):
+        state, cov, sum_sq, sum_log, n_terms = _filter(model, grid, candidates, scale)
+        n = n_terms[:, None]
+        scale = (sum_sq + SCALE_PRIOR_WEIGHT * FALLBACK_SD**2 / 10) / (
+            n + SCALE_PRIOR_WEIGHT
+        )
+    loglike = -0.5 * (n * np.log(scale) + sum_sq / scale + sum_log)
+    best = np.argmax(loglike, axis=1)
+    return [
+        (
+            candidates[best[j]],
+            float(scale[j, best[j]]),
+            state[j, best[j]],
+            cov[j, best[j]],
+            int(grid.last_year[j]),
+            float(loglike[j, best[j]]),
+            float(grid.sampling_var[j, -1]),
+        )
+        for j in range(len(series))
+    ]
+
+
+_CACHE: OrderedDict = OrderedDict()
+
+
+def clear_cache() -> None:
+    """Forget all cached fits."""
+    _CACHE.clear()
+
+
+@instrumentation.timed("timeseries.fit")
+def fit_state_space(model: str, series: list[Series]) -> StateSpaceFit:
+    """
+    Fit ``model`` to every ``(years, values)`` series in one batched pass.
+
+    Series already fitted (same model, years, values and standard errors)
+    come from the cache; the rest are fitted together.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}; expected one of {MODELS}")
+    keys = [(model, *(tuple(float(x) for x in column) for column in s)) for s in series]
+    missing = list(dict.fromkeys(key for key in keys if key not in _CACHE))
+    if missing:
+        fitted = _fit_batch(model, [key[1:] for key in missing])
+        for key, row in zip(missing, fitted):
+            _CACHE[key] = row
+    rows = []
+    for key in keys:
+        _CACHE.move_to_end(key)
+        rows.append(_CACHE[key])
+    while len(_CACHE) > max(CACHE_SIZE, len(keys)):
+        _CACHE.popitem(last=False)
+    columns = zip(*rows) if rows else [()] * 7
+    params, scale, state, cov, last_year, loglike, sampling_var = columns
+    k, m = _grid(model).shape[1], 1 if model == "random_walk" else 2
+    return StateSpaceFit(
+        model=model,
+        params=np.array(params).reshape(len(rows), k),
+        scale=np.array(scale, dtype=float),
+        state=np.array(state).reshape(len(rows), m),
+        state_cov=np.array(cov).reshape(len(rows), m, m),
+        last_year=np.array(last_year, dtype=int),
+        loglike=np.array(loglike, dtype=float),
+        sampling_var=np.array(sampling_var, dtype=float),
+    )
+
+
+def precision_weights(
+    resid: np.ndarray, sampling_var: np.ndarray, mask: np.ndarray, n_params: int
+) -> np.ndarray:
+    """
+    Feasible weighted-least-squares weights for padded series, shape (N, T).
+
+    The residual variance of a first, unweighted fit beyond the waves' mean
+    sampling variance is taken as common to all waves. Each wave is then
+    weighted by ``1 / (that + its sampling variance)``, normalized to mean 1
+    over the series' waves. Series without residual degrees of freedom keep
+    their ``mask``.
+
+    Args:
+        resid: Residuals of the unweighted fit, 0 for padding.
+        sampling_var: Squared standard errors of the waves.
+        mask: 1 for waves, 0 for padding.
+        n_params: Parameters of the fit, for the residual degrees of freedom.
+    """
+    n = mask.sum(axis=-1)
+    dof = n - n_params
+    excess = (resid**2 * mask).sum(axis=-1) / np.maximum(dof, 1) - (
+        (sampling_var * mask).sum(axis=-1) / np.maximum(n, 1)
+    )
+    variance = np.maximum(excess, 0.0)[:, None] + np.where(mask, sampling_var, 1.0)
+    precision = mask / variance
+    total = np.maximum(precision.sum(axis=-1, keepdims=True), 1e-300)
+    return np.where(dof[:, None] > 0, n[:, None] * precision / total, mask)
+
+
+def pre_cutoff_series(variable: str, cutoff_year: int) -> Series:
+    """
+    Waves of ``variable`` up to and including ``cutoff_year``, in order.
+
+    Returns ``(years, values, standard_errors)``.
+    """
+    trajectory = HISTORICAL_TRAJECTORIES.get(variable, {})
+    years = sorted(y for y in trajectory if y <= cutoff_year)
+    errors = [standard_error(variable, y) for y in years]
+    return years, [trajectory[y] for y in years], errors
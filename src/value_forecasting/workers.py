@@ -0,0 +1,305 @@
+"""Process pools whose workers start with the data and imports they need.
+
+A plain ``ProcessPoolExecutor`` has two costs here. Each worker imports the
+package, numpy and scipy on its first task. With the spawn and
+forkserver start methods it also only sees the trajectories defined at import
+time, so series registered or revised in the parent never reach it.
+:class:`WorkerPool` handles both:
+
+- trajectories and distributions are packed once into a
+  ``multiprocessing.shared_memory`` block. Each worker installs read-only
+  views of them (:class:`SharedSeries`, :class:`SharedDistributions`) into
+  :mod:`gss_variables` / :mod:`heterogeneity` when it starts, so values are
+  read from the block rather than copied into every process. The variable
+  definitions and sample sizes are pickled into the same block, so the
+  initializer arguments stay a few hundred bytes however much data there is;
+- with the forkserver start method (the default where available) the server
+  process imports :data:`PRELOAD_MODULES` once, so every worker forks with
+  the baselines and scipy already loaded; other start methods import them in
+  the worker initializer;
+- tasks carry only small job descriptors such as ``(variable, cutoff,
+  target_years)``, and ``map`` batches them into chunks so per-task overhead
+  stays well under a millisecond.
+
+    with WorkerPool(4) as pool:
+        results, plan = run_incremental("arima", run_arima_forecast, executor=pool)
+"""
+
+import importlib
+import math
+import multiprocessing
+import pickle
+import threading
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from value_forecasting import gss_variables
+
+# What the baselines import. statsmodels is left out: only ARIMA orders
+# other than the default (1,1,0) use it, and it loads on first use.
+PRELOAD_MODULES = (
+    "numpy",
+    "scipy.special",
+    "scipy.stats",
+    "value_forecasting.baselines",
+    "value_forecasting.timeseries",
+    "value_forecasting.pooled",
+    "value_forecasting.cohort",
+    "value_forecasting.heterogeneity",
+)
+# Chunks per worker when ``map`` picks the chunk size, as multiprocessing.Pool.
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class SharedData:
+    """
+    Picklable handle to data packed by :func:`share_data`.
+
+    The block starts with float64 ``(year, value)`` rows for each trajectory,
+    followed by ``(year, share, ...)`` rows for each distribution. After them
+    come ``objects_size`` bytes of pickled ``(definitions, sample_sizes,
+    item_sample_sizes)``. The handle holds only row ranges and labels.
+    """
+
+    name: str
+    size: int
+    objects_size: int
+    trajectories: dict[str, tuple[int, int, bool]]  # start, stop, integral
+    distributions: dict[str, tuple[int, int, tuple[str, ...], bool]]
+
+
+def _integral(values) -> bool:
+    return all(isinstance(v, int) for v in values)
+
+
+def _number(value: float, integral: bool):
+    return int(value) if integral else float(value)
+
+
+class _SharedRows(Mapping):
+    """Rows of a shared block whose first column is the year, keyed by year."""
+
+    def __init__(self, rows: np.ndarray, integral: bool):
+        self._rows = rows
+        self._integral = integral
+        self._index: dict[int, int] | None = None
+
+    def _lookup(self) -> dict[int, int]:
+        if self._index is None:
+            self._index = {int(y): i for i, y in enumerate(self._rows[:, 0])}
+        return self._index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._lookup())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class SharedSeries(_SharedRows):
+    """Read-only ``{year: value}`` view of one trajectory's rows."""
+
+    def __getitem__(self, year: int):
+        return _number(self._rows[self._lookup()[year], 1], self._integral)
+
+
+class SharedDistributions(_SharedRows):
+    """Read-only ``{year: {category: share}}`` view of one variable's rows."""
+
+    def __init__(self, rows: np.ndarray, categories: tuple[str, ...], integral: bool):
+        super().__init__(rows, integral)
+        self._categories = categories
+
+    def __getitem__(self, year: int) -> dict:
+        row = self._rows[self._lookup()[year], 1:].tolist()
+        return {c: _number(v, self._integral) for c, v in zip(self._categories, row)}
+
+
+def share_data() -> tuple[shared_memory.SharedMemory, SharedData]:
+    """
+    Pack the current trajectories, distributions, definitions and sample
+    sizes into shared memory.
+
+    Returns the block (the caller closes and unlinks it) and its handle.
+    """
+    from value_forecasting.heterogeneity import HISTORICAL_DISTRIBUTIONS
+
+    chunks, trajectories, distributions = [], {}, {}
+    offset = 0
+    for variable, trajectory in gss_variables.HISTORICAL_TRAJECTORIES.items():
+        rows = np.array(sorted(trajectory.items()), dtype=float).reshape(-1)
+        trajectories[variable] = (
+            offset,
+            offset + rows.size,
+            _integral(trajectory.values()),
+        )
+        chunks.append(rows)
+        offset += rows.size
+    for variable, waves in HISTORICAL_DISTRIBUTIONS.items():
+        categories = tuple(dict.fromkeys(c for dist in waves.values() for c in dist))
+        rows = np.array(
+            [[year, *(waves[year].get(c, 0) for c in categories)] for year in waves],
+            dtype=float,
+        ).reshape(-1)
+        integral = all(_integral(dist.values()) for dist in waves.values())
+        distributions[variable] = (offset, offset + rows.size, categories, integral)
+        chunks.append(rows)
+        offset += rows.size
+    objects = pickle.dumps(
+        (
+            dict(gss_variables.GSS_VARIABLES),
+            dict(gss_variables.SAMPLE_SIZES),
+            dict(gss_variables.ITEM_SAMPLE_SIZES),
+        )
+    )
+
+    block = shared_memory.SharedMemory(
+        create=True, size=max(offset * 8 + len(objects), 1)
+    )
+    data = np.ndarray((offset,), dtype=float, buffer=block.buf)
+    data[:] = np.concatenate(chunks) if chunks else []
+    del data  # release the export, so the caller can close the block
+    block.buf[offset * 8 : offset * 8 + len(objects)] = objects
+    handle = SharedData(
+        name=block.name,
+        size=offset,
+        objects_size=len(objects),
+        trajectories=trajectories,
+        distributions=distributions,
+    )
+    return block, handle
+
+
+def load_shared_data(
+    handle: SharedData, block: shared_memory.SharedMemory
+) -> tuple[dict, dict]:
+    """
+    Trajectories and distributions (as the module-level dicts) from a handle.
+
+    The values are read-only views into ``block``, which must stay open
+    while they are in use.
+    """
+    data = np.ndarray((handle.size,), dtype=float, buffer=block.buf)
+    data.flags.writeable = False
+    trajectories = {
+        variable: SharedSeries(data[start:stop].reshape(-1, 2), integral)
+        for variable, (start, stop, integral) in handle.trajectories.items()
+    }
+    distributions = {}
+    for variable, spec in handle.distributions.items():
+        start, stop, categories, integral = spec
+        rows = data[start:stop].reshape(-1, len(categories) + 1)
+        distributions[variable] = SharedDistributions(rows, categories, integral)
+    return trajectories, distributions
+
+
+def load_shared_objects(handle: SharedData, block: shared_memory.SharedMemory):
+    """``(definitions, sample_sizes, item_sample_sizes)`` from a handle."""
+    start = handle.size * 8
+    return pickle.loads(block.buf[start : start + handle.objects_size])
+
+
+def _replace(target: dict, source: dict) -> None:
+    # Modules hold references to these dicts, so update them in place.
+    target.clear()
+    target.update(source)
+
+
+# The worker's attachment to the pool's block. The installed views read from
+# it for the life of the process, so it is never closed.
+_ATTACHED: list[shared_memory.SharedMemory] = []
+
+
+def init_worker(handle: SharedData, preload: tuple[str, ...] = PRELOAD_MODULES):
+    """Pool initializer: install the parent's data and import ``preload``."""
+    from value_forecasting import heterogeneity
+
+    block = shared_memory.SharedMemory(name=handle.name)
+    _ATTACHED.append(block)
+    trajectories, distributions = load_shared_data(handle, block)
+    definitions, sample_sizes, item_sample_sizes = load_shared_objects(handle, block)
+    _replace(gss_variables.HISTORICAL_TRAJECTORIES, trajectories)
+    _replace(heterogeneity.HISTORICAL_DISTRIBUTIONS, distributions)
+    _replace(gss_variables.GSS_VARIABLES, definitions)
+    _replace(gss_variables.SAMPLE_SIZES, sample_sizes)
+    _replace(gss_variables.ITEM_SAMPLE_SIZES, item_sample_sizes)
+    for module in preload:
+        importlib.import_module(module)
+
+
+def default_start_method() -> str:
+    """``forkserver`` where the platform supports it, else ``spawn``."""
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+class WorkerPool(ProcessPoolExecutor):
+    """
+    Process pool with preloaded imports and the parent's data in every worker.
+
+    Args:
+        max_workers: Number of worker processes (default: CPU count).
+        start_method: ``"forkserver"``, ``"spawn"`` or ``"fork"`` (default:
+            :func:`default_start_method`).
+        preload: Modules imported once per worker (once in total for
+            forkserver).
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        start_method: str | None = None,
+        preload: tuple[str, ...] = PRELOAD_MODULES,
+    ):
+        self.start_method = start_method or default_start_method()
+        context = multiprocessing.get_context(self.start_method)
+        if self.start_method == "forkserver":
+            # Only takes effect if the forkserver is not running yet.
+            context.set_forkserver_preload(list(preload))
+        self._block, self.data = share_data()
+        try:
+            super().__init__(
+                max_workers,
+                mp_context=context,
+                initializer=init_worker,
+                initargs=(self.data, tuple(preload)),
+            )
+        except BaseException:
+            self._release()
+            raise
+
+    def map(self, fn, *iterables, timeout=None, chunksize=None):
+        """
+        Like ``Executor.map``; by default, batch tasks into a few chunks per
+        worker so small jobs are not dominated by IPC.
+        """
+        if chunksize is None:
+            iterables = [list(it) for it in iterables]
+            n = min(map(len, iterables), default=0)
+            chunksize = max(1, math.ceil(n / (CHUNKS_PER_WORKER * self._max_workers)))
+        return super().map(fn, *iterables, timeout=timeout, chunksize=chunksize)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        # Workers spawned for queued tasks attach to the block when they
+        # start, so it is unlinked only once every worker has exited.
+        manager = self._executor_manager_thread
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        if wait or manager is None:
+            self._release()
+        else:
+            threading.Thread(target=self._release_after, args=(manager,)).start()
+
+    def _release_after(self, manager: threading.Thread) -> None:
+        manager.join()
+        self._release()
+
+    def _release(self) -> None:
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
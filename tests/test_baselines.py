@@ -1,10 +1,15 @@
 """Tests for time series baseline forecasters."""
 
+import numpy as np
 import pytest
 
+from value_forecasting import gss_variables
 from value_forecasting.baselines import (
+    fit_logistic_curves,
     run_arima_forecast,
     run_ets_forecast,
+    run_logistic_forecast,
+    run_logistic_forecasts,
     run_naive_forecast,
 )
 from value_forecasting.forecaster import Forecast
@@ -71,3 +76,48 @@ class TestETSForecast:
         forecasts = run_ets_forecast("HOMOSEX", 2000, [2010])
         if forecasts:
             assert "ets" in forecasts[0].model.lower()
+
+
+class TestLogisticForecast:
+    """Tests for the logistic diffusion baseline."""
+
+    def test_recovers_known_curves(self):
+        """The batched fit should recover exact S-curves, one per row."""
+        x = np.tile(np.linspace(-3, 0, 10), (3, 1))
+        theta = np.array([[2.0, 0.5, 1.0], [3.0, -1.0, 0.8], [2.5, 0.0, -0.6]])
+        level = 100 / (1 + np.exp(-theta[:, :1]))
+        y = level / (1 + np.exp(-(theta[:, 1:2] + theta[:, 2:] * x)))
+        fitted = fit_logistic_curves(x, y, np.ones_like(x))
+        curve = 100 / (1 + np.exp(-fitted[:, :1]))
+        curve = curve / (1 + np.exp(-(fitted[:, 1:2] + fitted[:, 2:] * x)))
+        # The weak prior shrinks the fit slightly (MAP, not least squares).
+        np.testing.assert_allclose(curve, y, atol=1.0)
+
+    def test_bounds_within_range(self):
+        """Point forecasts and intervals should stay in [0, 100]."""
+        forecasts = run_logistic_forecast("HOMOSEX", 2010, [2020, 2040, 2060])
+        assert [f.model for f in forecasts] == ["logistic_diffusion"] * 3
+        for f in forecasts:
+            assert 0 <= f.lower_bound <= f.point_estimate <= f.upper_bound <= 100
+
+    def test_batch_matches_single_jobs(self):
+        """Fitting jobs together should not change their point forecasts."""
+        jobs = [("HOMOSEX", 2000, [2010]), ("GRASS", 1990, [2000, 2010])]
+        batched = run_logistic_forecasts(jobs)
+        single = [f for job in jobs for f in run_logistic_forecasts([job])]
+        assert [f.point_estimate for f in batched] == pytest.approx(
+            [f.point_estimate for f in single], abs=1e-3
+        )
+
+    def test_needs_bootstrap_samples(self):
+        """n_bootstrap=0 should be rejected up front."""
+        with pytest.raises(ValueError, match="n_bootstrap"):
+            run_logistic_forecasts([("HOMOSEX", 2000, [2010])], n_bootstrap=0)
+
+    def test_skips_short_series(self, monkeypatch):
+        """Series with fewer than two waves before the cutoff get no forecast."""
+        monkeypatch.setitem(
+            gss_variables.HISTORICAL_TRAJECTORIES, "ONEWAVE", {1990: 40, 2000: 50}
+        )
+        assert run_logistic_forecast("ONEWAVE", 1995, [2000]) == []
+        assert len(run_logistic_forecast("ONEWAVE", 2000, [2010])) == 1
@@ -0,0 +1,119 @@
+"""Tests for dry-run budget estimates."""
+
+from dataclasses import replace
+
+import pytest
+
+from value_forecasting import models
+from value_forecasting.budget import estimate_budget
+from value_forecasting.forecaster import (
+    create_forecast_prompt,
+    create_packed_prompt,
+    create_system_prompt,
+)
+from value_forecasting.heterogeneity import (
+    create_distribution_prompt,
+    create_distribution_system_prompt,
+    create_distributions_prompt,
+)
+from value_forecasting.planning import estimate_tokens
+
+JOBS = [
+    ("HOMOSEX", 1990, [2000, 2010, 2018]),
+    ("HOMOSEX", 2000, [2010, 2018]),
+    ("GRASS", 1980, [2000, 2018]),
+    ("GRASS", 2010, [2018]),
+]
+
+
+class TestEstimateBudget:
+    """Tests for projecting tokens, cost and wall-clock time."""
+
+    def test_matches_rendered_prompts(self):
+        """Input tokens should equal the estimate for every rendered prompt."""
+        budget = estimate_budget(JOBS, "gpt-3.5-turbo")
+        expected = sum(
+            estimate_tokens(create_system_prompt(cutoff))
+            + estimate_tokens(create_forecast_prompt(variable, cutoff, targets))
+            for variable, cutoff, targets in JOBS
+        )
+        assert budget.calls == len(JOBS)
+        assert budget.input_tokens == expected
+
+    def test_distribution_calls_per_target_year(self):
+        """Distribution forecasts should take one call per target year."""
+        budget = estimate_budget(JOBS, "gpt-3.5-turbo", kind="distribution")
+        expected = sum(
+            estimate_tokens(create_distribution_system_prompt(cutoff))
+            + estimate_tokens(create_distribution_prompt(variable, cutoff, target))
+            for variable, cutoff, targets in JOBS
+            for target in targets
+        )
+        assert budget.calls == 8
+        assert budget.input_tokens == expected
+
+    def test_multi_year_distributions(self):
+        """Multi-year distribution forecasts should take one call per job."""
+        single = estimate_budget(JOBS, "gpt-3.5-turbo", kind="distribution")
+        multi = estimate_budget(JOBS, "gpt-3.5-turbo", kind="distributions")
+        expected = sum(
+            estimate_tokens(create_distribution_system_prompt(cutoff))
+            + estimate_tokens(create_distributions_prompt(variable, cutoff, targets))
+            for variable, cutoff, targets in JOBS
+        )
+        assert multi.calls == len(JOBS)
+        assert multi.input_tokens == expected < single.input_tokens
+        assert multi.output_tokens == single.output_tokens - 4 * 80
+
+    def test_packed(self):
+        """Packed calls should share one prompt per cutoff and target years."""
+        jobs = [(v, 2000, [2010, 2018]) for v in ("HOMOSEX", "GRASS", "FEPOL")]
+        packed = estimate_budget(jobs, "gpt-3.5-turbo", kind="packed", pack_size=2)
+        system = estimate_tokens(create_system_prompt(2000))
+        expected = 2 * system + estimate_tokens(
+            create_packed_prompt(["HOMOSEX", "GRASS"], 2000, [2010, 2018])
+        )
+        expected += estimate_tokens(create_forecast_prompt("FEPOL", 2000, [2010, 2018]))
+        assert packed.calls == 2
+        assert packed.input_tokens == expected
+        isolated = estimate_budget(jobs, "gpt-3.5-turbo")
+        assert packed.input_tokens < isolated.input_tokens
+
+    def test_tokenizer(self):
+        """A custom tokenizer should be applied to every prompt piece."""
+        words = estimate_budget(JOBS, "gpt-3.5-turbo", tokenizer=lambda s: s.count(" "))
+        expected = sum(
+            create_system_prompt(cutoff).count(" ")
+            + create_forecast_prompt(variable, cutoff, targets).count(" ")
+            for variable, cutoff, targets in JOBS
+        )
+        assert words.input_tokens == expected
+
+    def test_cost_and_batch_discount(self):
+        """Cost should follow the model's prices, halved on the batch API."""
+        budget = estimate_budget(JOBS, "claude-sonnet-4-20250514")
+        expected = (budget.input_tokens * 3 + budget.output_tokens * 15) / 1e6
+        assert budget.cost == pytest.approx(expected)
+        batch = estimate_budget(JOBS, "claude-sonnet-4-20250514", batch=True)
+        assert batch.cost == pytest.approx(expected / 2)
+
+    def test_wall_time_limits(self, monkeypatch):
+        """The tightest of concurrency and rate limits should set the time."""
+        budget = estimate_budget(JOBS, "gpt-3.5-turbo", concurrency=2, latency=3)
+        assert budget.limited_by == "concurrency"
+        assert budget.min_wall_time == pytest.approx(4 * 3 / 2)
+        claude = models.get_model("claude-sonnet-4-20250514")
+        budget = estimate_budget(JOBS * 100, claude.name, concurrency=100, latency=1)
+        assert budget.limited_by == "requests per minute"
+        assert budget.min_wall_time == pytest.approx(400 / 50 * 60)
+        monkeypatch.setitem(
+            models.MODELS, claude.name, replace(claude, tokens_per_minute=10_000)
+        )
+        budget = estimate_budget(JOBS * 100, claude.name, concurrency=100, latency=1)
+        assert budget.limited_by == "tokens per minute"
+        assert budget.min_wall_time == pytest.approx(budget.total_tokens / 10_000 * 60)
+
+    def test_rejects_unknown_kind(self):
+        """Only forecast and distribution prompts can be estimated."""
+        with pytest.raises(ValueError, match="Unknown kind"):
+            estimate_budget(JOBS, "gpt-3.5-turbo", kind="logprobs")
@@ -0,0 +1,195 @@
+"""Tests for the value-forecasting command line."""
+
+import json
+
+import pytest
+
+from value_forecasting.cli import main
+from value_forecasting.export import iter_results_json
+from value_forecasting.mock_llm import MockConfig, MockLLMServer
+
+
+def run(capsys, *argv):
+    assert main(list(argv)) == 0
+    return capsys.readouterr().out
+
+
+class TestBaseline:
+    """Tests for the baseline command."""
+
+    def test_writes_results(self, tmp_path, capsys):
+        """Results should be saved in the requested format and read back."""
+        output = tmp_path / "linear.jsonl"
+        out = run(capsys, "baseline", "--method", "linear", "-o", str(output))
+        results = list(iter_results_json(output))
+        assert len(results) == 32
+        assert "32 new; 4 forecast calls" in out
+
+    def test_resume_reuses_cache(self, tmp_path, capsys):
+        """--resume should skip jobs already in the cache directory."""
+        common = ["baseline", "--cache-dir", str(tmp_path / "cache")]
+        common += ["-o", str(tmp_path / "out.json")]
+        run(capsys, *common)
+        assert "0 forecast calls" in run(capsys, *common, "--resume")
+        assert "4 forecast calls" in run(capsys, *common)
+
+    def test_worker_processes(self, tmp_path, capsys):
+        """Fitting across worker processes should give the same results."""
+        serial, parallel = tmp_path / "serial.json", tmp_path / "parallel.json"
+        run(capsys, "baseline", "--method", "naive", "-o", str(serial))
+        run(
+            capsys,
+            "baseline",
+            "--method",
+            "naive",
+            "--workers",
+            "2",
+            "-o",
+            str(parallel),
+        )
+        assert list(iter_results_json(serial)) == list(iter_results_json(parallel))
+
+    def test_parquet(self, tmp_path, capsys):
+        """Parquet output should round-trip through iter_results_json."""
+        pytest.importorskip("pyarrow")
+        output = tmp_path / "linear.parquet"
+        run(capsys, "baseline", "--variables", "GRASS", "-o", str(output))
+        results = list(iter_results_json(output))
+        assert {r.variable for r in results} == {"GRASS"}
+
+    def test_resume_needs_cache_dir(self, capsys):
+        """--resume without --cache-dir should be a usage error."""
+        with pytest.raises(SystemExit):
+            main(["baseline", "--resume"])
+
+
+class TestForecast:
+    """Tests for the forecast command."""
+
+    def test_concurrent_calls_against_mock(self, tmp_path, capsys):
+        """Concurrent LLM calls should cover every job once."""
+        output = tmp_path / "llm.json"
+        with MockLLMServer(MockConfig(seed=0)) as server:
+            run(
+                capsys,
+                "forecast",
+                "--base-url",
+                server.anthropic_base_url,
+                "--concurrency",
+                "4",
+                "--contamination",
+                "flag",
+                "-o",
+                str(output),
+            )
+            assert server.stats.by_endpoint == {"/v1/messages": 4}
+        assert len(list(iter_results_json(output))) == 32
+
+    def test_skips_contaminated_years(self, tmp_path, capsys):
+        """Years inside the model's training data should never be requested."""
+        output = tmp_path / "llm.json"
+        with MockLLMServer(MockConfig(seed=0)) as server:
+            out = run(
+                capsys,
+                "forecast",
+                "--base-url",
+                server.anthropic_base_url,
+                "--cutoffs",
+                "2000",
+                "-o",
+                str(output),
+            )
+            assert server.stats.requests == 0
+        assert "contaminated target years skipped" in out
+        assert list(iter_results_json(output)) == []
+
+    def test_flags_contaminated_years(self, tmp_path, capsys):
+        """Flagged years should be forecast but kept out of the clean group."""
+        output = tmp_path / "llm.json"
+        with MockLLMServer(MockConfig(seed=0)) as server:
+            run(
+                capsys,
+                "forecast",
+                "--base-url",
+                server.anthropic_base_url,
+                "--cutoffs",
+                "2000",
+                "--contamination",
+                "flag",
+                "-o",
+                str(output),
+            )
+            assert server.stats.requests == 2
+        groups = json.loads(output.read_text())
+        model = "claude-sonnet-4-20250514"
+        assert groups[model] == []
+        flagged = groups[f"{model}_contaminated"]
+        assert flagged and {r["cutoff_year"] for r in flagged} == {2000}
+
+    def test_routed_forecasts(self, tmp_path, capsys):
+        """--route should only forecast years some model cannot have seen."""
+        output = tmp_path / "routed.json"
+        with MockLLMServer(MockConfig(seed=0)) as server:
+            run(
+                capsys,
+                "forecast",
+                "--route",
+                "cost",
+                "--base-url",
+                server.url,
+                "--cutoffs",
+                "2000",
+                "-o",
+                str(output),
+            )
+        results = list(iter_results_json(output))
+        assert {r.model for r in results} == {"davinci-002", "gpt-3.5-turbo"}
+        assert min(r.target_year for r in results) == 2021
+
+    def test_dry_run(self, tmp_path, capsys):
+        """--dry-run should project the sweep without calling the API."""
+        with MockLLMServer(MockConfig(seed=0)) as server:
+            out = run(
+                capsys,
+                "forecast",
+                "--dry-run",
+                "--base-url",
+                server.anthropic_base_url,
+                "-o",
+                str(tmp_path / "llm.json"),
+            )
+            assert server.stats.requests == 0
+        # Every target year up to 2021 is inside the model's training data.
+        assert out.startswith("claude-sonnet-4-20250514: 0 calls")
+        assert "0 forecast calls, 4 calls and ~" in out
+        assert not (tmp_path / "llm.json").exists()
+
+    def test_dry_run_flag_budgets_every_call(self, capsys):
+        """With --contamination flag, contaminated calls are still budgeted."""
+        out = run(capsys, "forecast", "--dry-run", "--contamination", "flag")
+        assert out.startswith("claude-sonnet-4-20250514: 4 calls")
+
+
+class TestEvaluateAndExport:
+    """Tests for the evaluate and export commands."""
+
+    def test_evaluate_groups(self, tmp_path, capsys):
+        """evaluate should report and save metrics per group."""
+        results = tmp_path / "linear.json"
+        run(capsys, "baseline", "-o", str(results))
+        metrics = tmp_path / "metrics.json"
+        out = run(
+            capsys, "evaluate", str(results), "--by", "variable", "-o", str(metrics)
+        )
+        assert "HOMOSEX:" in out
+        rows = json.loads(metrics.read_text())
+        assert [r["variable"] for r in rows] == ["GRASS", "HOMOSEX"]
+        assert sum(r["n_forecasts"] for r in rows) == 32
+
+    def test_export(self, tmp_path, capsys):
+        """export should write the web app data directory."""
+        results = tmp_path / "linear.json"
+        run(capsys, "baseline", "-o", str(results))
+        out = run(capsys, "export", str(results), str(tmp_path / "data"))
+        assert "Exported 32 results for 2 variables" in out
+        assert (tmp_path / "data" / "manifest.json").exists()
@@ -0,0 +1,140 @@
+"""Tests for the cohort-replacement baseline."""
+
+import numpy as np
+import pytest
+
+from value_forecasting import cohort
+from value_forecasting.cohort import (
+    LifeTable,
+    cohort_rates,
+    cohort_rates_from_microdata,
+    cohort_rates_from_tables,
+    implied_cohort_rates,
+    project_cohort_support,
+    run_cohort_forecast,
+    run_cohort_forecasts,
+)
+
+
+def synthetic_microdata(n=20000, seed=0):
+    """Respondents whose support rises with birth year, with no period effect."""
+    rng = np.random.default_rng(seed)
+    year = rng.choice([1994, 1996, 1998, 2000], n)
+    birth_year = year - rng.integers(18, 90, n)
+    share = np.clip(0.2 + 0.008 * (birth_year - 1930), 0, 1)
+    liberal = (rng.random(n) < share).astype(int)
+    return year, birth_year, liberal
+
+
+class TestLifeTable:
+    """Tests for the population projection."""
+
+    def test_population_shares(self):
+        """Shares should sum to one and fall with age in a stationary population."""
+        births = np.arange(1880, 2003)
+        shares = LifeTable.gompertz().population([2000, 2020], births)
+        np.testing.assert_allclose(shares.sum(axis=1), 1.0)
+        adults = shares[0, (births >= 1901) & (births <= 1982)]
+        assert np.all(adults > 0) and np.all(np.diff(adults) >= 0)
+        assert shares[0, births > 1982].sum() == 0
+
+
+class TestCohortRates:
+    """Tests for the sources of cohort support rates."""
+
+    def test_microdata_recovers_gradient(self):
+        """Rates by birth decade should follow the simulated cohort gradient."""
+        year, birth_year, liberal = synthetic_microdata()
+        rates = cohort_rates_from_microdata(
+            ["X"] * len(year), year, birth_year, liberal, 2000
+        )
+        expected = 100 * np.clip(0.2 + 0.008 * (rates.cohorts + 4.5 - 1930), 0, 1)
+        observed = (rates.cohorts >= 1910) & (rates.cohorts <= 1970)
+        np.testing.assert_allclose(
+            rates.support[0, observed], expected[observed], atol=4
+        )
+        assert np.all(np.diagonal(rates.cov[0]) > 0)
+
+    def test_tables_fill_missing_bins(self, monkeypatch):
+        """Bins without table entries should take the nearest bin's rate."""
+        monkeypatch.setitem(
+            cohort.COHORT_SUPPORT, "HOMOSEX", {1998: {1930: 10, 1950: 20, 1970: 40}}
+        )
+        rates = cohort_rates_from_tables(2000, ["HOMOSEX", "GRASS"])
+        assert rates.variables == ["HOMOSEX"]
+        assert rates.support[0, 0] == 10 and rates.support[0, -1] == 40
+
+    def test_registered_microdata_preferred(self, monkeypatch):
+        """Registered microdata should take precedence over tables and trends."""
+        year, birth_year, liberal = synthetic_microdata()
+        monkeypatch.setitem(
+            cohort.COHORT_MICRODATA,
+            "HOMOSEX",
+            {"year": year, "birth_year": birth_year, "liberal": liberal},
+        )
+        monkeypatch.setitem(cohort.COHORT_SUPPORT, "HOMOSEX", {1998: {1950: 20}})
+        rates = cohort_rates(2000, ["HOMOSEX", "GRASS"])
+        direct = cohort_rates_from_microdata(
+            ["HOMOSEX"] * len(year), year, birth_year, liberal, 2000
+        )
+        assert rates.variables == ["HOMOSEX", "GRASS"]
+        assert rates.source == ["microdata", "implied"]
+        np.testing.assert_allclose(rates.support[0], direct.support[0])
+        (forecast,) = run_cohort_forecast("HOMOSEX", 2000, [2010])
+        assert "microdata rates" in forecast.raw_response
+
+    def test_fingerprint_covers_microdata(self, monkeypatch):
+        """Registering microdata should change the cache fingerprint."""
+        before = cohort.cohort_fingerprint("HOMOSEX", 2000)
+        year, birth_year, liberal = synthetic_microdata(n=100)
+        monkeypatch.setitem(
+            cohort.COHORT_MICRODATA,
+            "HOMOSEX",
+            {"year": year, "birth_year": birth_year, "liberal": liberal},
+        )
+        assert cohort.cohort_fingerprint("HOMOSEX", 2000) != before
+
+    def test_implied_rates_follow_trend(self):
+        """A rising aggregate should imply support rising with birth year."""
+        rates = implied_cohort_rates(2000, ["HOMOSEX", "CAPPUN"])
+        slopes = np.diff(rates.support, axis=1).mean(axis=1)
+        assert slopes[0] > 0 > slopes[1]
+
+
+class TestProjection:
+    """Tests for projecting aggregate support."""
+
+    def test_replacement_raises_support(self):
+        """Replacing older cohorts by more liberal ones should raise support."""
+        year, birth_year, liberal = synthetic_microdata()
+        rates = cohort_rates_from_microdata(
+            ["X"] * len(year), year, birth_year, liberal, 2000
+        )
+        point, lower, upper = project_cohort_support(rates, [2010, 2030, 2060])
+        assert np.all(np.diff(point[0]) > 0)
+        # The aggregate approaches the youngest cohort's rate from below.
+        assert point[0, -1] <= rates.support[0, -1] + 1
+        assert np.all(lower <= point) and np.all(point <= upper)
+
+    def test_forecasts_for_every_variable(self):
+        """Batched forecasts should match one-variable runs."""
+        jobs = [("HOMOSEX", 2000, [2010, 2018]), ("GRASS", 1990, [2000])]
+        batched = run_cohort_forecasts(jobs)
+        single = [f for job in jobs for f in run_cohort_forecast(*job)]
+        assert [f.model for f in batched] == ["cohort_replacement"] * 3
+        assert [f.point_estimate for f in batched] == pytest.approx(
+            [f.point_estimate for f in single]
+        )
+        for f in batched:
+            assert 0 <= f.lower_bound <= f.point_estimate <= f.upper_bound <= 100
+
+    def test_no_target_years(self):
+        """An empty target list should give no forecasts, like other baselines."""
+        assert run_cohort_forecast("HOMOSEX", 2000, []) == []
+        rates = implied_cohort_rates(2000, ["HOMOSEX"])
+        point, lower, upper = project_cohort_support(rates, [])
+        assert point.shape == lower.shape == upper.shape == (1, 0)
+
+    def test_skips_series_without_data(self):
+        """Variables with neither tables nor two waves get no forecasts."""
+        assert run_cohort_forecast("HOMOSEX", 1975, [1990]) == []
@@ -0,0 +1,97 @@
+"""Tests for compositional (simplex-aware) distribution forecasting."""
+
+import numpy as np
+import pytest
+
+from value_forecasting.compositional import (
+    alr,
+    fit_log_ratio_trends,
+    forecast_distribution_compositional,
+    forecast_distributions_compositional,
+    inverse_alr,
+)
+from value_forecasting.heterogeneity import DistributionForecast
+
+
+class TestLogRatioTransforms:
+    """Tests for the ALR transform pair."""
+
+    def test_round_trip(self):
+        """inverse_alr should undo alr."""
+        comp = np.array([[0.2, 0.3, 0.5], [0.7, 0.2, 0.1]])
+        np.testing.assert_allclose(inverse_alr(alr(comp)), comp)
+
+
+class TestFitLogRatioTrends:
+    """Tests for the batched ALR trend fit."""
+
+    def test_recovers_exact_trend(self):
+        """A noiseless log-linear share should give an exact slope."""
+        years = np.array([[2000.0, 2010.0, 2020.0]])
+        logit = 0.1 * (years - 2010)
+        share = 1 / (1 + np.exp(-logit))
+        comps = np.stack([share, 1 - share], axis=-1)
+        fit = fit_log_ratio_trends(years, comps, np.ones_like(years, dtype=bool))
+        assert fit["slope"][0, 0] == pytest.approx(0.1)
+
+    def test_masked_waves_ignored(self):
+        """Masked waves should not change the fit."""
+        years = np.array([[2000.0, 2010.0, 2020.0, 0.0]])
+        comps = np.array([[[30, 70], [40, 60], [50, 50], [99, 1]]], dtype=float)
+        mask = np.array([[True, True, True, False]])
+        full = fit_log_ratio_trends(years[:, :3], comps[:, :3], mask[:, :3])
+        masked = fit_log_ratio_trends(years, comps, mask)
+        np.testing.assert_allclose(masked["slope"], full["slope"])
+
+
+class TestForecastDistributionCompositional:
+    """Tests for compositional distribution forecasts."""
+
+    def test_returns_distribution_forecast(self):
+        """Should return a DistributionForecast with every category."""
+        result = forecast_distribution_compositional("HOMOSEX", 2010, 2018)
+        assert isinstance(result, DistributionForecast)
+        assert len(result.distribution) == 5
+        assert result.model == "alr_distribution"
+
+    def test_point_forecast_sums_to_100(self):
+        """Point forecasts should lie exactly on the simplex."""
+        result = forecast_distribution_compositional("GRASS", 2018, 2030)
+        assert sum(result.distribution.values()) == pytest.approx(100.0)
+        assert all(v > 0 for v in result.distribution.values())
+
+    def test_intervals_contain_point_forecast(self):
+        """Intervals should bracket the point forecast and stay in [0, 100]."""
+        result = forecast_distribution_compositional("HOMOSEX", 2018, 2024)
+        for category, (lower, upper) in result.distribution_ci.items():
+            assert 0 <= lower <= result.distribution[category] <= upper <= 100
+
+    def test_deterministic_with_seed(self):
+        """The same seed should give the same intervals."""
+        a = forecast_distribution_compositional("GRASS", 2010, 2018, seed=1)
+        b = forecast_distribution_compositional("GRASS", 2010, 2018, seed=1)
+        assert a.distribution_ci == b.distribution_ci
+
+    def test_single_wave_falls_back_to_naive(self):
+        """With one wave the last distribution should be returned."""
+        result = forecast_distribution_compositional("HOMOSEX", 1990, 2000)
+        assert result.model == "naive_distribution"
+
+    def test_no_data_raises(self):
+        """Should raise when there is no distribution data."""
+        with pytest.raises(ValueError):
+            forecast_distribution_compositional("HOMOSEX", 1980, 2000)
+
+
+class TestBatchedForecasts:
+    """Tests for the batched engine."""
+
+    def test_batch_matches_single(self):
+        """Batched point forecasts should equal one-at-a-time forecasts."""
+        jobs = [("HOMOSEX", 2010, 2018), ("GRASS", 2000, 2010), ("GRASS", 2010, 2030)]
+        batched = forecast_distributions_compositional(jobs)
+        for job, result in zip(jobs, batched):
+            single = forecast_distribution_compositional(*job)
+            assert (result.variable, result.cutoff_year, result.target_year) == job
+            for category, value in single.distribution.items():
+                assert result.distribution[category] == pytest.approx(value)
@@ -4,6 +4,7 @@ import pytest
 
 from value_forecasting.evaluation import (
     calculate_calibration,
+    calculate_crps,
     calculate_mae,
     calculate_coverage,
     ForecastResult,
@@ -107,3 +108,26 @@ class TestCalculateCalibration:
         calibration = calculate_calibration(results, target_coverage=0.90)
         # 0% coverage vs 90% target = very overconfident
         assert calibration > 0.5
+
+
+class TestCalculateCRPS:
+    """Tests for CRPS over percentage bins."""
+
+    def test_point_mass_at_actual(self):
+        """A point mass on the actual value should score 0."""
+        probs = [0.0] * 101
+        probs[40] = 1.0
+        assert calculate_crps(probs, 40) == pytest.approx(0.0)
+
+    def test_point_mass_distance(self):
+        """A point mass k points away should score k."""
+        probs = [0.0] * 101
+        probs[30] = 1.0
+        assert calculate_crps(probs, 40) == pytest.approx(10.0)
+
+    def test_spread_beats_wrong_point_mass(self):
+        """A spread forecast should beat a confident wrong one."""
+        wrong = [0.0] * 101
+        wrong[20] = 1.0
+        spread = [1 / 101] * 101
+        assert calculate_crps(spread, 40) < calculate_crps(wrong, 40)
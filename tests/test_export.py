@@ -0,0 +1,82 @@
+"""Tests for the chunked web app export."""
+
+import json
+
+import pytest
+
+from value_forecasting.evaluation import ForecastResult, evaluate_model
+from value_forecasting.export import export_results, iter_results_json, main
+from value_forecasting.gss_variables import HISTORICAL_TRAJECTORIES
+
+RESULTS = [
+    ForecastResult("HOMOSEX", 2000, 2010, 35.0, 41.0, 25.0, 45.0, "linear"),
+    ForecastResult("HOMOSEX", 2000, 2018, 38.0, 58.0, 26.0, 50.0, "linear"),
+    ForecastResult("HOMOSEX", 2000, 2010, 42.0, 41.0, 35.0, 50.0, "claude"),
+    ForecastResult("GRASS", 2000, 2010, 30.123, 44.0, 7.2, 52.7, "linear"),
+    ForecastResult("GRASS", 2000, 2018, 48.0, 61.0, 38.0, 58.0, "claude"),
+]
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class TestExportResults:
+    """Tests for export_results."""
+
+    def test_chunks_per_variable(self, tmp_path):
+        """Each variable should get its own chunks, split at chunk_rows."""
+        manifest = export_results(RESULTS, tmp_path, chunk_rows=2)
+        homosex = manifest["variables"]["HOMOSEX"]
+        assert homosex["rows"] == 3
+        assert len(homosex["chunks"]) == 2
+        assert homosex["models"] == ["claude", "linear"]
+        assert read_json(tmp_path / "manifest.json") == manifest
+
+    def test_chunks_are_columnar(self, tmp_path):
+        """Chunks should hold rounded column arrays."""
+        manifest = export_results(RESULTS, tmp_path)
+        chunk = read_json(tmp_path / manifest["variables"]["GRASS"]["chunks"][0])
+        assert chunk["predicted"] == [30.12, 48.0]
+        assert chunk["model"] == ["linear", "claude"]
+
+    def test_aggregates_match_evaluate_model(self, tmp_path):
+        """Precomputed metrics should equal evaluate_model's."""
+        export_results(iter(RESULTS), tmp_path)
+        aggregates = read_json(tmp_path / "aggregates.json")
+        linear = [r for r in RESULTS if r.model == "linear"]
+        assert aggregates["models"]["linear"] == pytest.approx(evaluate_model(linear))
+        assert aggregates["by_variable"]["GRASS"]["claude"]["n_forecasts"] == 1
+
+    def test_historical_from_source(self, tmp_path):
+        """Historical series should come from HISTORICAL_TRAJECTORIES."""
+        export_results(RESULTS, tmp_path)
+        historical = read_json(tmp_path / "historical.json")
+        years = {p["year"]: p["value"] for p in historical["HOMOSEX"]["data"]}
+        assert years == HISTORICAL_TRAJECTORIES["HOMOSEX"]
+
+    def test_replaces_old_chunks(self, tmp_path):
+        """Re-exporting should not leave stale chunks behind."""
+        export_results(RESULTS, tmp_path, chunk_rows=1)
+        export_results(RESULTS[:1], tmp_path)
+        assert len(list((tmp_path / "forecasts").rglob("*.json"))) == 1
+
+
+class TestIterResultsJson:
+    """Tests for reading saved results."""
+
+    def test_reads_run_experiment_output(self, tmp_path):
+        """Should read the grouped JSON written by run_experiment.main."""
+        path = tmp_path / "forecasts.json"
+        rows = [vars(r) for r in RESULTS]
+        path.write_text(json.dumps({"baseline": rows[:2], "llm": rows[2:]}))
+        assert list(iter_results_json(path)) == RESULTS
+
+    def test_cli(self, tmp_path, capsys):
+        """The command line entry point should export a JSONL file."""
+        path = tmp_path / "forecasts.jsonl"
+        path.write_text("\n".join(json.dumps(vars(r)) for r in RESULTS))
+        main([str(path), str(tmp_path / "out")])
+        assert (tmp_path / "out" / "manifest.json").exists()
+        assert "Exported 5 results" in capsys.readouterr().out
@@ -2,10 +2,14 @@
 
 import pytest
 
+from value_forecasting import gss_variables
 from value_forecasting.forecaster import (
     Forecast,
     create_forecast_prompt,
+    create_packed_prompt,
     extract_predictions,
+    packed_forecasts_from_response,
+    packs,
     run_baseline_forecast,
 )
 
@@ -54,6 +58,38 @@ class TestCreateForecastPrompt:
         assert "confidence" in prompt.lower() or "interval" in prompt.lower()
 
 
+class TestPackedPrompt:
+    """Tests for prompts covering several variables."""
+
+    def test_includes_every_context(self):
+        """Each variable's labelled history should appear once."""
+        prompt = create_packed_prompt(["HOMOSEX", "GRASS"], 2000, [2010])
+        for variable in ("HOMOSEX", "GRASS"):
+            context = gss_variables.get_historical_context(variable, 2000)
+            assert prompt.count(f"Variable: {variable}\n{context}") == 1
+        assert "Variables to predict: ['HOMOSEX', 'GRASS']" in prompt
+
+    def test_packs(self):
+        """Variables should be split in order into packs of pack_size."""
+        assert packs(["A", "B", "C"], 2) == [["A", "B"], ["C"]]
+        assert packs(["A", "B", "C"]) == [["A", "B", "C"]]
+        with pytest.raises(ValueError, match="pack_size"):
+            packs(["A"], 0)
+
+    def test_parses_per_variable(self):
+        """Each variable should get its own forecasts, even if none parse."""
+        raw = (
+            '{"predictions": {"HOMOSEX": [{"year": 2010, "estimate": 45, '
+            '"lower": 38, "upper": 52}, {"year": 2018}], "GRASS": "n/a"}}'
+        )
+        forecasts = packed_forecasts_from_response(
+            raw, ["HOMOSEX", "GRASS", "FEPOL"], 2000, "claude"
+        )
+        assert list(forecasts) == ["HOMOSEX", "GRASS", "FEPOL"]
+        assert [f.point_estimate for f in forecasts["HOMOSEX"]] == [45]
+        assert forecasts["GRASS"] == forecasts["FEPOL"] == []
+
+
 class TestExtractPredictions:
     """Tests for JSON extraction from model responses."""
 
@@ -112,6 +148,19 @@ class TestBaselineForecast:
         forecasts = run_baseline_forecast("HOMOSEX", 2000, [2010])
         assert forecasts[0].model == "linear_extrapolation"
 
+    def test_imprecise_waves_count_less(self, monkeypatch):
+        """A wave from a tiny sample should barely move the weighted trend."""
+        monkeypatch.setitem(
+            gss_variables.HISTORICAL_TRAJECTORIES,
+            "NEWVAR",
+            {1980: 10, 1990: 20, 2000: 30, 2005: 60, 2010: 40},
+        )
+        before = run_baseline_forecast("NEWVAR", 2010, [2020])[0]
+        monkeypatch.setitem(gss_variables.ITEM_SAMPLE_SIZES, "NEWVAR", {2005: 10})
+        after = run_baseline_forecast("NEWVAR", 2010, [2020])[0]
+        # Without the 2005 outlier the line is 10 + (year - 1980), i.e. 50.
+        assert abs(after.point_estimate - 50) < abs(before.point_estimate - 50)
+
     def test_returns_empty_for_insufficient_data(self):
         """Should return empty if not enough historical data."""
         # This tests edge case handling
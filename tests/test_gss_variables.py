@@ -2,10 +2,13 @@
 
 import pytest
 
+from value_forecasting import gss_variables
 from value_forecasting.gss_variables import (
     GSS_VARIABLES,
     HISTORICAL_TRAJECTORIES,
     get_historical_context,
+    sample_size,
+    standard_error,
 )
 
 
@@ -64,6 +67,29 @@ class TestHistoricalTrajectories:
                 assert 0 <= value <= 100, f"{var_name} {year}: {value} not a valid %"
 
 
+class TestSampleSizes:
+    """Tests for sample sizes and standard errors."""
+
+    def test_every_wave_has_a_sample_size(self):
+        """Every trajectory year should be in the sample size table."""
+        for trajectory in HISTORICAL_TRAJECTORIES.values():
+            assert set(trajectory) <= set(gss_variables.SAMPLE_SIZES)
+
+    def test_item_sample_sizes_take_precedence(self, monkeypatch):
+        """Item counts should replace the survey total and widen the SE."""
+        before = standard_error("HOMOSEX", 2000)
+        monkeypatch.setitem(gss_variables.ITEM_SAMPLE_SIZES, "HOMOSEX", {2000: 704})
+        assert sample_size("HOMOSEX", 2000) == 704
+        assert sample_size("HOMOSEX", 2010) == gss_variables.SAMPLE_SIZES[2010]
+        assert standard_error("HOMOSEX", 2000) == pytest.approx(2 * before, rel=0.01)
+
+    def test_standard_error_is_binomial(self):
+        """The SE should be that of a proportion, inflated by the design effect."""
+        p, n = 0.27, gss_variables.SAMPLE_SIZES[2000]
+        expected = 100 * (gss_variables.DESIGN_EFFECT * p * (1 - p) / n) ** 0.5
+        assert standard_error("HOMOSEX", 2000) == pytest.approx(expected)
+
+
 class TestGetHistoricalContext:
     """Tests for context generation function."""
 
@@ -84,6 +110,12 @@ class TestGetHistoricalContext:
         assert "1990:" in context or "1990 " in context
         assert "2010" not in context
 
+    def test_includes_sample_sizes(self):
+        """Each wave should show its number of respondents and SE."""
+        context = get_historical_context("HOMOSEX", 2000)
+        se = standard_error("HOMOSEX", 2000)
+        assert f"- 2000: 27% (n=2,817, SE {se:.1f})" in context
+
     def test_raises_for_unknown_variable(self):
         """Should raise ValueError for unknown variables."""
         with pytest.raises(ValueError):
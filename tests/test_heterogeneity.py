@@ -1,11 +1,15 @@
 """Tests for heterogeneity (distribution) forecasting."""
 
+import json
+
 import pytest
 
 from value_forecasting.heterogeneity import (
     DistributionForecast,
+    distributions_from_response,
     forecast_distribution,
     forecast_distribution_llm,
+    validate_distribution,
 )
 
 
@@ -92,3 +96,59 @@ class TestForecastDistributionLLM:
         result = forecast_distribution_llm("HOMOSEX", 2000, 2010)
         total = sum(result.distribution.values())
         assert total == pytest.approx(100.0, abs=5.0)  # Allow some slack for LLM
+
+
+class TestMultiYearDistributions:
+    """Tests for parsing and validating multi-year distribution responses."""
+
+    RESPONSES = ["Legal", "Not legal", "Other/DK"]
+
+    @staticmethod
+    def year(year, legal, not_legal=None, other=2):
+        not_legal = 100 - legal - other if not_legal is None else not_legal
+        return {
+            "year": year,
+            "distribution": {
+                "Legal": {"estimate": legal, "lower": legal - 5, "upper": legal + 5},
+                "Not legal": {"estimate": not_legal},
+                "Other/DK": {"estimate": other, "lower": 0, "upper": 4},
+            },
+        }
+
+    def test_valid_distribution(self):
+        """A complete prediction summing to ~100 should be accepted."""
+        distribution, ci = validate_distribution(
+            self.year(2010, 40)["distribution"], self.RESPONSES
+        )
+        assert distribution == {"Legal": 40, "Not legal": 58, "Other/DK": 2}
+        assert ci["Not legal"] == (0, 100)
+
+    def test_invalid_distributions(self):
+        """Missing options, bad numbers, bad intervals and bad sums fail."""
+        valid = self.year(2010, 40)["distribution"]
+        missing = {k: v for k, v in valid.items() if k != "Other/DK"}
+        not_numeric = {**valid, "Legal": {"estimate": "about 40"}}
+        outside = {**valid, "Legal": {"estimate": 40, "lower": 45, "upper": 50}}
+        too_large = self.year(2010, 40, not_legal=70)["distribution"]
+        for prediction in (None, missing, not_numeric, outside, too_large):
+            assert validate_distribution(prediction, self.RESPONSES) is None
+
+    def test_one_forecast_per_target_year(self):
+        """Each target year should be parsed on its own, in request order."""
+        raw = json.dumps(
+            {
+                "predictions": [
+                    self.year(2018, 60),
+                    self.year(2010, 40, not_legal=80),
+                    self.year(2030, 70),
+                ]
+            }
+        )
+        forecasts = distributions_from_response(
+            raw, "GRASS", 2000, [2010, 2018, 2022], "claude"
+        )
+        assert [f.target_year for f in forecasts] == [2010, 2018, 2022]
+        assert forecasts[0].distribution == {}  # sums to 122
+        assert forecasts[1].distribution["Legal"] == 60
+        assert forecasts[2].distribution == {}  # not in the response
+        assert forecasts[1].raw_response == raw
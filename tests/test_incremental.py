@@ -0,0 +1,168 @@
+"""Tests for incremental re-evaluation."""
+
+import pytest
+
+from value_forecasting import gss_variables
+from value_forecasting.forecaster import run_baseline_forecast
+from value_forecasting.incremental import (
+    ForecastCache,
+    data_fingerprint,
+    plan_update,
+    run_incremental,
+)
+from value_forecasting.pooled import run_pooled_forecast
+
+
+class CountingForecaster:
+    """Linear baseline that records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, variable, cutoff_year, target_years):
+        self.calls.append((variable, cutoff_year, list(target_years)))
+        return run_baseline_forecast(variable, cutoff_year, target_years)
+
+
+@pytest.fixture
+def trajectory(monkeypatch):
+    """A private copy of the HOMOSEX trajectory that tests can extend."""
+    data = dict(gss_variables.HISTORICAL_TRAJECTORIES["HOMOSEX"])
+    monkeypatch.setitem(gss_variables.HISTORICAL_TRAJECTORIES, "HOMOSEX", data)
+    return data
+
+
+def run(cache, forecaster):
+    return run_incremental(
+        "linear",
+        forecaster,
+        variables=["HOMOSEX"],
+        cutoff_years=[1990, 2000],
+        cache=cache,
+    )
+
+
+class TestDataFingerprint:
+    """Tests for input fingerprints."""
+
+    def test_ignores_later_waves(self, trajectory):
+        """Waves after the cutoff should not change the fingerprint."""
+        before = data_fingerprint("HOMOSEX", 2000)
+        trajectory[2030] = 80
+        assert data_fingerprint("HOMOSEX", 2000) == before
+
+    def test_sees_revisions(self, trajectory):
+        """Revising a pre-cutoff wave should change the fingerprint."""
+        before = data_fingerprint("HOMOSEX", 2000)
+        trajectory[1990] += 1
+        assert data_fingerprint("HOMOSEX", 2000) != before
+
+    def test_sees_sample_sizes(self, monkeypatch):
+        """A revised sample size changes the weights, so the fingerprint too."""
+        before = data_fingerprint("HOMOSEX", 2000)
+        monkeypatch.setitem(gss_variables.ITEM_SAMPLE_SIZES, "HOMOSEX", {1990: 900})
+        assert data_fingerprint("HOMOSEX", 2000) != before
+
+
+class TestRunIncremental:
+    """Tests for run_incremental."""
+
+    def test_second_run_makes_no_calls(self, trajectory, tmp_path):
+        """A rerun with unchanged data should reuse every cached forecast."""
+        first, _ = run(ForecastCache(tmp_path), CountingForecaster())
+        forecaster = CountingForecaster()
+        second, plan = run(ForecastCache(tmp_path), forecaster)
+        assert forecaster.calls == []
+        assert plan.reused == len(second) == len(first)
+
+    def test_new_wave_forecasts_only_new_target(self, trajectory, tmp_path):
+        """A new wave should cost one call per cutoff, for that year only."""
+        run(ForecastCache(tmp_path), CountingForecaster())
+        trajectory[2030] = 80
+        forecaster = CountingForecaster()
+        results, plan = run(ForecastCache(tmp_path), forecaster)
+        assert forecaster.calls == [
+            ("HOMOSEX", 1990, [2030]),
+            ("HOMOSEX", 2000, [2030]),
+        ]
+        assert plan.new == 2
+        assert {r.target_year for r in results} >= {2030}
+
+    def test_revision_invalidates_later_cutoffs(self, trajectory, tmp_path):
+        """Revising a wave should recompute only cutoffs that can see it."""
+        run(ForecastCache(tmp_path), CountingForecaster())
+        trajectory[2000] += 1
+        forecaster = CountingForecaster()
+        _, plan = run(ForecastCache(tmp_path), forecaster)
+        assert [(v, c) for v, c, _ in forecaster.calls] == [("HOMOSEX", 2000)]
+        assert plan.stale > 0
+        assert plan.changed_actuals == [("HOMOSEX", 1990, 2000)]
+
+    def test_changed_actual_updates_evaluation(self, trajectory):
+        """A revised actual should be reported and used without refitting."""
+        cache = ForecastCache()
+        run(cache, CountingForecaster())
+        trajectory[2021] = 99
+        forecaster = CountingForecaster()
+        results, plan = run(cache, forecaster)
+        assert forecaster.calls == []
+        assert len(plan.changed_actuals) == 2
+        assert {r.actual for r in results if r.target_year == 2021} == {99}
+        replan = plan_update("linear", ["HOMOSEX"], [1990, 2000], cache)
+        assert replan.changed_actuals == []
+
+    def test_raw_response_survives_reload(self, trajectory, tmp_path):
+        """Cached forecasts should still expose their raw response."""
+        run(ForecastCache(tmp_path), CountingForecaster())
+        cache = ForecastCache(tmp_path)
+        forecast = cache.get(
+            "linear", "HOMOSEX", 2000, 2010, data_fingerprint("HOMOSEX", 2000)
+        )
+        assert forecast.raw_response.startswith("y = ")
+
+    def test_saves_are_throttled(self, trajectory, tmp_path, monkeypatch):
+        """A quick run should write the cache once after its jobs, not per job."""
+        cache = ForecastCache(tmp_path)
+        saves = []
+        save = cache.save
+        monkeypatch.setattr(cache, "save", lambda: saves.append(1) or save())
+        run_incremental(
+            "linear",
+            CountingForecaster(),
+            ["HOMOSEX", "GRASS"],
+            [1980, 1990, 2000],
+            cache=cache,
+        )
+        assert len(saves) == 2  # after the jobs, then with the evaluations
+        assert len(ForecastCache(tmp_path)) == len(cache)
+
+    def test_failed_run_keeps_completed_jobs(self, trajectory, tmp_path):
+        """Jobs finished before a failure should be on disk for --resume."""
+
+        def failing(variable, cutoff_year, target_years):
+            if cutoff_year == 2000:
+                raise RuntimeError("API down")
+            return run_baseline_forecast(variable, cutoff_year, target_years)
+
+        with pytest.raises(RuntimeError):
+            run(ForecastCache(tmp_path), failing)
+        forecaster = CountingForecaster()
+        run(ForecastCache(tmp_path), forecaster)
+        assert forecaster.calls == [("HOMOSEX", 2000, forecaster.calls[0][2])]
+
+    def test_pooled_reruns_when_another_variable_changes(self, monkeypatch):
+        """Pooled forecasts fit every series, so revising GRASS makes them stale."""
+        cache = ForecastCache()
+        run_incremental("pooled", run_pooled_forecast, ["HOMOSEX"], [2000], cache=cache)
+        _, plan = run_incremental(
+            "pooled", run_pooled_forecast, ["HOMOSEX"], [2000], cache=cache
+        )
+        assert plan.n_calls == 0
+        grass = dict(gss_variables.HISTORICAL_TRAJECTORIES["GRASS"])
+        grass[min(grass)] += 5
+        monkeypatch.setitem(gss_variables.HISTORICAL_TRAJECTORIES, "GRASS", grass)
+        _, plan = run_incremental(
+            "pooled", run_pooled_forecast, ["HOMOSEX"], [2000], cache=cache
+        )
+        assert [(v, c) for v, c, _ in plan.jobs] == [("HOMOSEX", 2000)]
+        assert plan.reused == 0 and plan.stale > 0
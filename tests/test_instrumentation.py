@@ -0,0 +1,141 @@
+"""Tests for per-stage instrumentation."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from value_forecasting import instrumentation
+from value_forecasting.baselines import run_naive_forecast
+from value_forecasting.evaluation import ForecastResult, evaluate_model
+from value_forecasting.forecaster import call_with_retries
+
+
+@pytest.fixture
+def recorder():
+    """Enable instrumentation for a single test."""
+    rec = instrumentation.enable()
+    yield rec
+    instrumentation.disable()
+
+
+class TestDisabled:
+    """Tests for the disabled (default) state."""
+
+    def test_stage_is_shared_noop(self):
+        """Disabled stages should all be the same no-op context manager."""
+        assert not instrumentation.is_enabled()
+        assert instrumentation.stage("a") is instrumentation.stage("b")
+
+    def test_record_is_noop(self):
+        """Recording with no active recorder should not raise."""
+        instrumentation.record(retries=1)
+        instrumentation.record_usage(SimpleNamespace(usage=None))
+
+
+class TestStages:
+    """Tests for timing and counters."""
+
+    def test_stage_records_wall_time(self, recorder):
+        """A stage should be counted once with non-negative wall time."""
+        with instrumentation.stage("test.block"):
+            pass
+        stats = recorder.summary()["test.block"]
+        assert stats["calls"] == 1
+        assert stats["wall_time"] >= 0
+
+    def test_record_attaches_to_innermost_stage(self, recorder):
+        """Counters should go to the innermost open stage."""
+        with instrumentation.stage("outer"):
+            with instrumentation.stage("inner"):
+                instrumentation.record(parse_failures=1)
+        summary = recorder.summary()
+        assert summary["inner"]["parse_failures"] == 1
+        assert summary["outer"]["parse_failures"] == 0
+
+    def test_exceptions_counted_as_errors(self, recorder):
+        """Exceptions inside a stage should be counted and re-raised."""
+        with pytest.raises(RuntimeError):
+            with instrumentation.stage("failing"):
+                raise RuntimeError("boom")
+        assert recorder.summary()["failing"]["errors"] == 1
+
+    def test_anthropic_usage(self, recorder):
+        """Messages API usage fields should be recorded."""
+        response = SimpleNamespace(
+            usage=SimpleNamespace(
+                input_tokens=100, output_tokens=20, cache_read_input_tokens=40
+            )
+        )
+        with instrumentation.stage("api"):
+            instrumentation.record_usage(response)
+        stats = recorder.summary()["api"]
+        assert (stats["input_tokens"], stats["output_tokens"]) == (100, 20)
+        assert stats["cached_tokens"] == 40
+
+    def test_openai_usage(self, recorder):
+        """Chat Completions usage fields should be recorded."""
+        response = SimpleNamespace(
+            usage=SimpleNamespace(
+                prompt_tokens=80,
+                completion_tokens=10,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+            )
+        )
+        with instrumentation.stage("api"):
+            instrumentation.record_usage(response)
+        stats = recorder.summary()["api"]
+        assert (stats["input_tokens"], stats["output_tokens"]) == (80, 10)
+        assert stats["cached_tokens"] == 64
+
+    def test_retries_counted(self, recorder):
+        """Retried transient failures should be counted on the stage."""
+        calls = []
+
+        class RateLimited(Exception):
+            status_code = 429
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) < 3:
+                raise RateLimited()
+            return "ok"
+
+        with instrumentation.stage("api"):
+            assert call_with_retries(create, backoff=0, x=1) == "ok"
+        assert recorder.summary()["api"]["retries"] == 2
+
+    def test_pipeline_functions_instrumented(self, recorder):
+        """Baselines and evaluation should report their own stages."""
+        run_naive_forecast("HOMOSEX", 2000, [2010])
+        evaluate_model([ForecastResult("X", 2000, 2010, 50, 50, 40, 60, "t")])
+        summary = recorder.summary()
+        assert "baselines.naive" in summary
+        assert "evaluation.evaluate_model" in summary
+
+
+class TestExport:
+    """Tests for JSONL and Prometheus export."""
+
+    def test_jsonl_export(self, tmp_path):
+        """JSONL export should write one event per completed stage."""
+        path = tmp_path / "metrics.jsonl"
+        instrumentation.enable(path)
+        with instrumentation.stage("a"):
+            instrumentation.record(retries=1)
+        with instrumentation.stage("b"):
+            pass
+        instrumentation.disable()
+        events = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["stage"] for e in events] == ["a", "b"]
+        assert events[0]["retries"] == 1
+
+    def test_prometheus_export(self, tmp_path):
+        """Paths ending in .prom should use the Prometheus text format."""
+        path = tmp_path / "metrics.prom"
+        instrumentation.enable(path)
+        with instrumentation.stage("a"):
+            pass
+        instrumentation.disable()
+        text = path.read_text()
+        assert 'value_forecasting_stage_calls_total{stage="a"} 1' in text
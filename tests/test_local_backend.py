@@ -0,0 +1,104 @@
+"""Tests for the local open-weights backend."""
+
+import json
+
+from value_forecasting.forecaster import Forecast
+from value_forecasting.local_backend import (
+    common_prefix_length,
+    create_local_prompt,
+    run_forecast_local,
+    run_forecasts_local,
+)
+
+
+class EchoEngine:
+    """Fake engine answering with the target years found in each prompt."""
+
+    model_name = "fake-local"
+
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, prompts, max_new_tokens):
+        self.batches.append(prompts)
+        completions = []
+        for prompt in prompts:
+            years_text = prompt.split("Target years to predict: ")[1].split("\n")[0]
+            predictions = [
+                {"year": y, "estimate": 50, "lower": 40, "upper": 60}
+                for y in json.loads(years_text)
+            ]
+            completions.append(json.dumps({"predictions": predictions}))
+        return completions
+
+
+class TestCommonPrefixLength:
+    """Tests for shared-prefix detection."""
+
+    def test_shared_prefix(self):
+        """Should return the length of the common token prefix."""
+        assert common_prefix_length([[1, 2, 3, 4], [1, 2, 5], [1, 2, 3]]) == 2
+
+    def test_identical_sequences(self):
+        """Identical sequences share their full length."""
+        assert common_prefix_length([[1, 2], [1, 2]]) == 2
+
+    def test_empty(self):
+        """No sequences share nothing."""
+        assert common_prefix_length([]) == 0
+
+
+class TestCreateLocalPrompt:
+    """Tests for completion-style prompts."""
+
+    def test_starts_with_system_prompt(self):
+        """Local prompts should lead with the temporal system prompt."""
+        prompt = create_local_prompt("HOMOSEX", 2000, [2010])
+        assert prompt.startswith("You are a social scientist conducting research in")
+        assert "Target years to predict: [2010]" in prompt
+
+    def test_same_job_prefix_is_shared(self):
+        """Prompts for one variable and cutoff should differ only at the end."""
+        a = create_local_prompt("HOMOSEX", 2000, [2010])
+        b = create_local_prompt("HOMOSEX", 2000, [2010, 2018])
+        shared = len(a) - len(a.split("Target years")[-1])
+        assert a[:shared] == b[:shared]
+
+
+class TestRunForecastsLocal:
+    """Tests for batched local forecasting."""
+
+    def test_returns_forecasts(self):
+        """Should return Forecast objects labelled with the engine's model."""
+        forecasts = run_forecast_local("HOMOSEX", 2000, [2010, 2018], EchoEngine())
+        assert [f.target_year for f in forecasts] == [2010, 2018]
+        assert all(isinstance(f, Forecast) for f in forecasts)
+        assert forecasts[0].model == "fake-local"
+
+    def test_results_keep_job_order(self):
+        """Results should line up with the input jobs."""
+        jobs = [
+            ("GRASS", 2000, [2010]),
+            ("HOMOSEX", 1990, [2000]),
+            ("GRASS", 1990, [2018]),
+        ]
+        results = run_forecasts_local(jobs, EchoEngine(), batch_size=2)
+        for (variable, cutoff, years), forecasts in zip(jobs, results):
+            assert [(f.variable, f.cutoff_year) for f in forecasts] == [
+                (variable, cutoff)
+            ]
+            assert forecasts[0].target_year == years[0]
+
+    def test_batches_grouped_by_cutoff(self):
+        """Jobs sharing a cutoff should land in the same batch."""
+        engine = EchoEngine()
+        jobs = [
+            ("GRASS", 2000, [2010]),
+            ("HOMOSEX", 1990, [2000]),
+            ("GRASS", 1990, [2018]),
+            ("HOMOSEX", 2000, [2010]),
+        ]
+        run_forecasts_local(jobs, engine, batch_size=2)
+        for batch in engine.batches:
+            cutoffs = {p.split("research in ")[1][:4] for p in batch}
+            assert len(cutoffs) == 1
@@ -0,0 +1,148 @@
+"""Tests for logprob-based forecast distributions."""
+
+import math
+
+import numpy as np
+import pytest
+
+from value_forecasting import logprobs
+from value_forecasting.forecaster import Forecast
+from value_forecasting.logprobs import (
+    BinnedForecast,
+    bin_quantiles,
+    bins_from_logprobs,
+    create_logprob_prompt,
+    forecast_bins_local,
+    forecast_bins_openai,
+    run_forecast_logprobs,
+)
+from value_forecasting.mock_llm import MockConfig, MockLLMServer
+
+
+class PeakedEngine:
+    """Fake local engine with log-probabilities peaked at 40%."""
+
+    model_name = "fake-local"
+
+    def score_continuations(self, prompt, continuations):
+        return [-(((int(c) - 40) / 5) ** 2) for c in continuations]
+
+
+class TestCreateLogprobPrompt:
+    """Tests for the answer-position prompt."""
+
+    def test_ends_at_answer_position(self):
+        """The prompt should stop right before the percentage."""
+        prompt = create_logprob_prompt("HOMOSEX", 2000, 2010)
+        assert prompt.endswith("will be")
+        assert "in 2010" in prompt
+
+    def test_trailing_space(self):
+        """cl100k-style prompts should end in a space before the number."""
+        prompt = create_logprob_prompt("HOMOSEX", 2000, 2010, trailing_space=True)
+        assert prompt.endswith("will be ")
+
+
+class TestBinsFromLogprobs:
+    """Tests for mapping tokens onto percentage bins."""
+
+    def test_ignores_non_numeric_tokens(self):
+        """Non-numeric tokens should be dropped and mass renormalized."""
+        probs, mass = bins_from_logprobs(
+            {" 40": math.log(0.3), " 41": math.log(0.3), " about": math.log(0.4)}
+        )
+        assert probs[40] == pytest.approx(0.5)
+        assert mass == pytest.approx(0.6)
+
+    def test_cl100k_tokens(self):
+        """Whitespace and newline tokens should not count as bins."""
+        probs, mass = bins_from_logprobs(
+            {
+                " ": math.log(0.5),
+                "\n": math.log(0.2),
+                "5": math.log(0.1),
+                "57": math.log(0.1),
+                " about": math.log(0.1),
+            }
+        )
+        assert np.flatnonzero(probs).tolist() == [5, 57]
+        assert mass == pytest.approx(0.2)
+
+    def test_raises_without_numeric_tokens(self):
+        """Should raise when no token is a percentage."""
+        with pytest.raises(ValueError):
+            bins_from_logprobs({" about": -0.1})
+
+
+class TestBinQuantiles:
+    """Tests for quantiles of binned distributions."""
+
+    def test_point_mass(self):
+        """All quantiles of a point mass should sit within its bin."""
+        probs = np.zeros(101)
+        probs[30] = 1.0
+        lower, median, upper = bin_quantiles(probs, [0.05, 0.5, 0.95])
+        assert 29.5 <= lower < median < upper <= 30.5
+        assert median == pytest.approx(30.0)
+
+    def test_uniform(self):
+        """The median of a uniform distribution should be 50."""
+        assert bin_quantiles(np.ones(101), [0.5])[0] == pytest.approx(50.0)
+
+
+class TestBinnedForecast:
+    """Tests for conversion to Forecast."""
+
+    def test_to_forecast(self):
+        """Should produce an ordered 90% interval around the median."""
+        probs = np.exp(-0.5 * ((np.arange(101) - 60) / 4) ** 2)
+        binned = BinnedForecast("GRASS", 2000, 2010, probs / probs.sum(), "m")
+        forecast = binned.to_forecast()
+        assert isinstance(forecast, Forecast)
+        assert forecast.lower_bound < forecast.point_estimate < forecast.upper_bound
+        assert forecast.point_estimate == pytest.approx(60.0, abs=0.5)
+        assert forecast.model == "m:logprobs"
+
+
+class TestLocalBins:
+    """Tests for exact local scoring."""
+
+    def test_distribution_peaks_at_engine_mode(self):
+        """Binned probabilities should follow the engine's scores."""
+        (binned,) = forecast_bins_local([("HOMOSEX", 2000, 2010)], PeakedEngine())
+        assert binned.probabilities.sum() == pytest.approx(1.0)
+        assert int(np.argmax(binned.probabilities)) == 40
+
+
+class TestOpenAIBins:
+    """Tests for the completion-model path against the mock server."""
+
+    def test_one_short_call_per_year(self):
+        """Each target year should cost one max_tokens=1 completion."""
+        with MockLLMServer(MockConfig()) as srv:
+            binned = forecast_bins_openai(
+                "HOMOSEX", 2000, [2010, 2018], base_url=srv.openai_base_url
+            )
+            assert srv.stats.by_endpoint == {"/v1/completions": 2}
+        assert [b.target_year for b in binned] == [2010, 2018]
+        assert all(np.count_nonzero(b.probabilities) == 5 for b in binned)
+
+    def test_prompt_without_trailing_space_fails(self, monkeypatch):
+        """Without the space, cl100k-style alternatives hold no numbers."""
+        monkeypatch.setattr(
+            logprobs,
+            "create_logprob_prompt",
+            lambda v, c, t, trailing_space: create_logprob_prompt(v, c, t),
+        )
+        with MockLLMServer(MockConfig()) as srv:
+            binned = forecast_bins_openai("HOMOSEX", 2000, [2010], base_url=srv.url)
+        assert binned == []
+
+    def test_run_forecast_logprobs(self):
+        """Should return Forecasts with ordered bounds."""
+        with MockLLMServer(MockConfig()) as srv:
+            forecasts = run_forecast_logprobs(
+                "GRASS", 2000, [2010], base_url=srv.openai_base_url
+            )
+        assert forecasts[0].lower_bound <= forecasts[0].point_estimate
+        assert forecasts[0].point_estimate <= forecasts[0].upper_bound
@@ -0,0 +1,68 @@
+"""Tests for the precomputed metric cube."""
+
+import pytest
+
+from value_forecasting.evaluation import ForecastResult, evaluate_model
+from value_forecasting.metric_cube import MetricCube, build_metric_cube
+
+RESULTS = [
+    ForecastResult("HOMOSEX", 1990, 2000, 14.6, 27.0, 8.8, 20.4, "linear"),
+    ForecastResult("HOMOSEX", 2000, 2010, 29.0, 41.0, 13.7, 44.3, "linear"),
+    ForecastResult("HOMOSEX", 2000, 2010, 42.0, 41.0, 35.0, 50.0, "claude"),
+    ForecastResult("GRASS", 1990, 2000, 15.7, 31.0, 0.0, 35.0, "linear"),
+    ForecastResult("GRASS", 2000, 2018, 48.0, 61.0, 38.0, 58.0, "claude"),
+    ForecastResult("GRASS", 2000, 2010, 30.0, 44.0, 7.2, 52.7, "linear"),
+]
+
+
+@pytest.fixture
+def cube():
+    return build_metric_cube(RESULTS)
+
+
+class TestMetricCube:
+    """Tests for building and slicing the cube."""
+
+    def test_labels(self, cube):
+        """Labels should be sorted per dimension, with horizons derived."""
+        assert cube.labels["model"] == ["claude", "linear"]
+        assert cube.labels["horizon"] == [10, 18]
+        assert cube.stats.shape == (2, 2, 2, 2, 5)
+
+    def test_total_matches_evaluate_model(self, cube):
+        """The full roll-up should equal evaluate_model over all rows."""
+        assert cube.metrics() == pytest.approx(evaluate_model(RESULTS))
+
+    def test_slice_matches_filter(self, cube):
+        """A slice should equal evaluate_model over the filtered rows."""
+        expected = evaluate_model(
+            [r for r in RESULTS if r.model == "linear" and r.cutoff_year == 2000]
+        )
+        assert cube.metrics(model="linear", cutoff_year=[2000]) == pytest.approx(
+            expected
+        )
+
+    def test_rollup(self, cube):
+        """Roll-ups should group by the requested dimensions in order."""
+        by_horizon = cube.rollup(["horizon", "model"], variable="GRASS")
+        assert set(by_horizon) == {(10, "linear"), (18, "claude")}
+        assert by_horizon[(18, "claude")]["mae"] == pytest.approx(13.0)
+
+    def test_unknown_dimension(self, cube):
+        """Unknown dimensions should raise ValueError."""
+        with pytest.raises(ValueError):
+            cube.metrics(region="south")
+
+    def test_save_load(self, cube, tmp_path):
+        """Cubes should round-trip through .npz."""
+        path = tmp_path / "cube.npz"
+        cube.save(path)
+        loaded = MetricCube.load(path)
+        assert loaded.labels == cube.labels
+        assert loaded.metrics(variable="GRASS") == cube.metrics(variable="GRASS")
+
+    def test_to_json_is_sparse(self, cube):
+        """JSON should list only non-empty cells (6 of the 16)."""
+        data = cube.to_json()
+        assert [len(c) for c in data["coords"]] == [6] * 4
+        assert sum(data["stats"][0]) == len(RESULTS)
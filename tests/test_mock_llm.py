@@ -0,0 +1,144 @@
+"""Tests for the offline mock LLM server."""
+
+import json
+import urllib.request
+
+import pytest
+
+from value_forecasting import instrumentation
+from value_forecasting.forecaster import (
+    Forecast,
+    create_forecast_prompt,
+    run_forecast,
+    run_forecast_openai,
+    run_forecast_packed,
+)
+from value_forecasting.heterogeneity import (
+    forecast_distribution_llm,
+    forecast_distributions_llm,
+)
+from value_forecasting.mock_llm import MockConfig, MockLLMServer, generate_response
+
+
+@pytest.fixture
+def server():
+    """A zero-latency mock server."""
+    with MockLLMServer(MockConfig(seed=0)) as srv:
+        yield srv
+
+
+class TestGenerateResponse:
+    """Tests for generated forecast replies."""
+
+    def test_covers_target_years(self):
+        """Generated JSON should predict every requested year."""
+        prompt = create_forecast_prompt("HOMOSEX", 2000, [2010, 2020])
+        parsed = json.loads(generate_response(prompt))
+        assert [p["year"] for p in parsed["predictions"]] == [2010, 2020]
+
+    def test_intervals_contain_estimate(self):
+        """Generated intervals should bracket the estimate."""
+        prompt = create_forecast_prompt("GRASS", 2000, [2010])
+        pred = json.loads(generate_response(prompt))["predictions"][0]
+        assert pred["lower"] <= pred["estimate"] <= pred["upper"]
+
+
+class TestWireFormats:
+    """Tests for the real SDK clients against the mock."""
+
+    def test_anthropic_messages(self, server):
+        """run_forecast should work end to end via base_url."""
+        forecasts = run_forecast(
+            "HOMOSEX", 2000, [2010, 2018], base_url=server.anthropic_base_url
+        )
+        assert len(forecasts) == 2
+        assert all(isinstance(f, Forecast) for f in forecasts)
+        assert server.stats.by_endpoint == {"/v1/messages": 1}
+
+    def test_openai_chat(self, server):
+        """Chat models should go through /v1/chat/completions."""
+        forecasts = run_forecast_openai(
+            "HOMOSEX", 2000, [2010], base_url=server.openai_base_url
+        )
+        assert len(forecasts) == 1
+        assert server.stats.by_endpoint == {"/v1/chat/completions": 1}
+
+    def test_openai_completions(self, server):
+        """davinci models should go through the legacy completions API."""
+        forecasts = run_forecast_openai(
+            "HOMOSEX",
+            2000,
+            [2021],
+            model="davinci-002",
+            base_url=server.openai_base_url,
+        )
+        assert len(forecasts) == 1
+        assert server.stats.by_endpoint == {"/v1/completions": 1}
+
+    def test_distribution_prompt(self, server):
+        """Distribution prompts should get a full generated distribution."""
+        result = forecast_distribution_llm(
+            "GRASS", 2000, 2010, base_url=server.anthropic_base_url
+        )
+        assert sum(result.distribution.values()) == pytest.approx(100.0)
+
+    def test_multi_year_distribution_prompt(self, server):
+        """One call should return a valid distribution for every target year."""
+        results = forecast_distributions_llm(
+            "GRASS", 2000, [2010, 2018], base_url=server.anthropic_base_url
+        )
+        assert [r.target_year for r in results] == [2010, 2018]
+        assert all(sum(r.distribution.values()) == pytest.approx(100) for r in results)
+        assert server.stats.requests == 1
+
+    def test_packed_prompt(self, server):
+        """Packed calls should return forecasts keyed by variable."""
+        variables = ["HOMOSEX", "GRASS", "FEPOL"]
+        packed = run_forecast_packed(
+            variables, 2000, [2010, 2018], 2, base_url=server.anthropic_base_url
+        )
+        assert server.stats.requests == 2
+        isolated = {
+            v: run_forecast(v, 2000, [2010, 2018], base_url=server.anthropic_base_url)
+            for v in variables
+        }
+        assert list(packed) == variables
+        for variable in variables:
+            assert [f.point_estimate for f in packed[variable]] == [
+                f.point_estimate for f in isolated[variable]
+            ]
+
+    def test_stats_endpoint(self, server):
+        """GET /stats should report request counters."""
+        run_forecast("GRASS", 2000, [2010], base_url=server.anthropic_base_url)
+        with urllib.request.urlopen(f"{server.url}/stats") as response:
+            stats = json.loads(response.read())
+        assert stats["requests"] == 1
+
+
+class TestErrorInjection:
+    """Tests for injected 429/5xx responses."""
+
+    def test_rate_limits_are_retried(self):
+        """Persistent 429s should be retried, counted, then raised."""
+        config = MockConfig(rate_limit_rate=1.0, retry_after=0)
+        instrumentation.enable()
+        try:
+            with MockLLMServer(config) as srv:
+                with pytest.raises(Exception) as excinfo:
+                    run_forecast("GRASS", 2000, [2010], base_url=srv.anthropic_base_url)
+                assert srv.stats.requests == 3
+        finally:
+            recorder = instrumentation.disable()
+        assert getattr(excinfo.value, "status_code", None) == 429
+        assert recorder.summary()["forecaster.api_call"]["retries"] == 2
+
+    def test_server_errors_reported(self):
+        """5xx failures should surface as an empty OpenAI result."""
+        config = MockConfig(server_error_rate=1.0, retry_after=0)
+        with MockLLMServer(config) as srv:
+            forecasts = run_forecast_openai(
+                "GRASS", 2000, [2010], base_url=srv.openai_base_url
+            )
+            assert srv.stats.server_errors == 3
+        assert forecasts == []
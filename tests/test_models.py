@@ -0,0 +1,115 @@
+"""Tests for the model registry and routing."""
+
+from dataclasses import replace
+
+import pytest
+
+from value_forecasting import models
+from value_forecasting.forecaster import MODEL_CUTOFFS
+from value_forecasting.mock_llm import MockConfig, MockLLMServer
+from value_forecasting.models import (
+    ModelSpec,
+    RoutedForecaster,
+    api_style,
+    get_model,
+    route_jobs,
+    select_model,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """A private copy of the registry that tests can change."""
+    monkeypatch.setattr(models, "MODELS", dict(models.MODELS))
+    return models.MODELS
+
+
+class TestModelSpec:
+    """Tests for ModelSpec."""
+
+    def test_cutoff_year(self):
+        """Cutoffs stated in words should give their calendar year."""
+        assert get_model("claude-sonnet-4-20250514").cutoff_year == 2024
+        assert get_model("davinci-002").cutoff_year == 2019
+
+    def test_contamination_safety(self):
+        """A model should only be safe for years after its training data."""
+        spec = get_model("gpt-3.5-turbo")
+        assert not spec.is_safe_for(2021)
+        assert spec.is_safe_for(2022)
+
+    def test_cost_and_batch_discount(self):
+        """Prices are per million tokens; batch halves them where offered."""
+        spec = get_model("claude-sonnet-4-20250514")
+        assert spec.cost(1_000_000, 0) == pytest.approx(3.0)
+        assert spec.cost(0, 1_000_000, batch=True) == pytest.approx(7.5)
+        assert get_model("davinci-002").cost(1e6, 0, batch=True) == 2.0
+
+    def test_rate_limits(self):
+        """The tighter of the request and token limits should bind."""
+        spec = get_model("claude-sonnet-4-20250514")
+        assert spec.calls_per_minute(1000) == 30
+        assert spec.calls_per_minute(100) == 50
+
+    def test_rejects_unknown_provider(self):
+        """Specs should validate their provider."""
+        with pytest.raises(ValueError):
+            ModelSpec("x", "acme", "chat", "2020", 1000)
+
+    def test_model_cutoffs_follow_registry(self):
+        """MODEL_CUTOFFS should be derived from the registry."""
+        assert MODEL_CUTOFFS["davinci-002"] == "Oct 2019"
+        assert set(MODEL_CUTOFFS) == set(models.MODELS)
+
+    def test_api_style(self):
+        """Registered models use their spec; unknown davinci names complete."""
+        assert api_style("davinci-002") == "completion"
+        assert api_style("gpt-3.5-turbo") == "chat"
+        assert api_style("davinci-002:ft-acme") == "completion"
+
+
+class TestSelectModel:
+    """Tests for select_model and route_jobs."""
+
+    def test_cheapest_safe_model(self):
+        """Cost selection should skip contaminated and retired models."""
+        assert select_model([2022]).name == "gpt-3.5-turbo"
+        assert select_model([2021]).name == "davinci-002"
+        assert select_model([2018]) is None
+
+    def test_throughput_objective(self, registry):
+        """Throughput selection should prefer the highest sustained call rate."""
+        models.register(
+            replace(get_model("gpt-3.5-turbo"), name="fast", requests_per_minute=10**5)
+        )
+        assert select_model([2022], objective="throughput").name == "davinci-002"
+        models.register(replace(get_model("fast"), tokens_per_minute=10**8))
+        assert select_model([2022], objective="throughput").name == "fast"
+
+    def test_context_window(self):
+        """Models whose context is too small for the call should be skipped."""
+        assert select_model([2021], ["gpt2-xl"], input_tokens=900) is None
+        assert select_model([2021], ["gpt2-xl"]).name == "gpt2-xl"
+
+    def test_route_splits_targets(self):
+        """Each target year should go to its own best model."""
+        routes = route_jobs([("HOMOSEX", 2000, [2018, 2021, 2022, 2024])])
+        assert routes == {
+            "davinci-002": [("HOMOSEX", 2000, [2021])],
+            "gpt-3.5-turbo": [("HOMOSEX", 2000, [2022, 2024])],
+        }
+
+
+class TestRoutedForecaster:
+    """Tests for RoutedForecaster."""
+
+    def test_forecasts_come_from_routed_models(self):
+        """Every forecast should come from a safe model, one call per model."""
+        with MockLLMServer(MockConfig(seed=0)) as server:
+            forecast = RoutedForecaster(base_url=server.url)
+            forecasts = forecast("HOMOSEX", 2000, [2018, 2021, 2022])
+            assert server.stats.requests == 2
+        assert {(f.target_year, f.model) for f in forecasts} == {
+            (2021, "davinci-002"),
+            (2022, "gpt-3.5-turbo"),
+        }
@@ -0,0 +1,48 @@
+"""Tests for the package's lazily loaded namespace."""
+
+import subprocess
+import sys
+
+import pytest
+
+import value_forecasting
+
+
+def imported_modules(code: str) -> set[str]:
+    """Top-level modules loaded by running ``code`` in a fresh interpreter."""
+    script = f"import sys\n{code}\nprint(' '.join(sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return {name.split(".")[0] for name in out.split()}
+
+
+class TestLazyNamespace:
+    """Tests for PEP 562 attribute loading in value_forecasting."""
+
+    def test_all_names_resolve(self):
+        """Every name in __all__ should load from its submodule."""
+        for name in value_forecasting.__all__:
+            assert getattr(value_forecasting, name) is not None
+        assert set(value_forecasting.__all__) <= set(dir(value_forecasting))
+
+    def test_unknown_attribute(self):
+        """Unknown names should raise AttributeError."""
+        with pytest.raises(AttributeError):
+            value_forecasting.not_a_name
+
+    def test_import_is_light(self):
+        """Importing the package or its data should not load heavy dependencies."""
+        code = "import value_forecasting\nimport value_forecasting.gss_variables"
+        loaded = imported_modules(code)
+        assert not loaded & {"anthropic", "openai", "numpy", "statsmodels"}
+
+    def test_forecaster_defers_sdks(self):
+        """The API SDKs should only load when a client is created."""
+        loaded = imported_modules("import value_forecasting.forecaster")
+        assert not loaded & {"anthropic", "openai"}
+        loaded = imported_modules(
+            "from value_forecasting import forecaster\n"
+            "forecaster.create_openai_client('http://127.0.0.1:1/v1')"
+        )
+        assert "openai" in loaded
@@ -0,0 +1,85 @@
+"""Tests for the contamination check on planned forecast jobs."""
+
+import pytest
+
+from value_forecasting import run_experiment as experiment
+from value_forecasting.planning import call_tokens, plan_contamination
+
+CLAUDE = "claude-sonnet-4-20250514"
+
+
+class TestPlanContamination:
+    """Tests for checking jobs against a model's training cutoff."""
+
+    def test_skips_contaminated_years(self):
+        """Years up to the cutoff year should be dropped before any call."""
+        jobs = [("HOMOSEX", 2000, [2018, 2021, 2022]), ("GRASS", 2010, [2018])]
+        plan = plan_contamination("gpt-3.5-turbo", jobs)
+        assert plan.jobs == [("HOMOSEX", 2000, [2022])]
+        assert plan.contaminated == [
+            ("HOMOSEX", 2000, 2018),
+            ("HOMOSEX", 2000, 2021),
+            ("GRASS", 2010, 2018),
+        ]
+        assert plan.calls_saved == 1
+
+    def test_tokens_saved(self):
+        """Savings should cover dropped calls and the trimmed target years."""
+        jobs = [("HOMOSEX", 2000, [2021, 2022]), ("GRASS", 2010, [2018])]
+        plan = plan_contamination("gpt-3.5-turbo", jobs)
+        expected = (
+            call_tokens("HOMOSEX", 2000, [2021, 2022])
+            - call_tokens("HOMOSEX", 2000, [2022])
+            + call_tokens("GRASS", 2010, [2018])
+        )
+        assert plan.tokens_saved == expected
+        assert "1 calls and ~" in plan.summary()
+
+    def test_flag_keeps_calls(self):
+        """Flagging should keep every call and only list the years."""
+        jobs = [("HOMOSEX", 2000, [2021, 2022])]
+        plan = plan_contamination("gpt-3.5-turbo", jobs, policy="flag")
+        assert plan.jobs == jobs
+        assert plan.is_contaminated("HOMOSEX", 2000, 2021)
+        assert not plan.is_contaminated("HOMOSEX", 2000, 2022)
+        assert plan.calls_saved == plan.tokens_saved == 0
+
+    def test_rejects_unknown_model_and_policy(self):
+        """Models without a known cutoff and bad policies should raise."""
+        with pytest.raises(ValueError, match="Unknown model"):
+            plan_contamination("my-fine-tune", [])
+        with pytest.raises(ValueError, match="Unknown policy"):
+            plan_contamination(CLAUDE, [], policy="ignore")
+
+
+class TestRunExperiment:
+    """Tests for the planning stage in run_experiment."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Record run_forecast calls and answer with the linear baseline."""
+        calls = []
+
+        def fake_forecast(variable, cutoff, targets, model):
+            calls.append((variable, cutoff, targets))
+            return experiment.run_baseline_forecast(variable, cutoff, targets)
+
+        monkeypatch.setattr(experiment, "run_forecast", fake_forecast)
+        return calls
+
+    def test_contaminated_calls_are_skipped(self, calls, capsys):
+        """A model trained past every target year should make no calls."""
+        results = experiment.run_experiment(["HOMOSEX"], [2000])
+        assert calls == []
+        assert results["llm"] == results["llm_contaminated"] == []
+        assert "1 calls and ~" in capsys.readouterr().out
+
+    def test_flagged_results_are_kept_apart(self, calls, capsys):
+        """Flagged forecasts should be reported separately from clean ones."""
+        results = experiment.run_experiment(
+            ["HOMOSEX"], [2000], model="gpt-3.5-turbo", contamination="flag"
+        )
+        capsys.readouterr()
+        assert len(calls) == 1
+        assert {r.target_year for r in results["llm"]} == {2022, 2024}
+        assert all(r.target_year <= 2021 for r in results["llm_contaminated"])
@@ -0,0 +1,91 @@
+"""Tests for the pooled logistic-trend baseline."""
+
+import numpy as np
+import pytest
+
+from value_forecasting import gss_variables
+from value_forecasting.pooled import (
+    fit_pooled_trends,
+    run_pooled_forecast,
+    run_pooled_forecasts,
+)
+
+
+def logistic_series(level, slope, years, noise=0.0, seed=0):
+    """Percent values on an exact (or noisy) logistic trend."""
+    rng = np.random.default_rng(seed)
+    x = (np.asarray(years) - 2000) / 10
+    z = level + slope * x + rng.normal(0, noise, len(x)) if noise else level + slope * x
+    return {int(y): float(100 / (1 + np.exp(-v))) for y, v in zip(years, z)}
+
+
+@pytest.fixture
+def shared_trend(monkeypatch):
+    """Eight series with different levels but a common logit trend of 0.4."""
+    years = list(range(1970, 2021, 5))
+    names = []
+    for i, level in enumerate(np.linspace(-1.5, 1.0, 8)):
+        name = f"POOL{i}"
+        series = logistic_series(level, 0.4, years, noise=0.05, seed=i)
+        monkeypatch.setitem(gss_variables.HISTORICAL_TRAJECTORIES, name, series)
+        names.append(name)
+    return names
+
+
+class TestFitPooledTrends:
+    """Tests for fit_pooled_trends."""
+
+    def test_recovers_shared_trend(self, shared_trend):
+        """The pooled trend should match the common slope of the series."""
+        fit = fit_pooled_trends(2000, shared_trend)
+        assert fit.prior_mean[1] == pytest.approx(0.4, abs=0.05)
+        assert fit.coef[:, 1] == pytest.approx(np.full(8, 0.4), abs=0.1)
+        assert fit.n_iter < 500
+
+    def test_short_series_borrow_trend(self, shared_trend, monkeypatch):
+        """A series with one wave should take the pooled trend and its level."""
+        monkeypatch.setitem(gss_variables.HISTORICAL_TRAJECTORIES, "ONE", {2000: 50})
+        fit = fit_pooled_trends(2000, [*shared_trend, "ONE"])
+        level, slope = fit.coef[fit.variables.index("ONE")]
+        assert level == pytest.approx(0.0, abs=0.1)
+        assert slope == pytest.approx(fit.prior_mean[1], abs=0.05)
+
+    def test_no_data(self):
+        """A cutoff before every series should raise."""
+        with pytest.raises(ValueError):
+            fit_pooled_trends(1900)
+
+    def test_cache_sees_revised_data(self, monkeypatch):
+        """Revising a wave should give a new fit, not a cached one."""
+        before = fit_pooled_trends(2000)
+        revised = {**gss_variables.HISTORICAL_TRAJECTORIES["GRASS"], 2000: 45}
+        monkeypatch.setitem(gss_variables.HISTORICAL_TRAJECTORIES, "GRASS", revised)
+        after = fit_pooled_trends(2000)
+        assert after is not before
+        assert fit_pooled_trends(2000) is after
+
+
+class TestRunPooledForecast:
+    """Tests for the Forecast-returning entry points."""
+
+    def test_forecasts(self):
+        """Forecasts should be ordered and bracket their point estimates."""
+        forecasts = run_pooled_forecast("HOMOSEX", 2000, [2010, 2018])
+        assert [f.target_year for f in forecasts] == [2010, 2018]
+        for f in forecasts:
+            assert 0 < f.lower_bound < f.point_estimate < f.upper_bound < 100
+            assert f.model == "pooled_logistic"
+        first, second = forecasts
+        width = second.upper_bound - second.lower_bound
+        assert width > first.upper_bound - first.lower_bound
+
+    def test_unknown_variable(self):
+        """Variables without pre-cutoff data get no forecasts."""
+        assert run_pooled_forecast("NOPE", 2000, [2010]) == []
+
+    def test_batched_matches_single(self):
+        """run_pooled_forecasts should equal per-variable calls."""
+        jobs = [("HOMOSEX", 2000, [2010]), ("GRASS", 1990, [2000, 2010])]
+        batched = run_pooled_forecasts(jobs)
+        single = [f for job in jobs for f in run_pooled_forecast(*job)]
+        assert [f.point_estimate for f in batched] == [f.point_estimate for f in single]
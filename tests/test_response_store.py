@@ -0,0 +1,96 @@
+"""Tests for deduplicated raw response storage."""
+
+import pickle
+
+import pytest
+
+from value_forecasting import response_store
+from value_forecasting.forecaster import Forecast
+from value_forecasting.heterogeneity import DistributionForecast
+from value_forecasting.response_store import ResponseStore
+
+LONG_RESPONSE = '{"predictions": []}' + " " * 2000
+
+
+def make_forecast(target_year, raw_response=LONG_RESPONSE):
+    return Forecast("HOMOSEX", 2000, target_year, 50, 40, 60, "m", raw_response)
+
+
+@pytest.fixture
+def store(request, tmp_path):
+    """Swap in a fresh process-wide store (in memory, or on disk if param)."""
+    directory = tmp_path / "responses" if getattr(request, "param", False) else None
+    previous = response_store.set_store(ResponseStore(directory))
+    yield response_store.get_store()
+    response_store.set_store(previous)
+
+
+class TestResponseStore:
+    """Tests for ResponseStore."""
+
+    def test_round_trip(self):
+        """Stored text should come back unchanged, short or long."""
+        store = ResponseStore()
+        for text in ["short", LONG_RESPONSE, "ünïcode"]:
+            assert store.get(store.put(text)) == text
+
+    def test_deduplicates(self):
+        """Identical texts should be stored once."""
+        store = ResponseStore()
+        assert store.put(LONG_RESPONSE) == store.put(str(LONG_RESPONSE))
+        assert len(store) == 1
+        assert store.nbytes < len(LONG_RESPONSE)
+
+    def test_empty(self):
+        """Empty text maps to the empty ID and is not stored."""
+        store = ResponseStore()
+        assert store.put("") == ""
+        assert store.get("") == ""
+        assert len(store) == 0
+
+    def test_on_disk(self, tmp_path):
+        """A directory-backed store keeps blobs on disk, not in memory."""
+        store = ResponseStore(tmp_path)
+        key = store.put(LONG_RESPONSE)
+        assert store.nbytes == 0
+        assert ResponseStore(tmp_path).get(key) == LONG_RESPONSE
+
+    def test_missing_key(self):
+        """Unknown IDs should raise KeyError."""
+        with pytest.raises(KeyError):
+            ResponseStore().get("0123456789abcdef")
+
+
+class TestForecastStorage:
+    """Tests for forecasts backed by the response store."""
+
+    def test_forecasts_share_response(self, store):
+        """Forecasts from one response should share one stored copy."""
+        forecasts = [make_forecast(y) for y in (2010, 2018)]
+        assert forecasts[0].response_id == forecasts[1].response_id
+        assert forecasts[1].raw_response == LONG_RESPONSE
+        assert len(store) == 1
+
+    def test_slots(self):
+        """Forecast objects should not carry a per-instance __dict__."""
+        assert not hasattr(make_forecast(2010), "__dict__")
+        assert not hasattr(
+            DistributionForecast("X", 2000, 2010, {}, {}, "m"), "__dict__"
+        )
+
+    def test_pickle_ships_blob_once(self, store):
+        """Pickles from an in-memory store should carry each blob only once."""
+        forecasts = [make_forecast(2000 + i) for i in range(50)]
+        data = pickle.dumps(forecasts)
+        assert len(data) < 2 * len(LONG_RESPONSE)
+        response_store.set_store(ResponseStore())  # as in a fresh process
+        restored = pickle.loads(data)
+        assert restored == forecasts
+        assert restored[0].raw_response == LONG_RESPONSE
+
+    @pytest.mark.parametrize("store", [True], indirect=True)
+    def test_pickle_on_disk_ships_id(self, store):
+        """With an on-disk store only the response ID is pickled."""
+        data = pickle.dumps(make_forecast(2010))
+        assert len(data) < len(LONG_RESPONSE)
+        assert pickle.loads(data).raw_response == LONG_RESPONSE
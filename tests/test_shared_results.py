@@ -0,0 +1,84 @@
+"""Tests for the shared-memory results table."""
+
+from multiprocessing import shared_memory
+
+import pytest
+
+from value_forecasting.baselines import run_naive_forecast
+from value_forecasting.evaluation import evaluate_model
+from value_forecasting.forecaster import run_baseline_forecast
+from value_forecasting.gss_variables import HISTORICAL_TRAJECTORIES
+from value_forecasting.shared_results import run_sweep
+from value_forecasting.workers import WorkerPool
+
+JOBS = [
+    ("HOMOSEX", 1990, [2000, 2010, 2018]),
+    ("GRASS", 2000, [2010, 2018]),
+    ("GRASS", 2010, [2018, 2031]),  # 2031 has no actual yet
+]
+FORECASTERS = {"naive": run_naive_forecast, "linear": run_baseline_forecast}
+
+
+def expected_results(model):
+    """ForecastResults for ``model`` built the usual way, one job at a time."""
+    results = []
+    for variable, cutoff, targets in JOBS:
+        for f in FORECASTERS[model](variable, cutoff, targets):
+            actual = HISTORICAL_TRAJECTORIES[variable].get(f.target_year)
+            if actual is not None:
+                results.append((variable, cutoff, f.target_year, f.point_estimate))
+    return results
+
+
+class TestRunSweep:
+    """Tests for run_sweep and ResultsTable."""
+
+    def test_serial_matches_forecasters(self):
+        """Rows should hold each forecaster's output for its jobs."""
+        with run_sweep(FORECASTERS, JOBS) as table:
+            assert table.n_rows == 2 * 7
+            for model in FORECASTERS:
+                rows = [
+                    (r.variable, r.cutoff_year, r.target_year, r.predicted)
+                    for r in table.iter_results()
+                    if r.model == model
+                ]
+                assert rows == pytest.approx(expected_results(model))
+
+    def test_metrics_match_evaluate_model(self):
+        """Column metrics should equal evaluate_model on the same results."""
+        with run_sweep(FORECASTERS, JOBS) as table:
+            results = [r for r in table.to_results() if r.model == "linear"]
+            assert table.metrics(model="linear") == pytest.approx(
+                evaluate_model(results)
+            )
+            grass = table.metrics(model="naive", variable="GRASS")
+            assert grass["n_forecasts"] == 3
+
+    def test_unfilled_rows(self):
+        """Targets without a forecast should stay unfilled."""
+        with run_sweep({"naive": lambda v, c, t: []}, JOBS) as table:
+            assert len(table) == 0
+            assert table.metrics()["n_forecasts"] == 0
+
+    def test_worker_pool_writes_shared_columns(self):
+        """Workers should fill the parent's table without returning forecasts."""
+        with WorkerPool(2) as pool:
+            parallel = run_sweep(FORECASTERS, JOBS, executor=pool)
+            again = run_sweep(FORECASTERS, JOBS, executor=pool)
+        with parallel, again, run_sweep(FORECASTERS, JOBS) as serial:
+            for column in ("predicted", "lower", "upper", "filled"):
+                assert parallel.columns[column].tolist() == pytest.approx(
+                    serial.columns[column].tolist(), nan_ok=True
+                )
+            assert again.metrics() == parallel.metrics()
+
+    def test_close_unlinks(self):
+        """Closing the table should free the shared block."""
+        table = run_sweep(FORECASTERS, JOBS)
+        name = table.handle.name
+        results = table.to_results()
+        table.close()
+        assert results
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
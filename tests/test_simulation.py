@@ -0,0 +1,81 @@
+"""Tests for the Monte Carlo predictive simulation engine."""
+
+import numpy as np
+import pytest
+
+from value_forecasting.forecaster import Forecast, run_baseline_forecast
+from value_forecasting.simulation import run_simulated_forecast, simulate_paths
+
+SERIES = [("HOMOSEX", 2000), ("GRASS", 1990)]
+TARGETS = [2010, 2018]
+
+
+class TestSimulatePaths:
+    """Tests for simulate_paths."""
+
+    @pytest.mark.parametrize("model", ["linear", "naive", "arima", "ets"])
+    def test_draws_shape(self, model):
+        """Draws should be (samples, horizon, series) within [0, 100]."""
+        result = simulate_paths(model, SERIES, TARGETS, n_samples=200)
+        assert result.draws.shape == (200, 2, 2)
+        finite = result.draws[~np.isnan(result.draws)]
+        assert finite.min() >= 0 and finite.max() <= 100
+
+    def test_linear_point_matches_baseline(self):
+        """Linear point forecasts should equal the OLS baseline."""
+        result = simulate_paths("linear", [("HOMOSEX", 2000)], TARGETS)
+        baseline = run_baseline_forecast("HOMOSEX", 2000, TARGETS)
+        np.testing.assert_allclose(
+            result.point[:, 0], [f.point_estimate for f in baseline]
+        )
+
+    def test_naive_interval_widens(self):
+        """Random-walk intervals should widen with the horizon."""
+        result = simulate_paths("naive", SERIES, TARGETS)
+        lower, upper = result.quantiles([0.05, 0.95])
+        assert np.all(upper[1] - lower[1] > upper[0] - lower[0])
+
+    def test_seed_reproducible(self):
+        """The same seed should give identical draws."""
+        a = simulate_paths("linear", SERIES, TARGETS, n_samples=100, seed=3)
+        b = simulate_paths("linear", SERIES, TARGETS, n_samples=100, seed=3)
+        np.testing.assert_array_equal(a.draws, b.draws)
+
+    def test_short_series_gets_nan(self):
+        """Series without enough waves for the model should stay NaN."""
+        result = simulate_paths("arima", [("HOMOSEX", 1975)], TARGETS)
+        assert np.isnan(result.draws).all()
+        assert result.to_forecasts() == [[]]
+
+    def test_empty_series(self):
+        """No series should give an empty result rather than an error."""
+        result = simulate_paths("linear", [], TARGETS, n_samples=50)
+        assert result.point.shape == (2, 0)
+        assert result.draws.shape == (50, 2, 0)
+        assert result.to_forecasts() == []
+
+    def test_joint_probability(self):
+        """Joint events across target years should give per-series shares."""
+        result = simulate_paths("naive", SERIES, TARGETS)
+        p = result.probability(lambda d: d[:, 1] > d[:, 0])
+        assert p.shape == (2,)
+        assert np.all((p > 0.3) & (p < 0.7))
+
+    def test_unknown_model(self):
+        """Unknown models should raise ValueError."""
+        with pytest.raises(ValueError):
+            simulate_paths("prophet", SERIES, TARGETS)
+
+
+class TestRunSimulatedForecast:
+    """Tests for the single-series wrapper."""
+
+    def test_returns_forecasts(self):
+        """Should return labelled Forecast objects with ordered bounds."""
+        forecasts = run_simulated_forecast("HOMOSEX", 2000, TARGETS)
+        assert [f.target_year for f in forecasts] == TARGETS
+        assert all(isinstance(f, Forecast) for f in forecasts)
+        assert forecasts[0].model == "linear_sim"
+        assert all(
+            f.lower_bound <= f.point_estimate <= f.upper_bound for f in forecasts
+        )
@@ -0,0 +1,123 @@
+"""Tests for the annual-grid state-space layer."""
+
+import numpy as np
+import pytest
+
+from value_forecasting import timeseries
+from value_forecasting.timeseries import (
+    annual_grid,
+    clear_cache,
+    fit_state_space,
+    pre_cutoff_series,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start every test with an empty fit cache."""
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class TestAnnualGrid:
+    """Tests for placing irregular waves on an annual grid."""
+
+    def test_right_aligned_with_mask(self):
+        """Each series should end in the last column, with gaps masked."""
+        grid = annual_grid([([2000, 2002, 2005], [1, 2, 3]), ([2010, 2011], [4, 5])])
+        assert grid.values.shape == (2, 6)
+        assert grid.mask[0].tolist() == [True, False, True, False, False, True]
+        assert grid.mask[1].tolist() == [False] * 4 + [True, True]
+        assert grid.last_year.tolist() == [2005, 2011]
+
+
+class TestFitStateSpace:
+    """Tests for the batched Kalman filter fits."""
+
+    def test_random_walk_variance_per_year(self):
+        """The walk's variance should be per year, not per wave."""
+        fit = fit_state_space("random_walk", [([2000, 2001, 2011], [10, 11, 21])])
+        # Changes of 1 over 1 year and 10 over 10 years: 1 and 10 per year,
+        # plus one pseudo-observation of the fallback variance.
+        expected = (1 + 10 + timeseries.FALLBACK_SD**2 / 10) / 3
+        assert fit.scale[0] == pytest.approx(expected)
+
+    def test_steps_are_years(self):
+        """A gap between waves should widen intervals by the years elapsed."""
+        fit = fit_state_space("random_walk", [([1990, 2000, 2010], [20, 30, 40])])
+        mean, sd = fit.forecast([2011, 2020])
+        assert mean[0] == pytest.approx([40, 40])
+        assert sd[0, 1] / sd[0, 0] == pytest.approx(np.sqrt(10))
+
+    def test_trending_series(self):
+        """The local linear trend should extend a steady rise across gaps."""
+        years = [1972, 1980, 1985, 1990, 2000, 2002, 2004, 2010]
+        values = [10 + 0.5 * (y - 1972) for y in years]
+        fit = fit_state_space("local_linear_trend", [(years, values)])
+        mean, sd = fit.forecast([2020])
+        assert mean[0, 0] == pytest.approx(10 + 0.5 * 48, abs=1)
+        assert sd[0, 0] > 0
+        # ARIMA(1,1,0) has no drift: its yearly increments decay from the
+        # last one, so it rises but falls short of the line.
+        mean, _ = fit_state_space("arima110", [(years, values)]).forecast([2020])
+        assert 29 < mean[0, 0] < 34
+
+    def test_batch_matches_single_fits(self):
+        """Fitting series together should not change any of them."""
+        series = [pre_cutoff_series(v, 2010) for v in ["HOMOSEX", "GRASS", "FEPOL"]]
+        batched = fit_state_space("arima110", series).forecast([2018])
+        clear_cache()
+        single = [fit_state_space("arima110", [s]).forecast([2018]) for s in series]
+        np.testing.assert_allclose(batched[0][:, 0], [m[0, 0] for m, _ in single])
+        np.testing.assert_allclose(
+            batched[1][:, 0], [s[0, 0] for _, s in single], rtol=1e-5
+        )
+
+    def test_fits_are_cached(self, monkeypatch):
+        """Series fitted before should not be filtered again."""
+        series = [pre_cutoff_series("HOMOSEX", 2010)]
+        fit_state_space("local_linear_trend", series)
+        calls = []
+        original = timeseries._fit_batch
+        monkeypatch.setattr(
+            timeseries,
+            "_fit_batch",
+            lambda model, batch: calls.append(len(batch)) or original(model, batch),
+        )
+        fit_state_space(
+            "local_linear_trend", series + [pre_cutoff_series("GRASS", 2010)]
+        )
+        assert calls == [1]
+
+    def test_imprecise_waves_count_less(self):
+        """A wave with a huge standard error should hardly move the fit."""
+        years = [1990, 2000, 2005, 2010, 2012]
+        ses = [1.0, 1.0, 1.0, 1.0, 1.0]
+        noisy = [1.0, 1.0, 100.0, 1.0, 1.0]
+        means = {}
+        for outlier in (20, 60):
+            values = [20, 30, outlier, 40, 42]
+            for name, errors in (("precise", ses), ("noisy", noisy)):
+                fit = fit_state_space("arima110", [(years, values, errors)])
+                means[name, outlier] = fit.forecast([2020])[0][0, 0]
+        assert abs(means["noisy", 60] - means["noisy", 20]) < 1
+        assert abs(means["precise", 60] - means["precise", 20]) > 1
+
+    def test_forecast_adds_sampling_variance(self):
+        """Forecasts of a future survey should include its sampling error."""
+        fit = fit_state_space("local_linear_trend", [pre_cutoff_series("GRASS", 2010)])
+        _, sd = fit.forecast([2020])
+        se = pre_cutoff_series("GRASS", 2010)[2][-1]
+        assert fit.sampling_var[0] == pytest.approx(se**2)
+        fit.sampling_var[:] = 0
+        _, sd_without = fit.forecast([2020])
+        assert sd[0, 0] ** 2 - sd_without[0, 0] ** 2 == pytest.approx(se**2)
+
+    def test_simulation_matches_forecast(self):
+        """Simulated paths should agree with the analytic predictive moments."""
+        fit = fit_state_space("arima110", [pre_cutoff_series("HOMOSEX", 2010)])
+        mean, sd = fit.forecast([2014, 2020])
+        draws = fit.simulate([2014, 2020], 20000, np.random.default_rng(0))
+        np.testing.assert_allclose(draws.mean(axis=0)[:, 0], mean[0], atol=0.5)
+        np.testing.assert_allclose(draws.std(axis=0)[:, 0], sd[0], rtol=0.05)
@@ -0,0 +1,107 @@
+"""Tests for preloaded worker pools."""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from value_forecasting import gss_variables, heterogeneity
+from value_forecasting.baselines import run_naive_forecast
+from value_forecasting.incremental import data_fingerprint
+from value_forecasting.workers import (
+    WorkerPool,
+    load_shared_data,
+    load_shared_objects,
+    share_data,
+)
+
+
+@pytest.fixture
+def new_variable(monkeypatch):
+    """A variable that exists only in this (parent) process."""
+    trajectory = {1990: 12.5, 2000: 20.0, 2010: 31.25}
+    monkeypatch.setitem(gss_variables.HISTORICAL_TRAJECTORIES, "NEWVAR", trajectory)
+    monkeypatch.setitem(gss_variables.GSS_VARIABLES, "NEWVAR", {"question": "New?"})
+    return trajectory
+
+
+class TestSharedData:
+    """Tests for packing data into shared memory."""
+
+    def test_round_trip(self, new_variable):
+        """Unpacked data should equal the module dicts, including number types."""
+        block, handle = share_data()
+        try:
+            trajectories, distributions = load_shared_data(handle, block)
+            definitions, sample_sizes, items = load_shared_objects(handle, block)
+            assert trajectories == gss_variables.HISTORICAL_TRAJECTORIES
+            assert distributions == heterogeneity.HISTORICAL_DISTRIBUTIONS
+            homosex = trajectories["HOMOSEX"]
+            assert all(isinstance(v, int) for v in homosex.values())
+            assert trajectories["NEWVAR"] == new_variable
+            assert definitions == gss_variables.GSS_VARIABLES
+            assert sample_sizes == gss_variables.SAMPLE_SIZES
+            assert items == gss_variables.ITEM_SAMPLE_SIZES
+            del trajectories, distributions, homosex
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_views_read_the_block(self, new_variable):
+        """Loaded trajectories should read the block, not a copy of it."""
+        block, handle = share_data()
+        try:
+            trajectories, _ = load_shared_data(handle, block)
+            start, _, _ = handle.trajectories["NEWVAR"]
+            data = np.ndarray((handle.size,), dtype=float, buffer=block.buf)
+            data[start + 1] = 99.0  # the 1990 value
+            assert trajectories["NEWVAR"][1990] == 99.0
+            del trajectories, data
+        finally:
+            block.close()
+            block.unlink()
+
+
+class TestWorkerPool:
+    """Tests for WorkerPool."""
+
+    @pytest.mark.parametrize("start_method", ["forkserver", "fork"])
+    def test_workers_see_parent_data(self, new_variable, start_method):
+        """Workers should forecast series registered in the parent."""
+        with WorkerPool(2, start_method=start_method) as pool:
+            (forecasts,) = pool.map(run_naive_forecast, ["NEWVAR"], [2000], [[2010]])
+            fingerprint = pool.submit(data_fingerprint, "NEWVAR", 2000).result()
+        assert forecasts[0].point_estimate == 20.0
+        assert fingerprint == data_fingerprint("NEWVAR", 2000)
+
+    def test_workers_see_parent_sample_sizes(self, new_variable, monkeypatch):
+        """Item sample sizes set in the parent should reach the workers."""
+        monkeypatch.setitem(gss_variables.ITEM_SAMPLE_SIZES, "NEWVAR", {2000: 500})
+        with WorkerPool(1, start_method="forkserver") as pool:
+            fingerprint = pool.submit(data_fingerprint, "NEWVAR", 2000).result()
+        assert fingerprint == data_fingerprint("NEWVAR", 2000)
+
+    def test_map_keeps_order(self):
+        """Automatically chunked map should return results in job order."""
+        cutoffs = list(range(1975, 2015)) * 10
+        with WorkerPool(2) as pool:
+            results = list(pool.map(data_fingerprint, ["GRASS"] * 400, cutoffs))
+        assert results == [data_fingerprint("GRASS", c) for c in cutoffs]
+
+    def test_shutdown_releases_memory(self):
+        """The shared block should be unlinked when the pool shuts down."""
+        pool = WorkerPool(1)
+        name = pool.data.name
+        pool.shutdown()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_shutdown_without_wait(self):
+        """Queued tasks should still run after shutdown(wait=False)."""
+        pool = WorkerPool(2)
+        cutoffs = list(range(1975, 2015))
+        futures = [pool.submit(data_fingerprint, "GRASS", c) for c in cutoffs]
+        pool.shutdown(wait=False)
+        assert [f.result() for f in futures] == [
+            data_fingerprint("GRASS", c) for c in cutoffs
+        ]